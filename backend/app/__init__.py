@@ -0,0 +1,4 @@
+import time
+
+# Reference point for startup timing (app.core.startup): first import of the app package
+IMPORT_STARTED = time.perf_counter()
@@ -10,8 +10,10 @@ import logging
 from pydantic import BaseModel
 from pydantic_ai import Agent, RunContext
 
+from app.agent.core import get_agent
 from app.agent.tools.twitter import fetch_tweet
 from app.core.config import settings
+from app.core.metrics import AgentRun
 
 logger = logging.getLogger(__name__)
 
@@ -90,7 +92,7 @@ def _build_examples_section() -> str:
     return "\n".join(lines)
 
 
-ARABIFIER_SYSTEM_PROMPT = f"""You are an expert in Egyptian Arabic (Masri/العامية المصرية). Your task is to "Arabify" English tweets into natural Egyptian Arabic as written on social media.
+ARABIFIER_PROMPT_TEMPLATE = """You are an expert in Egyptian Arabic (Masri/العامية المصرية). Your task is to "Arabify" English tweets into natural Egyptian Arabic as written on social media.
 
 IMPORTANT: Convert AS MUCH AS POSSIBLE to Arabic. The output should be primarily Arabic with only selective English.
 
@@ -133,7 +135,7 @@ IMPORTANT: Convert AS MUCH AS POSSIBLE to Arabic. The output should be primarily
 - Example: Instead of "Claude code + pydantic ai الـstack ده"
   → Better: "الـstack بتاع Claude code + pydantic ai ده"
 
-{_build_examples_section()}
+{examples}
 
 ## BAD vs GOOD:
 BAD (too much English): "I've been working on this project for months"
@@ -145,15 +147,6 @@ GOOD: "انا مبسوط اوي بده"
 Convert the text to Egyptian Arabic following these guidelines. Match the style of the reference examples closely."""
 
 
-arabifier_agent = Agent(
-    settings.MONITOR_MODEL,
-    deps_type=ArabifierDeps,
-    output_type=ArabifiedOutput,
-    system_prompt=ARABIFIER_SYSTEM_PROMPT,
-)
-
-
-@arabifier_agent.tool
 async def get_tweet_content(ctx: RunContext[ArabifierDeps], tweet_url: str) -> dict:
     """
     Fetch tweet content from a Twitter/X URL.
@@ -168,6 +161,17 @@ async def get_tweet_content(ctx: RunContext[ArabifierDeps], tweet_url: str) -> d
     return await fetch_tweet(tweet_url)
 
 
+def build_arabifier_agent() -> Agent:
+    """Build the arabifier agent (see app.agent.core.get_agent)."""
+    return Agent(
+        settings.MONITOR_MODEL,
+        deps_type=ArabifierDeps,
+        output_type=ArabifiedOutput,
+        system_prompt=ARABIFIER_PROMPT_TEMPLATE.format(examples=_build_examples_section()),
+        tools=[get_tweet_content],
+    )
+
+
 async def arabify_tweet(tweet_url: str) -> ArabifiedOutput:
     """
     Arabify a tweet given its URL.
@@ -181,10 +185,12 @@ async def arabify_tweet(tweet_url: str) -> ArabifiedOutput:
     logger.info(f"Arabifying tweet: {tweet_url}")
 
     deps = ArabifierDeps()
-    result = await arabifier_agent.run(
-        f"Fetch the tweet from this URL using the get_tweet_content tool, then arabify the tweet text: {tweet_url}",
-        deps=deps,
-    )
+    with AgentRun("arabifier") as run:
+        result = await get_agent("arabifier").run(
+            f"Fetch the tweet from this URL using the get_tweet_content tool, then arabify the tweet text: {tweet_url}",
+            deps=deps,
+        )
+        run.usage = result.usage()
 
     return result.output
 
@@ -202,10 +208,12 @@ async def arabify_text(text: str) -> ArabifiedOutput:
     logger.info("Arabifying direct text input")
 
     deps = ArabifierDeps()
-    result = await arabifier_agent.run(
-        f"Arabify this text (no need to fetch anything, just convert it directly). "
-        f"Set original_text to the input and arabified_text to your conversion:\n\n{text}",
-        deps=deps,
-    )
+    with AgentRun("arabifier") as run:
+        result = await get_agent("arabifier").run(
+            f"Arabify this text (no need to fetch anything, just convert it directly). "
+            f"Set original_text to the input and arabified_text to your conversion:\n\n{text}",
+            deps=deps,
+        )
+        run.usage = result.usage()
 
     return result.output
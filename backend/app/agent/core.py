@@ -3,14 +3,26 @@ Agent Registry for the God Mode monitoring system.
 
 Contains:
 - query: Chat agent for querying monitoring reports
+- monitor: Synthesis agent for scheduled monitoring reports
+- arabifier: Converts tweets and text to Egyptian Arabic
+
+Agents are built on first use from their factory, so importing the app (and
+starting a worker) doesn't import pydantic-ai or construct any agent.
 """
 
+import importlib
+import logging
+import time
 from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from pydantic_ai import Agent
+    from sqlalchemy.ext.asyncio import AsyncSession
 
-from pydantic_ai import Agent
-from sqlalchemy.ext.asyncio import AsyncSession
+    from app.agent.query_agent import QueryDeps
 
-from app.agent.query_agent import query_agent, QueryDeps
+logger = logging.getLogger(__name__)
 
 
 @dataclass
@@ -31,14 +43,43 @@ agents: dict[str, AgentConfig] = {
     ),
 }
 
+# Factories ("module:function") for every agent, chat or background
+AGENT_FACTORIES: dict[str, str] = {
+    "query": "app.agent.query_agent:build_query_agent",
+    "monitor": "app.agent.monitor_agent:build_monitor_agent",
+    "arabifier": "app.agent.arabifier_agent:build_arabifier_agent",
+}
+
+_built: dict[str, "Agent"] = {}
+
 
-def get_query_agent() -> Agent:
+def get_agent(agent_id: str) -> "Agent":
+    """Get an agent instance, building it on first use."""
+    agent = _built.get(agent_id)
+    if agent is None:
+        started = time.perf_counter()
+        module, _, factory = AGENT_FACTORIES[agent_id].partition(":")
+        agent = getattr(importlib.import_module(module), factory)()
+
+        # Import here to avoid circular imports
+        from app.core.telemetry import instrument_agent
+
+        instrument_agent(agent)
+        _built[agent_id] = agent
+        logger.info(f"Built agent '{agent_id}' in {time.perf_counter() - started:.2f}s")
+    return agent
+
+
+def get_query_agent() -> "Agent":
     """Get the query agent instance."""
-    return query_agent
+    return get_agent("query")
 
 
-def create_query_deps(db: AsyncSession) -> QueryDeps:
+def create_query_deps(db: "AsyncSession") -> "QueryDeps":
     """Create dependencies for the query agent with a database session."""
+    # Import here to defer pydantic-ai until the first chat request
+    from app.agent.query_agent import QueryDeps
+
     return QueryDeps(db=db)
 
 
@@ -3,17 +3,28 @@ Monitor Agent - Background agent that fetches and synthesizes data.
 
 Runs on a schedule to collect news (Tavily), markets (Finnhub), and tech trends (HackerNews),
 then uses AI to synthesize findings into a structured report.
+
+The pipeline runs as explicit stages - one fetch per source, then a single
+synthesis call with the fetched data in the prompt - so callers can checkpoint
+each stage's output and resume a failed run without refetching.
 """
 
+import asyncio
 import logging
+from collections.abc import Awaitable, Callable
 
 from pydantic import BaseModel
-from pydantic_ai import Agent, RunContext
+from pydantic_ai import Agent
 
+from app.agent.core import get_agent
 from app.agent.tools.markets import fetch_markets
 from app.agent.tools.news import fetch_news
 from app.agent.tools.social import fetch_social
+from app.analytics.anomalies import find_watchlist_anomalies
 from app.core.config import settings
+from app.core.jsoncodec import dumps_str
+from app.core.metrics import AgentRun
+from app.core.timing import annotate
 
 logger = logging.getLogger(__name__)
 
@@ -74,11 +85,7 @@ class MonitorOutput(BaseModel):
     market_sentiment: str = "neutral"
 
 
-monitor_agent = Agent(
-    settings.MONITOR_MODEL,
-    deps_type=MonitorDeps,
-    output_type=MonitorOutput,
-    system_prompt="""You are an intelligence monitoring agent. Your job is to analyze data from multiple sources and create a comprehensive monitoring report.
+MONITOR_SYSTEM_PROMPT = """You are an intelligence monitoring agent. Your job is to analyze data from multiple sources and create a comprehensive monitoring report.
 
 Data Sources:
 - News: Tavily AI-powered search (real-time news from multiple sources)
@@ -97,52 +104,136 @@ IMPORTANT: Populate the rich data fields:
 - top_tech: Extract 5-8 top HackerNews stories with title, url, score, comments, is_hot
 - market_sentiment: Overall market sentiment based on price changes
 
+Market data includes an `anomalies` list of statistically flagged moves (z-scores,
+volatility spikes, opening gaps, correlation breaks) computed from price history.
+Treat these as facts and call out the significant ones in the markets section.
+
 Your executive summary should:
 - Highlight the 2-3 most significant developments across all topics
 - Note any cross-topic connections or trends
 - Be concise but informative (2-3 sentences)
 
-Be objective and factual. Flag anything unusual or potentially significant.""",
-)
+Be objective and factual. Flag anything unusual or potentially significant."""
+
+
+def build_monitor_agent() -> Agent:
+    """Build the synthesis agent (see app.agent.core.get_agent)."""
+    return Agent(
+        settings.MONITOR_MODEL,
+        deps_type=MonitorDeps,
+        output_type=MonitorOutput,
+        system_prompt=MONITOR_SYSTEM_PROMPT,
+    )
+
+
+async def fetch_market_data() -> dict:
+    """Fetch real market data from Finnhub plus flagged anomalies from price history."""
+    data = await fetch_markets()
+    data["anomalies"] = await find_watchlist_anomalies(data.get("quotes", []))
+    return data
+
+
+# Fetch stages in pipeline order; each output is checkpointed under its name
+FETCH_STAGES: dict[str, Callable[[], Awaitable[dict]]] = {
+    "news": fetch_news,  # Tavily
+    "markets": fetch_market_data,  # Finnhub
+    "social": fetch_social,  # HackerNews
+}
+
 
+async def run_fetch_stage(stage: str) -> dict:
+    """Run a single fetch stage."""
+    logger.info(f"Fetching {stage} data...")
+    return await FETCH_STAGES[stage]()
 
-@monitor_agent.tool
-async def get_news_data(ctx: RunContext[MonitorDeps]) -> dict:
-    """Fetch latest news using Tavily AI-powered search. Returns headlines from multiple sources."""
-    logger.info("Fetching news data from Tavily...")
-    return await fetch_news()
 
+async def synthesize(data: dict[str, dict]) -> MonitorOutput:
+    """
+    Synthesize fetched source data into a report with a single model call.
+
+    Args:
+        data: Fetch stage outputs keyed by stage name (news, markets, social)
+    """
+    logger.info("Synthesizing monitoring report...")
+    with AgentRun("monitor") as run:
+        result = await get_agent("monitor").run(
+            "Perform a comprehensive scan of the data below. Synthesize the findings into a "
+            "structured report with an executive summary, section breakdowns, AND populate "
+            "the rich data fields (top_news, market_quotes, top_tech, market_sentiment) for "
+            "the dashboard.\n\n"
+            f"News data (Tavily):\n{dumps_str(data.get('news', {}))}\n\n"
+            f"Market data (Finnhub):\n{dumps_str(data.get('markets', {}))}\n\n"
+            f"Social/tech data (HackerNews):\n{dumps_str(data.get('social', {}))}",
+            deps=MonitorDeps(),
+        )
+        run.usage = usage = result.usage()
+    annotate(
+        requests=usage.requests,
+        input_tokens=usage.input_tokens,
+        output_tokens=usage.output_tokens,
+    )
+    return result.output
 
-@monitor_agent.tool
-async def get_market_data(ctx: RunContext[MonitorDeps]) -> dict:
-    """Fetch real market data from Finnhub. Returns stock quotes (SPY, QQQ, AAPL, etc.) and market news."""
-    logger.info("Fetching market data from Finnhub...")
-    return await fetch_markets()
 
+def fallback_output(data: dict[str, dict], reason: str) -> MonitorOutput:
+    """
+    Build a report straight from fetched data when synthesis can't finish in time.
 
-@monitor_agent.tool
-async def get_social_trends(ctx: RunContext[MonitorDeps]) -> dict:
-    """Fetch trending tech stories from HackerNews. Returns top stories with scores and comment counts."""
-    logger.info("Fetching tech trends from HackerNews...")
-    return await fetch_social()
+    Section key points are the top headlines/quotes/stories; there is no narrative.
+    """
+    news = data.get("news", {}).get("items", [])
+    quotes = data.get("markets", {}).get("quotes", [])
+    stories = data.get("social", {}).get("items", [])
+
+    def section(title: str, points: list[str]) -> TopicSection:
+        return TopicSection(
+            title=title,
+            summary=f"{reason}. Showing raw source data.",
+            key_points=points[:5],
+            sentiment="neutral",
+        )
+
+    return MonitorOutput(
+        executive_summary=f"{reason}; this report lists raw source data without analysis.",
+        news=section("News", [n.get("title", "") for n in news]),
+        markets=section(
+            "Markets", [f"{q['symbol']}: {q.get('change_percent', 0):+.2f}%" for q in quotes]
+        ),
+        social=section("Tech & Social", [t.get("title", "") for t in stories]),
+        top_news=[
+            NewsItem(
+                title=n.get("title", ""),
+                url=n.get("url", ""),
+                source=n.get("domain") or n.get("source", ""),
+                summary=n.get("content"),
+            )
+            for n in news[:8]
+        ],
+        market_quotes=[MarketQuote.model_validate(q) for q in quotes],
+        top_tech=[
+            TechItem(
+                title=t.get("title", ""),
+                url=t.get("url", ""),
+                score=t.get("score", 0),
+                comments=t.get("num_comments", 0),
+                is_hot=t.get("is_hot", False),
+            )
+            for t in stories[:8]
+        ],
+        market_sentiment=data.get("markets", {}).get("market_sentiment", "neutral"),
+    )
 
 
 async def run_monitor() -> MonitorOutput:
     """
-    Execute the monitor agent and return the synthesized report.
+    Execute every stage without checkpoints and return the synthesized report.
 
-    This is called by the scheduler task.
+    The scheduler task runs the stages itself so it can checkpoint them.
     """
     logger.info("Starting monitor agent run...")
 
-    deps = MonitorDeps()
-    result = await monitor_agent.run(
-        "Perform a comprehensive scan. Use your tools to fetch news, market data, "
-        "and social/tech trends. Then synthesize the findings into a structured report "
-        "with an executive summary, section breakdowns, AND populate the rich data fields "
-        "(top_news, market_quotes, top_tech, market_sentiment) for the dashboard.",
-        deps=deps,
-    )
+    outputs = await asyncio.gather(*(run_fetch_stage(stage) for stage in FETCH_STAGES))
+    result = await synthesize(dict(zip(FETCH_STAGES, outputs)))
 
     logger.info("Monitor agent run completed")
-    return result.output
+    return result
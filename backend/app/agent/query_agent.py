@@ -28,10 +28,7 @@ class QueryDeps(BaseModel):
         arbitrary_types_allowed = True
 
 
-query_agent = Agent(
-    settings.MONITOR_MODEL,
-    deps_type=QueryDeps,
-    system_prompt="""You are a monitoring intelligence assistant. You help users explore and understand the monitoring data that has been collected.
+QUERY_SYSTEM_PROMPT = """You are a monitoring intelligence assistant. You help users explore and understand the monitoring data that has been collected.
 
 You have access to tools that let you:
 1. Get the latest monitoring report
@@ -44,11 +41,9 @@ When answering questions:
 - If asked about trends, compare across multiple reports
 - If no data is available, say so clearly
 
-Be helpful, concise, and data-driven in your responses.""",
-)
+Be helpful, concise, and data-driven in your responses."""
 
 
-@query_agent.tool
 async def get_latest_report(ctx: RunContext[QueryDeps]) -> dict:
     """Get the most recent completed monitoring report with all sections."""
     result = await ctx.deps.db.execute(
@@ -64,7 +59,10 @@ async def get_latest_report(ctx: RunContext[QueryDeps]) -> dict:
 
     # Fetch sections
     sections_result = await ctx.deps.db.execute(
-        select(ReportSection).where(ReportSection.report_id == report.id)
+        select(ReportSection).where(
+            ReportSection.report_id == report.id,
+            ReportSection.created_at == report.created_at,
+        )
     )
     sections = sections_result.scalars().all()
 
@@ -83,7 +81,6 @@ async def get_latest_report(ctx: RunContext[QueryDeps]) -> dict:
     }
 
 
-@query_agent.tool
 async def search_reports(
     ctx: RunContext[QueryDeps],
     topic: str | None = None,
@@ -102,10 +99,11 @@ async def search_reports(
 
     query = (
         select(ReportSection)
-        .join(MonitorReport)
+        .join(ReportSection.report)
         .where(
             MonitorReport.created_at >= since,
             MonitorReport.status == "completed",
+            ReportSection.created_at >= since,  # Lets Postgres prune section partitions
         )
     )
 
@@ -128,7 +126,6 @@ async def search_reports(
     ]
 
 
-@query_agent.tool
 async def get_monitoring_stats(ctx: RunContext[QueryDeps], days: int = 7) -> dict:
     """
     Get statistics about monitoring activity.
@@ -182,3 +179,13 @@ async def get_monitoring_stats(ctx: RunContext[QueryDeps], days: int = 7) -> dic
         ),
         "latest_report": latest_time.isoformat() if latest_time else None,
     }
+
+
+def build_query_agent() -> Agent:
+    """Build the chat agent (see app.agent.core.get_agent)."""
+    return Agent(
+        settings.MONITOR_MODEL,
+        deps_type=QueryDeps,
+        system_prompt=QUERY_SYSTEM_PROMPT,
+        tools=[get_latest_report, search_reports, get_monitoring_stats],
+    )
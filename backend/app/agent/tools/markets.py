@@ -4,12 +4,15 @@ Markets fetching tool - uses Finnhub API for real market data.
 Provides stock quotes, market news, and market status.
 """
 
+import asyncio
 import logging
 from datetime import datetime
 
 import httpx
 
+from app.analytics.history import record_quotes
 from app.core.config import settings
+from app.core.http import upstream_client
 
 logger = logging.getLogger(__name__)
 
@@ -48,61 +51,18 @@ async def fetch_markets() -> dict:
         return {"source": "finnhub", "quotes": [], "news": [], "error": "API key not configured"}
 
     headers = {"X-Finnhub-Token": settings.FINNHUB_API_KEY}
-    quotes = []
-    news = []
-    market_status = None
-
-    async with httpx.AsyncClient(timeout=30.0, headers=headers) as client:
-        # Fetch market status
-        try:
-            response = await client.get(f"{FINNHUB_BASE_URL}/stock/market-status", params={"exchange": "US"})
-            if response.status_code == 200:
-                market_status = response.json()
-        except Exception as e:
-            logger.error(f"Error fetching market status: {e}")
-
-        # Fetch quotes for key symbols
-        for symbol, meta in SYMBOLS.items():
-            try:
-                response = await client.get(f"{FINNHUB_BASE_URL}/quote", params={"symbol": symbol})
-                if response.status_code == 200:
-                    data = response.json()
-                    if data.get("c"):  # Current price exists
-                        change = data.get("d", 0) or 0
-                        change_percent = data.get("dp", 0) or 0
-                        quotes.append({
-                            "symbol": symbol,
-                            "name": meta["name"],
-                            "category": meta["category"],
-                            "price": round(data.get("c", 0), 2),
-                            "change": round(change, 2),
-                            "change_percent": round(change_percent, 2),
-                            "high": round(data.get("h", 0), 2),
-                            "low": round(data.get("l", 0), 2),
-                            "open": round(data.get("o", 0), 2),
-                            "prev_close": round(data.get("pc", 0), 2),
-                            "sentiment": "positive" if change > 0 else "negative" if change < 0 else "neutral",
-                        })
-            except Exception as e:
-                logger.error(f"Error fetching quote for {symbol}: {e}")
-
-        # Fetch general market news
-        try:
-            response = await client.get(f"{FINNHUB_BASE_URL}/news", params={"category": "general"})
-            if response.status_code == 200:
-                news_data = response.json()
-                for item in news_data[:10]:
-                    news.append({
-                        "source": item.get("source", ""),
-                        "title": item.get("headline", ""),
-                        "summary": item.get("summary", "")[:300],
-                        "url": item.get("url", ""),
-                        "image": item.get("image", ""),
-                        "datetime": item.get("datetime"),
-                        "related": item.get("related", ""),
-                    })
-        except Exception as e:
-            logger.error(f"Error fetching market news: {e}")
+
+    async with upstream_client(timeout=30.0, headers=headers) as client:
+        # Market status, every quote and the news feed are fetched concurrently
+        market_status, news, *symbol_quotes = await asyncio.gather(
+            _fetch_market_status(client),
+            _fetch_market_news(client),
+            *(_fetch_quote(client, symbol, meta) for symbol, meta in SYMBOLS.items()),
+        )
+    quotes = [q for q in symbol_quotes if q is not None]
+
+    # Append to the per-symbol price history
+    await record_quotes(quotes)
 
     # Calculate market summary
     total_change = sum(q.get("change_percent", 0) for q in quotes)
@@ -119,3 +79,63 @@ async def fetch_markets() -> dict:
         "news": news,
         "count": len(quotes),
     }
+
+
+async def _fetch_market_status(client: httpx.AsyncClient) -> dict | None:
+    """Fetch whether US markets are open."""
+    try:
+        response = await client.get(f"{FINNHUB_BASE_URL}/stock/market-status", params={"exchange": "US"})
+        if response.status_code == 200:
+            return response.json()
+    except Exception as e:
+        logger.error(f"Error fetching market status: {e}")
+    return None
+
+
+async def _fetch_quote(client: httpx.AsyncClient, symbol: str, meta: dict) -> dict | None:
+    """Fetch a single symbol's quote."""
+    try:
+        response = await client.get(f"{FINNHUB_BASE_URL}/quote", params={"symbol": symbol})
+        if response.status_code == 200:
+            data = response.json()
+            if data.get("c"):  # Current price exists
+                change = data.get("d", 0) or 0
+                change_percent = data.get("dp", 0) or 0
+                return {
+                    "symbol": symbol,
+                    "name": meta["name"],
+                    "category": meta["category"],
+                    "price": round(data.get("c", 0), 2),
+                    "change": round(change, 2),
+                    "change_percent": round(change_percent, 2),
+                    "high": round(data.get("h", 0), 2),
+                    "low": round(data.get("l", 0), 2),
+                    "open": round(data.get("o", 0), 2),
+                    "prev_close": round(data.get("pc", 0), 2),
+                    "sentiment": "positive" if change > 0 else "negative" if change < 0 else "neutral",
+                }
+    except Exception as e:
+        logger.error(f"Error fetching quote for {symbol}: {e}")
+    return None
+
+
+async def _fetch_market_news(client: httpx.AsyncClient) -> list[dict]:
+    """Fetch general market news."""
+    news = []
+    try:
+        response = await client.get(f"{FINNHUB_BASE_URL}/news", params={"category": "general"})
+        if response.status_code == 200:
+            news_data = response.json()
+            for item in news_data[:10]:
+                news.append({
+                    "source": item.get("source", ""),
+                    "title": item.get("headline", ""),
+                    "summary": item.get("summary", "")[:300],
+                    "url": item.get("url", ""),
+                    "image": item.get("image", ""),
+                    "datetime": item.get("datetime"),
+                    "related": item.get("related", ""),
+                })
+    except Exception as e:
+        logger.error(f"Error fetching market news: {e}")
+    return news
@@ -4,12 +4,14 @@ News fetching tool - uses Tavily API for AI-optimized search.
 Tavily provides clean, structured search results optimized for AI agents.
 """
 
+import asyncio
 import logging
 from datetime import datetime
 
 import httpx
 
 from app.core.config import settings
+from app.core.http import upstream_client
 
 logger = logging.getLogger(__name__)
 
@@ -27,8 +29,6 @@ async def fetch_news() -> dict:
         logger.warning("TAVILY_API_KEY not set, returning empty results")
         return {"source": "tavily", "items": [], "count": 0, "error": "API key not configured"}
 
-    items = []
-
     # Search queries for different news categories
     queries = [
         "breaking news today",
@@ -36,42 +36,10 @@ async def fetch_news() -> dict:
         "technology news today",
     ]
 
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        for query in queries:
-            try:
-                response = await client.post(
-                    TAVILY_API_URL,
-                    json={
-                        "api_key": settings.TAVILY_API_KEY,
-                        "query": query,
-                        "search_depth": "basic",
-                        "include_answer": False,
-                        "include_images": False,
-                        "max_results": 5,
-                    },
-                )
-
-                if response.status_code == 200:
-                    data = response.json()
-                    results = data.get("results", [])
-
-                    for result in results:
-                        items.append({
-                            "source": "tavily",
-                            "title": result.get("title", ""),
-                            "url": result.get("url", ""),
-                            "content": result.get("content", "")[:500],
-                            "score": result.get("score", 0),
-                            "published_date": result.get("published_date"),
-                            "domain": _extract_domain(result.get("url", "")),
-                            "query": query,
-                        })
-                else:
-                    logger.warning(f"Tavily search failed: {response.status_code}")
-
-            except Exception as e:
-                logger.error(f"Error fetching news for '{query}': {e}")
-                continue
+    async with upstream_client(timeout=30.0) as client:
+        # Run the searches concurrently
+        results = await asyncio.gather(*(_search(client, query) for query in queries))
+    items = [item for query_items in results for item in query_items]
 
     # Sort by score (relevance)
     items.sort(key=lambda x: x.get("score", 0), reverse=True)
@@ -92,6 +60,46 @@ async def fetch_news() -> dict:
     }
 
 
+async def _search(client: httpx.AsyncClient, query: str) -> list[dict]:
+    """Run a single Tavily search."""
+    items = []
+    try:
+        response = await client.post(
+            TAVILY_API_URL,
+            json={
+                "api_key": settings.TAVILY_API_KEY,
+                "query": query,
+                "search_depth": "basic",
+                "include_answer": False,
+                "include_images": False,
+                "max_results": 5,
+            },
+        )
+
+        if response.status_code == 200:
+            data = response.json()
+            results = data.get("results", [])
+
+            for result in results:
+                items.append({
+                    "source": "tavily",
+                    "title": result.get("title", ""),
+                    "url": result.get("url", ""),
+                    "content": result.get("content", "")[:500],
+                    "score": result.get("score", 0),
+                    "published_date": result.get("published_date"),
+                    "domain": _extract_domain(result.get("url", "")),
+                    "query": query,
+                })
+        else:
+            logger.warning(f"Tavily search failed: {response.status_code}")
+
+    except Exception as e:
+        logger.error(f"Error fetching news for '{query}': {e}")
+
+    return items
+
+
 def _extract_domain(url: str) -> str:
     """Extract domain from URL."""
     try:
@@ -10,6 +10,8 @@ from datetime import datetime
 
 import httpx
 
+from app.core.http import upstream_client
+
 logger = logging.getLogger(__name__)
 
 HN_API_BASE = "https://hacker-news.firebaseio.com/v0"
@@ -24,7 +26,7 @@ async def fetch_social() -> dict:
     """
     items = []
 
-    async with httpx.AsyncClient(timeout=30.0) as client:
+    async with upstream_client(timeout=30.0) as client:
         try:
             # Get top story IDs
             response = await client.get(f"{HN_API_BASE}/topstories.json")
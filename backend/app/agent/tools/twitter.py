@@ -10,6 +10,8 @@ import time
 import httpx
 
 from app.core.config import settings
+from app.core.http import upstream_client
+from app.core.metrics import cache_lookup
 
 logger = logging.getLogger(__name__)
 
@@ -79,6 +81,7 @@ async def fetch_tweet(url: str) -> dict:
 
     # Check cache first
     cached = _get_cached_tweet(tweet_id)
+    cache_lookup("tweet", cached is not None)
     if cached:
         return cached
 
@@ -97,7 +100,7 @@ async def fetch_tweet(url: str) -> dict:
         "media.fields": "url,preview_image_url,type,width,height,alt_text",
     }
 
-    async with httpx.AsyncClient(timeout=30.0) as client:
+    async with upstream_client(timeout=30.0) as client:
         try:
             response = await client.get(
                 f"{TWITTER_API_BASE}/tweets/{tweet_id}",
@@ -0,0 +1 @@
+"""Analytics over stored monitoring data."""
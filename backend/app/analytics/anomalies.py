@@ -0,0 +1,262 @@
+"""
+Vectorized market anomaly detection over the stored quote history.
+
+The whole watchlist is analysed as one (symbols x samples) price matrix in a
+single NumPy pass: z-scores of the latest return against a trailing window,
+volatility spikes, opening gaps and correlation breaks against the market.
+Only samples from the regular US session are used, and returns spanning two
+sessions are ignored: flat closed-market returns would shrink the trailing std,
+and the overnight move is what gap detection reports. Each session's gap is
+reported once, by the run that stored its first sample.
+Flagged anomalies are rendered as short facts that are handed to the monitor
+agent with the market data, so it doesn't have to spot unusual moves on its own.
+"""
+
+import asyncio
+import logging
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, time, timedelta, timezone
+
+import numpy as np
+from sqlalchemy import Date, Time, cast, extract, func, select
+
+from app.core.config import settings
+from app.core.database import async_session_maker
+from app.models.markets import QuoteSample
+
+logger = logging.getLogger(__name__)
+
+# Regular session of the exchange every watchlist symbol trades on
+MARKET_TIMEZONE = "America/New_York"
+MARKET_OPEN = time(9, 30)
+MARKET_CLOSE = time(16, 0)
+
+
+@dataclass
+class Anomaly:
+    """A single flagged market move."""
+
+    symbol: str
+    kind: str  # 'zscore' | 'volatility' | 'gap_up' | 'gap_down' | 'correlation_break'
+    value: float
+    severity: float  # Comparable across kinds; higher is more unusual
+
+    @property
+    def fact(self) -> str:
+        """Compact, prompt-ready description."""
+        if self.kind == "zscore":
+            return f"{self.symbol}: latest move is {self.value:+.1f} sigma vs its recent returns"
+        if self.kind == "volatility":
+            return f"{self.symbol}: recent volatility is {self.value:.1f}x its longer-run level"
+        if self.kind in ("gap_up", "gap_down"):
+            return f"{self.symbol}: opened with a {self.value:+.2f}% gap vs previous close"
+        return (
+            f"{self.symbol}: correlation with the market dropped to {self.value:+.2f} "
+            f"in the recent window"
+        )
+
+
+def _moments(values: np.ndarray, counts: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Row-wise mean and std of zero-filled `values` given per-row valid counts."""
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = values.sum(axis=1) / counts
+        var = np.einsum("ij,ij->i", values, values) / counts - mean * mean
+    std = np.sqrt(np.clip(var, 0.0, None))
+    mean[counts < 2] = np.nan
+    std[counts < 2] = np.nan
+    return mean, std
+
+
+def _correlation(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Row-wise Pearson correlation of a (S x T) with b (T,), via one matrix-vector product."""
+    n = a.shape[1]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        a_mean = a.sum(axis=1) / n
+        b_mean = b.sum() / n
+        cov = (a @ b) / n - a_mean * b_mean
+        a_var = np.einsum("ij,ij->i", a, a) / n - a_mean * a_mean
+        b_var = (b @ b) / n - b_mean * b_mean
+        return cov / np.sqrt(np.clip(a_var, 0.0, None) * max(b_var, 0.0))
+
+
+def detect_anomalies(
+    prices: np.ndarray,
+    symbols: list[str],
+    opens: np.ndarray | None = None,
+    prev_closes: np.ndarray | None = None,
+    session_breaks: np.ndarray | None = None,
+    window: int = 20,
+    z_threshold: float = 3.0,
+    vol_ratio_threshold: float = 2.0,
+    gap_threshold_pct: float = 2.0,
+    corr_window: int = 60,
+    corr_min_baseline: float = 0.5,
+    corr_drop: float = 0.5,
+) -> list[Anomaly]:
+    """
+    Flag unusual moves across a whole watchlist in one vectorized pass.
+
+    Args:
+        prices: (symbols x samples) price matrix, oldest first, NaN for gaps
+        symbols: Row labels for `prices`
+        opens: Today's open per symbol, for gap detection (optional)
+        prev_closes: Previous close per symbol, for gap detection (optional)
+        session_breaks: (samples - 1) flags, True where a return spans two
+            sessions; those returns are ignored (optional)
+
+    Returns:
+        Anomalies sorted by severity, most unusual first
+    """
+    prices = np.asarray(prices, dtype=np.float64)
+    anomalies: list[Anomaly] = []
+
+    if prices.ndim == 2 and prices.shape[1] >= 3:
+        with np.errstate(invalid="ignore", divide="ignore"):
+            returns = np.diff(np.log(prices), axis=1)
+
+        # Missing samples count as "no move" so every statistic below is a
+        # plain sum or BLAS product over one zero-filled matrix
+        valid = np.isfinite(returns)
+        if session_breaks is not None:
+            valid &= ~np.asarray(session_breaks, dtype=bool)
+        values = np.where(valid, returns, 0.0)
+
+        # Z-score of the latest return against the trailing window before it
+        trailing = values[:, -window - 1 : -1]
+        mean, std = _moments(trailing, valid[:, -window - 1 : -1].sum(axis=1))
+        latest = np.where(valid[:, -1], values[:, -1], np.nan)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            z = (latest - mean) / std
+        for i in np.flatnonzero(np.abs(np.nan_to_num(z)) >= z_threshold):
+            anomalies.append(Anomaly(symbols[i], "zscore", float(z[i]), abs(float(z[i]))))
+
+        # Volatility spike: recent window std vs std over the whole history
+        _, recent_std = _moments(values[:, -window:], valid[:, -window:].sum(axis=1))
+        _, long_std = _moments(values, valid.sum(axis=1))
+        with np.errstate(invalid="ignore", divide="ignore"):
+            vol_ratio = recent_std / long_std
+        for i in np.flatnonzero(np.nan_to_num(vol_ratio) >= vol_ratio_threshold):
+            ratio = float(vol_ratio[i])
+            anomalies.append(Anomaly(symbols[i], "volatility", ratio, ratio + 1.0))
+
+        # Correlation break vs the equal-weighted market return
+        if values.shape[1] > 2 * corr_window and len(symbols) > 2:
+            with np.errstate(invalid="ignore", divide="ignore"):
+                market = np.nan_to_num(values.sum(axis=0) / valid.sum(axis=0))
+            baseline = _correlation(values[:, :-corr_window], market[:-corr_window])
+            recent = _correlation(values[:, -corr_window:], market[-corr_window:])
+            with np.errstate(invalid="ignore"):
+                broken = (baseline >= corr_min_baseline) & (baseline - recent >= corr_drop)
+            for i in np.flatnonzero(broken):
+                drop = float(baseline[i] - recent[i])
+                anomalies.append(
+                    Anomaly(symbols[i], "correlation_break", float(recent[i]), 1.0 + 2 * drop)
+                )
+
+    # Opening gaps from the latest quote
+    if opens is not None and prev_closes is not None:
+        opens = np.asarray(opens, dtype=np.float64)
+        prev_closes = np.asarray(prev_closes, dtype=np.float64)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            gap_pct = (opens - prev_closes) / prev_closes * 100
+        gap_pct = np.nan_to_num(gap_pct, posinf=0.0, neginf=0.0)
+        for i in np.flatnonzero(np.abs(gap_pct) >= gap_threshold_pct):
+            pct = float(gap_pct[i])
+            kind = "gap_up" if pct > 0 else "gap_down"
+            anomalies.append(Anomaly(symbols[i], kind, pct, abs(pct) / gap_threshold_pct + 1.0))
+
+    anomalies.sort(key=lambda a: a.severity, reverse=True)
+    return anomalies
+
+
+def build_price_matrix(
+    rows: list[tuple[str, datetime, float]], symbols: list[str], max_samples: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Align (symbol, ts, price) rows on a shared time axis, keeping the latest samples.
+
+    Returns:
+        The (symbols x samples) price matrix and each column's POSIX timestamp
+    """
+    empty = np.full((len(symbols), 0), np.nan), np.empty(0)
+    if not rows:
+        return empty
+
+    index = {s: i for i, s in enumerate(symbols)}
+    rows = [r for r in rows if r[0] in index]
+    if not rows:
+        return empty
+
+    row_idx = np.fromiter((index[r[0]] for r in rows), dtype=np.intp, count=len(rows))
+    stamps = np.fromiter((r[1].timestamp() for r in rows), dtype=np.float64, count=len(rows))
+    values = np.fromiter((r[2] for r in rows), dtype=np.float64, count=len(rows))
+
+    times, col_idx = np.unique(stamps, return_inverse=True)
+    matrix = np.full((len(symbols), len(times)), np.nan)
+    matrix[row_idx, col_idx] = values
+    return matrix[:, -max_samples:], times[-max_samples:]
+
+
+async def find_watchlist_anomalies(quotes: list[dict], limit: int | None = None) -> list[str]:
+    """
+    Detect anomalies for the symbols in `quotes` using their stored history.
+
+    Returns:
+        Up to `limit` compact facts, most unusual first
+    """
+    if not quotes:
+        return []
+
+    symbols = [q["symbol"] for q in quotes]
+    since = datetime.now(timezone.utc) - timedelta(days=settings.ANOMALY_LOOKBACK_DAYS)
+    local = func.timezone(MARKET_TIMEZONE, QuoteSample.ts)
+
+    try:
+        async with async_session_maker() as db:
+            result = await db.execute(
+                select(QuoteSample.symbol, QuoteSample.ts, QuoteSample.price, cast(local, Date))
+                .where(
+                    QuoteSample.symbol.in_(symbols),
+                    QuoteSample.ts >= since,
+                    extract("isodow", local) <= 5,
+                    cast(local, Time).between(MARKET_OPEN, MARKET_CLOSE),
+                )
+                .order_by(QuoteSample.ts)
+            )
+            rows = result.all()
+            today = await db.scalar(select(cast(func.timezone(MARKET_TIMEZONE, func.now()), Date)))
+    except Exception as e:
+        logger.error(f"Error loading quote history for anomaly detection: {e}")
+        rows, today = [], None
+
+    def analyse() -> list[Anomaly]:
+        prices, stamps = build_price_matrix(
+            [(symbol, ts, price) for symbol, ts, price, _ in rows],
+            symbols,
+            settings.ANOMALY_MAX_SAMPLES,
+        )
+        session_of = {ts.timestamp(): session for _, ts, _, session in rows}
+        sessions = np.array([session_of[stamp] for stamp in stamps], dtype=object)
+        breaks = sessions[1:] != sessions[:-1]
+
+        # Only the run that stored a symbol's first sample of today's session reports its gap
+        today_samples = Counter(symbol for symbol, _, _, session in rows if session == today)
+        opens = [
+            (q.get("open") or np.nan) if today_samples[q["symbol"]] == 1 else np.nan
+            for q in quotes
+        ]
+        return detect_anomalies(
+            prices,
+            symbols,
+            opens=opens,
+            prev_closes=[q.get("prev_close") or np.nan for q in quotes],
+            session_breaks=breaks.astype(bool),
+            window=settings.ANOMALY_WINDOW,
+            z_threshold=settings.ANOMALY_Z_THRESHOLD,
+        )
+
+    # CPU-bound; keep it off the event loop
+    anomalies = await asyncio.to_thread(analyse)
+    limit = limit or settings.ANOMALY_MAX_FACTS
+    return [a.fact for a in anomalies[:limit]]
@@ -0,0 +1,177 @@
+"""
+Per-symbol quote history.
+
+Every market fetch appends one sample per symbol to quote_samples and folds it
+into an hourly OHLC bar in the same statement batch. Range queries bucket the
+data server-side with date_bin: short ranges read raw samples, longer ranges
+read the hourly bars, so a year of history is at most ~8,760 rows per symbol
+before downsampling to the requested number of points.
+"""
+
+import logging
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import case, func, select
+from sqlalchemy.dialects.postgresql import aggregate_order_by, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import async_session_maker
+from app.models.markets import QuoteBar, QuoteSample
+
+logger = logging.getLogger(__name__)
+
+RANGES: dict[str, timedelta] = {
+    "day": timedelta(days=1),
+    "week": timedelta(weeks=1),
+    "month": timedelta(days=30),
+    "year": timedelta(days=365),
+}
+
+MIN_BUCKET = timedelta(minutes=1)
+HOURLY = timedelta(hours=1)
+# Widths used for hourly bars; each is a whole number of hours so no bar straddles a bucket
+HOURLY_WIDTHS = tuple(timedelta(hours=h) for h in (1, 2, 4, 6, 12, 24))
+
+# Fixed origin so bucket boundaries are stable across requests
+_BUCKET_ORIGIN = datetime(2000, 1, 3, tzinfo=timezone.utc)
+
+
+async def record_quotes(quotes: list[dict], ts: datetime | None = None) -> None:
+    """
+    Bulk-write one sample per quote and update the matching hourly bars.
+
+    Failures are logged and swallowed so history never breaks a market fetch.
+    """
+    if not quotes:
+        return
+
+    ts = ts or datetime.now(timezone.utc)
+    bucket = ts.replace(minute=0, second=0, microsecond=0)
+
+    samples = [
+        {
+            "symbol": q["symbol"],
+            "ts": ts,
+            "price": q["price"],
+            "change_percent": q.get("change_percent"),
+        }
+        for q in quotes
+    ]
+    bars = [
+        {
+            "symbol": q["symbol"],
+            "bucket": bucket,
+            "open": q["price"],
+            "high": q["price"],
+            "low": q["price"],
+            "close": q["price"],
+            "last_ts": ts,
+            "samples": 1,
+        }
+        for q in quotes
+    ]
+
+    bar_insert = insert(QuoteBar).values(bars)
+    excluded = bar_insert.excluded
+    bar_upsert = bar_insert.on_conflict_do_update(
+        index_elements=[QuoteBar.symbol, QuoteBar.bucket],
+        set_={
+            "high": func.greatest(QuoteBar.high, excluded.high),
+            "low": func.least(QuoteBar.low, excluded.low),
+            # Out-of-order samples still count towards high/low but keep the newer close
+            "close": case(
+                (QuoteBar.last_ts <= excluded.last_ts, excluded.close), else_=QuoteBar.close
+            ),
+            "last_ts": func.greatest(QuoteBar.last_ts, excluded.last_ts),
+            "samples": QuoteBar.samples + 1,
+        },
+    )
+
+    try:
+        async with async_session_maker() as db:
+            await db.execute(insert(QuoteSample).values(samples).on_conflict_do_nothing())
+            await db.execute(bar_upsert)
+            await db.commit()
+    except Exception as e:
+        logger.error(f"Error recording quote history: {e}")
+
+
+def bucket_width(span: timedelta, points: int) -> timedelta:
+    """
+    Bucket width that fits `span` into at most about `points` buckets.
+
+    Below an hour widths are whole minutes over raw samples. From an hour up
+    they are read from hourly bars, so they snap up to HOURLY_WIDTHS and then
+    to whole days.
+    """
+    minutes = max(1, -(-int(span.total_seconds()) // (60 * points)))
+    width = max(MIN_BUCKET, timedelta(minutes=minutes))
+    if width < HOURLY:
+        return width
+    for ladder_width in HOURLY_WIDTHS:
+        if width <= ladder_width:
+            return ladder_width
+    return timedelta(days=-(-width // timedelta(days=1)))
+
+
+async def get_ohlc(
+    db: AsyncSession,
+    symbol: str,
+    span: timedelta,
+    points: int,
+    end: datetime | None = None,
+) -> dict:
+    """
+    Downsample a symbol's history over `span` into at most ~`points` OHLC buckets.
+
+    Returns:
+        dict with the bucket width, the source table used and the buckets
+    """
+    end = end or datetime.now(timezone.utc)
+    start = end - span
+    width = bucket_width(span, points)
+
+    if width >= HOURLY:
+        source = "hourly"
+        bucket = func.date_bin(width, QuoteBar.bucket, _BUCKET_ORIGIN)
+        query = select(
+            bucket.label("bucket"),
+            func.array_agg(aggregate_order_by(QuoteBar.open, QuoteBar.bucket.asc()))[1],
+            func.max(QuoteBar.high),
+            func.min(QuoteBar.low),
+            func.array_agg(aggregate_order_by(QuoteBar.close, QuoteBar.bucket.desc()))[1],
+            func.sum(QuoteBar.samples),
+        ).where(
+            QuoteBar.symbol == symbol,
+            QuoteBar.bucket >= start,
+            QuoteBar.bucket < end,
+        )
+    else:
+        source = "samples"
+        bucket = func.date_bin(width, QuoteSample.ts, _BUCKET_ORIGIN)
+        query = select(
+            bucket.label("bucket"),
+            func.array_agg(aggregate_order_by(QuoteSample.price, QuoteSample.ts.asc()))[1],
+            func.max(QuoteSample.price),
+            func.min(QuoteSample.price),
+            func.array_agg(aggregate_order_by(QuoteSample.price, QuoteSample.ts.desc()))[1],
+            func.count(),
+        ).where(
+            QuoteSample.symbol == symbol,
+            QuoteSample.ts >= start,
+            QuoteSample.ts < end,
+        )
+
+    result = await db.execute(query.group_by(bucket).order_by(bucket))
+
+    return {
+        "symbol": symbol,
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        "interval_seconds": int(width.total_seconds()),
+        "source": source,
+        "points": [
+            {"t": t.isoformat(), "o": o, "h": h, "l": low, "c": c, "n": int(n)}
+            for t, o, h, low, c, n in result.all()
+        ],
+    }
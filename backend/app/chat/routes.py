@@ -4,14 +4,15 @@ Chat routes using pydantic-ai AG-UI adapter.
 Supports the query agent for exploring monitoring reports.
 """
 
+import time
+
 from fastapi import APIRouter, Depends, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 from starlette.responses import Response
 
-from pydantic_ai.ui.ag_ui import AGUIAdapter
-
 from app.agent.core import create_query_deps, get_query_agent, list_agents
 from app.core.database import get_db
+from app.core.metrics import observe_agent_run
 
 router = APIRouter()
 
@@ -38,12 +39,12 @@ async def chat(
     if agent_id == "query":
         agent = get_query_agent()
         deps = create_query_deps(db)
-        return await AGUIAdapter.dispatch_request(request, agent=agent, deps=deps)
+        return await _dispatch(request, agent, deps)
     else:
         # Fallback to query agent for unknown agent IDs
         agent = get_query_agent()
         deps = create_query_deps(db)
-        return await AGUIAdapter.dispatch_request(request, agent=agent, deps=deps)
+        return await _dispatch(request, agent, deps)
 
 
 @router.options("/chat")
@@ -60,7 +61,22 @@ async def chat_default(
     """AG-UI compatible chat endpoint using query agent."""
     agent = get_query_agent()
     deps = create_query_deps(db)
-    return await AGUIAdapter.dispatch_request(request, agent=agent, deps=deps)
+    return await _dispatch(request, agent, deps)
+
+
+async def _dispatch(request: Request, agent, deps) -> Response:
+    """Run the agent over AG-UI, recording latency and token usage when the stream ends."""
+    # Import here to defer pydantic-ai until the first chat request
+    from pydantic_ai.ui.ag_ui import AGUIAdapter
+
+    started = time.perf_counter()
+
+    def on_complete(result):
+        observe_agent_run("query", started, result.usage())
+
+    return await AGUIAdapter.dispatch_request(
+        request, agent=agent, deps=deps, on_complete=on_complete
+    )
 
 
 @router.get("/chat/health")
@@ -0,0 +1,31 @@
+"""
+Compression helpers for large stored blobs (report payloads, full reports).
+
+Blobs are gzip-compressed once they cross REPORT_COMPRESSION_MIN_BYTES; the
+encoding is stored next to the bytes so uncompressed legacy values still decode.
+"""
+
+import gzip
+
+from app.core.config import settings
+
+GZIP_ENCODING = "gzip"
+
+
+def compress(data: bytes) -> tuple[bytes, str | None]:
+    """
+    Compress data if compression is enabled and it is large enough to benefit.
+
+    Returns:
+        Tuple of (stored bytes, encoding or None if stored uncompressed)
+    """
+    if settings.REPORT_COMPRESSION and len(data) >= settings.REPORT_COMPRESSION_MIN_BYTES:
+        return gzip.compress(data, compresslevel=6), GZIP_ENCODING
+    return data, None
+
+
+def decompress(data: bytes, encoding: str | None) -> bytes:
+    """Reverse compress() given the stored encoding."""
+    if encoding == GZIP_ENCODING:
+        return gzip.decompress(data)
+    return data
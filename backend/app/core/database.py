@@ -2,10 +2,24 @@
 Async SQLAlchemy database setup for PostgreSQL.
 """
 
+import hashlib
+import logging
+import time
+
+from sqlalchemy import event, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import DBAPIError, DisconnectionError
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.schema import CreateIndex, CreateTable
 
 from app.core.config import settings
+from app.core.jsoncodec import dumps_str, loads
+from app.core.metrics import db_pool_checkout_duration, db_pool_timeouts, registry
+
+logger = logging.getLogger(__name__)
 
 
 class Base(DeclarativeBase):
@@ -14,13 +28,83 @@ class Base(DeclarativeBase):
     pass
 
 
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records checkout waits, timeouts and how many tasks are waiting."""
+
+    waiting = 0
+
+    def _do_get(self):
+        started = time.perf_counter()
+        TimedQueuePool.waiting += 1
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            db_pool_timeouts.inc()
+            raise
+        finally:
+            TimedQueuePool.waiting -= 1
+            db_pool_checkout_duration.observe(time.perf_counter() - started)
+
+
 # Convert postgresql:// to postgresql+asyncpg:// for async support
 database_url = settings.DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://")
 
 engine = create_async_engine(
     database_url,
     echo=settings.LOCAL,  # Log SQL in local dev
-    pool_pre_ping=True,
+    poolclass=TimedQueuePool,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    connect_args={
+        # SQLAlchemy's own cache of prepared statements, used for every query
+        "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        # asyncpg's cache, used for the dialect's own queries on each connection
+        "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+    },
+    # JSON/JSONB values are encoded by the JSON type's bind processor with the
+    # serializer, and decoded by the asyncpg dialect's json/jsonb connection
+    # codecs with the deserializer, so neither direction goes through stdlib json.
+    json_serializer=dumps_str,
+    json_deserializer=loads,
+)
+
+
+# Instead of pool_pre_ping's round trip on every checkout, only connections that
+# sat idle long enough to have been dropped (server restart, proxy idle timeout)
+# are pinged. A dead one is discarded and the checkout retried with a fresh one;
+# a connection that breaks mid-use still invalidates the pool as usual.
+@event.listens_for(engine.sync_engine, "checkin")
+def _record_checkin(dbapi_connection, connection_record):
+    connection_record.info["checked_in"] = time.monotonic()
+
+
+@event.listens_for(engine.sync_engine, "checkout")
+def _ping_if_idle(dbapi_connection, connection_record, connection_proxy):
+    checked_in = connection_record.info.pop("checked_in", None)
+    if checked_in is None or time.monotonic() - checked_in < settings.DB_POOL_PING_IDLE_SECONDS:
+        return
+    try:
+        engine.dialect.do_ping(dbapi_connection)
+    except Exception as e:
+        raise DisconnectionError(f"Idle connection failed ping: {e}") from e
+
+
+registry.gauge(
+    "db_pool_connections_in_use",
+    "Database connections checked out of this process's pool",
+    lambda: engine.pool.checkedout(),
+)
+registry.gauge(
+    "db_pool_connections_idle",
+    "Open database connections waiting in this process's pool",
+    lambda: engine.pool.checkedin(),
+)
+registry.gauge(
+    "db_pool_waiting",
+    "Tasks waiting for a database connection (nonzero means the pool is saturated)",
+    lambda: TimedQueuePool.waiting,
 )
 
 async_session_maker = async_sessionmaker(
@@ -30,6 +114,47 @@ async_session_maker = async_sessionmaker(
 )
 
 
+# Idempotent DDL for columns added after a table was first created.
+# create_all() only creates missing tables, so new columns are patched in here.
+SCHEMA_UPGRADES: list[str] = [
+    "ALTER TABLE monitor_reports ADD COLUMN IF NOT EXISTS rendered_payload BYTEA",
+    "ALTER TABLE monitor_reports ADD COLUMN IF NOT EXISTS rendered_encoding VARCHAR(20)",
+    "ALTER TABLE monitor_reports ADD COLUMN IF NOT EXISTS full_report_data BYTEA",
+    "ALTER TABLE monitor_reports ADD COLUMN IF NOT EXISTS full_report_encoding VARCHAR(20)",
+    "ALTER TABLE monitor_reports ADD COLUMN IF NOT EXISTS checkpoints JSONB",
+    "ALTER TABLE monitor_reports ADD COLUMN IF NOT EXISTS timings JSONB",
+    "ALTER TABLE report_sections ADD COLUMN IF NOT EXISTS partial BOOLEAN NOT NULL DEFAULT false",
+    # Move the legacy JSONB full_report column into full_report_data (uncompressed)
+    """
+    DO $$
+    BEGIN
+        IF EXISTS (
+            SELECT 1 FROM information_schema.columns
+            WHERE table_name = 'monitor_reports' AND column_name = 'full_report'
+        ) THEN
+            UPDATE monitor_reports
+            SET full_report_data = convert_to(full_report::text, 'UTF8')
+            WHERE full_report IS NOT NULL AND full_report_data IS NULL;
+            ALTER TABLE monitor_reports DROP COLUMN full_report;
+        END IF;
+    END $$
+    """,
+    # Blobs are compressed by the app; keep TOAST from retrying pglz on them
+    "ALTER TABLE monitor_reports ALTER COLUMN full_report_data SET STORAGE EXTERNAL",
+    "ALTER TABLE monitor_reports ALTER COLUMN rendered_payload SET STORAGE EXTERNAL",
+]
+
+
+# Records which schema the database was last brought up to (see init_db)
+SCHEMA_VERSION_DDL = """
+CREATE TABLE IF NOT EXISTS schema_version (
+    id INTEGER PRIMARY KEY,
+    fingerprint VARCHAR(16) NOT NULL,
+    applied_at TIMESTAMPTZ NOT NULL
+)
+"""
+
+
 async def get_db():
     """Dependency to get async database session."""
     async with async_session_maker() as session:
@@ -39,7 +164,66 @@ async def get_db():
             await session.close()
 
 
+def schema_fingerprint() -> str:
+    """Hash of the DDL for every registered table and index plus SCHEMA_UPGRADES."""
+    dialect = postgresql.dialect()
+    digest = hashlib.sha256()
+    for table in Base.metadata.sorted_tables:
+        digest.update(str(CreateTable(table).compile(dialect=dialect)).encode())
+        for index in sorted(table.indexes, key=lambda i: i.name or ""):
+            digest.update(str(CreateIndex(index).compile(dialect=dialect)).encode())
+    for statement in SCHEMA_UPGRADES:
+        digest.update(statement.encode())
+    return digest.hexdigest()[:16]
+
+
+async def _applied_fingerprint() -> str | None:
+    """Fingerprint recorded by the last schema setup, or None before the first one."""
+    try:
+        async with engine.connect() as conn:
+            return await conn.scalar(text("SELECT fingerprint FROM schema_version WHERE id = 1"))
+    except DBAPIError:
+        return None  # No schema_version table yet
+
+
 async def init_db():
-    """Create all tables."""
+    """
+    Bring the schema up to date and make sure upcoming partitions exist.
+
+    Creating tables and applying column upgrades only runs when the schema
+    fingerprint stored in the database differs from the models'. Provisioning
+    the next months' partitions is idempotent and cheap, so it runs on every
+    start as a backstop for the nightly maintenance job: there is no default
+    partition, so inserts fail once a month has none.
+    """
+    # Import here to avoid circular imports
+    from app.core import partitions
+
+    fingerprint = schema_fingerprint()
+    changed = await _applied_fingerprint() != fingerprint
+    if changed:
+        logger.info(f"Schema changed, updating to {fingerprint}")
+
     async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+        # One process at a time when several boot together
+        await conn.execute(
+            text("SELECT pg_advisory_xact_lock(:id)"), {"id": settings.SCHEMA_LOCK_ID}
+        )
+        if changed:
+            await conn.run_sync(Base.metadata.create_all)
+            for statement in SCHEMA_UPGRADES:
+                await conn.execute(text(statement))
+            await partitions.convert_legacy_tables(conn, settings.PARTITION_MONTHS_AHEAD)
+
+        await partitions.ensure_partitions(conn, settings.PARTITION_MONTHS_AHEAD)
+
+        if changed:
+            await conn.execute(text(SCHEMA_VERSION_DDL))
+            await conn.execute(
+                text(
+                    "INSERT INTO schema_version (id, fingerprint, applied_at) "
+                    "VALUES (1, :fp, now()) "
+                    "ON CONFLICT (id) DO UPDATE SET fingerprint = :fp, applied_at = now()"
+                ),
+                {"fp": fingerprint},
+            )
@@ -0,0 +1,28 @@
+"""
+HTTP clients for upstream APIs (Tavily, Finnhub, HackerNews, Twitter).
+
+Tools create their clients through upstream_client() so the transport can be
+swapped process-wide, e.g. for recording or replaying traffic (see app.replay).
+"""
+
+import httpx
+
+_transport: httpx.AsyncBaseTransport | None = None
+
+
+def upstream_client(**kwargs) -> httpx.AsyncClient:
+    """Create an AsyncClient for an upstream API using the current transport override."""
+    if _transport is not None:
+        kwargs.setdefault("transport", _transport)
+    return httpx.AsyncClient(**kwargs)
+
+
+def set_upstream_transport(transport: httpx.AsyncBaseTransport | None) -> None:
+    """
+    Route every upstream client through `transport`; None restores real network access.
+
+    The transport is shared by concurrent clients, and each client calls its
+    aclose() on exit, so it must stay usable after aclose().
+    """
+    global _transport
+    _transport = transport
@@ -0,0 +1,75 @@
+"""
+Pluggable JSON backend.
+
+Uses orjson when it is installed, falling back to the standard library `json`
+module otherwise. The backend is picked once at import time from the
+JSON_BACKEND setting ('auto' | 'orjson' | 'stdlib') and used for API
+responses, pre-rendered report payloads and the asyncpg JSONB codec.
+"""
+
+import json
+from collections.abc import Callable
+from decimal import Decimal
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+from app.core.config import settings
+
+
+def _default(obj: Any) -> Any:
+    """Serialize types neither backend handles natively."""
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if hasattr(obj, "isoformat"):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _stdlib_dumps(obj: Any) -> bytes:
+    return json.dumps(
+        obj, ensure_ascii=False, separators=(",", ":"), default=_default
+    ).encode()
+
+
+def _load_backend(name: str) -> tuple[str, Callable[[Any], bytes], Callable[[Any], Any]]:
+    """Resolve a backend name to (name, dumps, loads)."""
+    if name in ("auto", "orjson"):
+        try:
+            import orjson
+        except ImportError:
+            if name == "orjson":
+                raise
+        else:
+
+            def _orjson_dumps(obj: Any) -> bytes:
+                return orjson.dumps(obj, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+            return "orjson", _orjson_dumps, orjson.loads
+
+    return "stdlib", _stdlib_dumps, json.loads
+
+
+BACKEND, _dumps, _loads = _load_backend(settings.JSON_BACKEND)
+
+
+def dumps(obj: Any) -> bytes:
+    """Encode an object to compact UTF-8 JSON bytes."""
+    return _dumps(obj)
+
+
+def dumps_str(obj: Any) -> str:
+    """Encode an object to a compact JSON string."""
+    return _dumps(obj).decode()
+
+
+def loads(data: bytes | str) -> Any:
+    """Decode JSON from bytes or str."""
+    return _loads(data)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered with the configured backend."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
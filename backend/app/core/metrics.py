@@ -0,0 +1,312 @@
+"""
+In-process metrics in the Prometheus text exposition format.
+
+Counters and histograms are plain dicts keyed by label values, updated in
+place from the event loop: no locks, and a label set allocates its slots once
+on first use. Histograms keep per-bucket counts and only accumulate them when
+scraped, so an observation is a bisect and two additions. Summaries keep a
+sliding window and compute quantiles when scraped. Gauges are callbacks read
+at scrape time. render() walks the registry once per scrape.
+"""
+
+import time
+from bisect import bisect_left
+from collections import deque
+from collections.abc import Callable
+
+# Default latency buckets in seconds (HTTP requests, fetches, pool checkouts)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Model calls are much slower
+LLM_BUCKETS = (0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0)
+
+
+class Counter:
+    """Monotonic counter with optional labels."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def samples(self):
+        for labels, value in self._values.items():
+            yield self.name, _labels(self.labelnames, labels), value
+
+
+class Histogram:
+    """Bucketed distribution of observed values with optional labels."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self.buckets = buckets
+        # labels -> [count per bucket..., count above the last bucket, sum]
+        self._values: dict[tuple[str, ...], list[float]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        slots = self._values.get(labels)
+        if slots is None:
+            slots = self._values[labels] = [0.0] * (len(self.buckets) + 2)
+        slots[bisect_left(self.buckets, value)] += 1
+        slots[-1] += value
+
+    def samples(self):
+        for labels, slots in self._values.items():
+            cumulative = 0.0
+            for bound, count in zip((*self.buckets, float("inf")), slots):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                yield (
+                    f"{self.name}_bucket",
+                    _labels((*self.labelnames, "le"), (*labels, le)),
+                    cumulative,
+                )
+            yield f"{self.name}_count", _labels(self.labelnames, labels), cumulative
+            yield f"{self.name}_sum", _labels(self.labelnames, labels), slots[-1]
+
+
+class Gauge:
+    """Value read from a callback at scrape time."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, read: Callable[[], float]):
+        self.name = name
+        self.help = help
+        self.read = read
+
+    def samples(self):
+        yield self.name, "", float(self.read())
+
+
+class Summary:
+    """
+    Quantiles over a sliding window of the most recent observations.
+
+    Quantiles are computed at scrape time; observing is a deque append.
+    """
+
+    kind = "summary"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        quantiles: tuple[float, ...] = (0.5, 0.9, 0.99),
+        window: int = 1000,
+    ):
+        self.name = name
+        self.help = help
+        self.quantiles = quantiles
+        self._recent: deque[float] = deque(maxlen=window)
+        self._count = 0
+        self._sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self._recent.append(value)
+        self._count += 1
+        self._sum += value
+
+    def samples(self):
+        recent = sorted(self._recent)
+        for q in self.quantiles:
+            value = recent[min(int(q * len(recent)), len(recent) - 1)] if recent else 0.0
+            yield self.name, _labels(("quantile",), (repr(q),)), value
+        yield f"{self.name}_count", "", float(self._count)
+        yield f"{self.name}_sum", "", self._sum
+
+
+class Registry:
+    def __init__(self):
+        self.metrics: dict[str, Counter | Histogram | Gauge | Summary] = {}
+
+    def register(self, metric):
+        self.metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help: str, labelnames: tuple[str, ...] = ()) -> Counter:
+        return self.register(Counter(name, help, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ) -> Histogram:
+        return self.register(Histogram(name, help, labelnames, buckets))
+
+    def gauge(self, name: str, help: str, read: Callable[[], float]) -> Gauge:
+        return self.register(Gauge(name, help, read))
+
+    def summary(self, name: str, help: str, window: int = 1000) -> Summary:
+        return self.register(Summary(name, help, window=window))
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text format (version 0.0.4)."""
+        lines = []
+        for metric in self.metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, labels, value in metric.samples():
+                lines.append(f"{name}{labels} {_format_value(value)}")
+        lines.append("")
+        return "\n".join(lines)
+
+
+def _labels(names: tuple[str, ...], values: tuple[str, ...]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+registry = Registry()
+
+http_request_duration = registry.histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ("method", "route", "status"),
+)
+source_fetch_duration = registry.histogram(
+    "source_fetch_duration_seconds",
+    "Monitoring source fetch latency",
+    ("source",),
+)
+source_fetch_errors = registry.counter(
+    "source_fetch_errors_total",
+    "Monitoring source fetches that failed or missed their budget",
+    ("source", "reason"),
+)
+llm_request_duration = registry.histogram(
+    "llm_request_duration_seconds",
+    "Agent run latency",
+    ("agent",),
+    buckets=LLM_BUCKETS,
+)
+llm_tokens = registry.counter(
+    "llm_tokens_total",
+    "Model tokens used by agent runs",
+    ("agent", "direction"),
+)
+llm_errors = registry.counter(
+    "llm_errors_total",
+    "Agent runs that raised",
+    ("agent",),
+)
+cache_requests = registry.counter(
+    "cache_requests_total",
+    "Cache lookups by result (hit | miss)",
+    ("cache", "result"),
+)
+db_pool_checkout_duration = registry.histogram(
+    "db_pool_checkout_seconds",
+    "Time spent waiting to check a connection out of the pool",
+)
+db_pool_timeouts = registry.counter(
+    "db_pool_timeouts_total",
+    "Pool checkouts that gave up waiting for a connection",
+)
+
+
+def observe_agent_run(agent: str, started: float, usage=None) -> None:
+    """
+    Record an agent run's latency and token usage.
+
+    Args:
+        agent: Agent name label
+        started: time.perf_counter() when the run started
+        usage: The run's usage (result.usage()), if it completed
+    """
+    llm_request_duration.observe(time.perf_counter() - started, agent)
+    if usage is None:
+        llm_errors.inc(agent)
+        return
+    llm_tokens.inc(agent, "input", amount=usage.input_tokens or 0)
+    llm_tokens.inc(agent, "output", amount=usage.output_tokens or 0)
+
+
+class AgentRun:
+    """
+    Context manager recording one agent run; set `usage` once the run completes.
+
+        with AgentRun("monitor") as run:
+            result = await agent.run(...)
+            run.usage = result.usage()
+    """
+
+    def __init__(self, agent: str):
+        self.agent = agent
+        self.usage = None
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        observe_agent_run(self.agent, self.started, self.usage)
+
+
+def cache_lookup(cache: str, hit: bool) -> None:
+    cache_requests.inc(cache, "hit" if hit else "miss")
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware timing HTTP requests by route template.
+
+    Requests that match no route share one label so unknown paths can't blow
+    up the number of series.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        started = time.perf_counter()
+        status = "500"
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = str(message["status"])
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            http_request_duration.observe(
+                time.perf_counter() - started,
+                scope["method"],
+                getattr(route, "path", "unmatched"),
+                status,
+            )
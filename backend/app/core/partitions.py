@@ -0,0 +1,165 @@
+"""
+Monthly range partitioning for the report tables.
+
+monitor_reports, report_sections and monitor_items are partitioned by RANGE on
+created_at, one partition per calendar month (e.g. monitor_reports_y2025m01).
+Sections and items inherit their report's created_at so a month's rows always
+live in the same-named partition of every table, which lets retention drop whole
+partitions instead of deleting rows.
+"""
+
+import logging
+import re
+from datetime import date, datetime
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from app.core.database import Base
+
+logger = logging.getLogger(__name__)
+
+# Child tables first: the order rows are deleted/dropped in
+PARTITIONED_TABLES = ("monitor_items", "report_sections", "monitor_reports")
+
+_PARTITION_SUFFIX = re.compile(r"_y(\d{4})m(\d{2})$")
+
+
+def _month_start(d: date) -> date:
+    return date(d.year, d.month, 1)
+
+
+def _add_months(d: date, months: int) -> date:
+    index = d.year * 12 + d.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    """Name of the partition holding `month` for `table`."""
+    return f"{table}_y{month.year:04d}m{month.month:02d}"
+
+
+async def is_partitioned(conn: AsyncConnection, table: str) -> bool:
+    """Whether `table` exists as a partitioned (relkind 'p') table."""
+    result = await conn.execute(
+        text("SELECT relkind::text FROM pg_class WHERE relname = :table"), {"table": table}
+    )
+    return result.scalar() == "p"
+
+
+async def ensure_partitions(
+    conn: AsyncConnection, months_ahead: int, since: date | None = None
+) -> None:
+    """Create monthly partitions from `since` (default: this month) through months_ahead."""
+    current = _month_start(datetime.utcnow().date())
+    month = _month_start(since) if since else current
+    last = _add_months(current, months_ahead)
+
+    while month <= last:
+        upper = _add_months(month, 1)
+        for table in reversed(PARTITIONED_TABLES):
+            await conn.execute(
+                text(
+                    f"CREATE TABLE IF NOT EXISTS {partition_name(table, month)} "
+                    f"PARTITION OF {table} "
+                    f"FOR VALUES FROM ('{month.isoformat()} 00:00:00+00') "
+                    f"TO ('{upper.isoformat()} 00:00:00+00')"
+                )
+            )
+        month = upper
+
+
+async def drop_expired_partitions(conn: AsyncConnection, retention_months: int) -> list[str]:
+    """
+    Drop partitions whose whole month is older than the retention window.
+
+    Returns:
+        Names of the dropped partitions
+    """
+    cutoff = _add_months(_month_start(datetime.utcnow().date()), -retention_months)
+    dropped = []
+
+    for table in PARTITIONED_TABLES:
+        result = await conn.execute(
+            text(
+                "SELECT c.relname FROM pg_inherits i "
+                "JOIN pg_class c ON c.oid = i.inhrelid "
+                "JOIN pg_class p ON p.oid = i.inhparent "
+                "WHERE p.relname = :table"
+            ),
+            {"table": table},
+        )
+        for (name,) in result.all():
+            match = _PARTITION_SUFFIX.search(name)
+            if not match:
+                continue
+            month = date(int(match.group(1)), int(match.group(2)), 1)
+            if _add_months(month, 1) <= cutoff:
+                await conn.execute(text(f"DROP TABLE IF EXISTS {name}"))
+                dropped.append(name)
+
+    return dropped
+
+
+async def convert_legacy_tables(conn: AsyncConnection, months_ahead: int) -> None:
+    """
+    Rebuild report tables created before partitioning as partitioned tables.
+
+    Rows are staged in temp tables, the plain tables are dropped and recreated
+    from the ORM metadata, and the rows are copied back with section/item
+    created_at realigned to their report's. Runs inside the caller's transaction.
+    """
+    legacy = [t for t in PARTITIONED_TABLES if not await is_partitioned(conn, t)]
+    if not legacy:
+        return
+
+    logger.info(f"Converting {', '.join(legacy)} to monthly partitioned tables")
+
+    for table in PARTITIONED_TABLES:
+        await conn.execute(
+            text(f"CREATE TEMP TABLE _legacy_{table} ON COMMIT DROP AS SELECT * FROM {table}")
+        )
+    for table in PARTITIONED_TABLES:
+        await conn.execute(text(f"DROP TABLE {table} CASCADE"))
+
+    tables = [Base.metadata.tables[t] for t in reversed(PARTITIONED_TABLES)]
+    await conn.run_sync(lambda sync_conn: Base.metadata.create_all(sync_conn, tables=tables))
+
+    oldest = (
+        await conn.execute(text("SELECT min(created_at) FROM _legacy_monitor_reports"))
+    ).scalar()
+    await ensure_partitions(conn, months_ahead, since=oldest.date() if oldest else None)
+
+    def columns(table: str, alias: str, aligned_created_at: str) -> tuple[str, str]:
+        names = [c.name for c in Base.metadata.tables[table].columns]
+        selected = [
+            aligned_created_at if name == "created_at" else f"{alias}.{name}" for name in names
+        ]
+        return ", ".join(names), ", ".join(selected)
+
+    cols, select_cols = columns("monitor_reports", "r", "r.created_at")
+    await conn.execute(
+        text(
+            f"INSERT INTO monitor_reports ({cols}) SELECT {select_cols} "
+            "FROM _legacy_monitor_reports r"
+        )
+    )
+
+    cols, select_cols = columns("report_sections", "s", "r.created_at")
+    await conn.execute(
+        text(
+            f"INSERT INTO report_sections ({cols}) SELECT {select_cols} "
+            "FROM _legacy_report_sections s "
+            "JOIN _legacy_monitor_reports r ON r.id = s.report_id"
+        )
+    )
+
+    cols, select_cols = columns("monitor_items", "m", "r.created_at")
+    await conn.execute(
+        text(
+            f"INSERT INTO monitor_items ({cols}) SELECT {select_cols} "
+            "FROM _legacy_monitor_items m "
+            "JOIN _legacy_report_sections s ON s.id = m.section_id "
+            "JOIN _legacy_monitor_reports r ON r.id = s.report_id"
+        )
+    )
@@ -0,0 +1,61 @@
+"""
+Pre-rendered API payloads for completed reports.
+
+Reports never change once they are completed, so their API representation is
+rendered (and optionally gzip-compressed) a single time by the scheduler and
+stored alongside the report. Read endpoints then stream the stored bytes
+instead of hydrating ORM objects and re-encoding JSON on every request.
+"""
+
+from fastapi import Request
+from starlette.responses import Response
+
+from app.core.compression import GZIP_ENCODING, compress, decompress
+from app.core.jsoncodec import dumps
+
+
+def render_report(report, sections) -> dict:
+    """Build the API representation of a report and its sections."""
+    return {
+        "id": str(report.id),
+        "created_at": report.created_at.isoformat(),
+        "updated_at": report.updated_at.isoformat(),
+        "status": report.status,
+        "summary": report.summary,
+        "full_report": report.full_report,
+        "error_message": report.error_message,
+        "sections": {
+            s.topic: {
+                "title": s.title,
+                "summary": s.summary,
+                "items": s.items,
+                "sources_count": s.sources_count,
+                "partial": bool(s.partial),
+            }
+            for s in sections
+        },
+    }
+
+
+def encode_payload(data: dict) -> tuple[bytes, str | None]:
+    """
+    Encode a rendered report to JSON bytes, compressing large payloads.
+
+    Returns:
+        Tuple of (payload bytes, content encoding or None if uncompressed)
+    """
+    return compress(dumps(data))
+
+
+def payload_response(request: Request, payload: bytes, encoding: str | None) -> Response:
+    """Stream a stored payload, decompressing only for clients that can't accept gzip."""
+    headers = {"Vary": "Accept-Encoding"}
+
+    if encoding == GZIP_ENCODING:
+        accepts_gzip = "gzip" in request.headers.get("accept-encoding", "").lower()
+        if accepts_gzip:
+            headers["Content-Encoding"] = GZIP_ENCODING
+        else:
+            payload = decompress(payload, encoding)
+
+    return Response(content=payload, media_type="application/json", headers=headers)
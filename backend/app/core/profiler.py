@@ -0,0 +1,128 @@
+"""
+In-process sampling profiler for live flame graphs.
+
+A background thread wakes every interval and records the stack of every
+other thread (sys._current_frames), plus the await chain of every pending
+asyncio task on the app's event loop. Suspended tasks don't show up in thread
+stacks at all, so the task view is what tells you where requests are waiting.
+
+Stacks are aggregated as counts per unique stack, and exported as collapsed
+stacks (flamegraph.pl, speedscope, inferno) or a speedscope JSON file.
+"""
+
+import asyncio
+import functools
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+# Site-packages paths are shortened to the package-relative path
+_PREFIXES = sorted({p for p in sys.path if p and os.path.isdir(p)}, key=len, reverse=True)
+
+
+class StackSampler:
+    """Samples thread stacks and asyncio task await chains for a fixed duration."""
+
+    def __init__(self, interval: float, loop: asyncio.AbstractEventLoop | None = None):
+        self.interval = interval
+        self.loop = loop
+        self.samples = 0
+        # (group, frames root-first) -> number of samples it was seen in
+        self.counts: Counter[tuple[str, tuple[str, ...]]] = Counter()
+
+    def run(self, duration: float) -> None:
+        """Sample until `duration` seconds have passed. Blocks the calling thread."""
+        me = threading.get_ident()
+        deadline = time.perf_counter() + duration
+        next_tick = time.perf_counter()
+        while next_tick < deadline:
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident != me:
+                    group = f"thread {names.get(ident, ident)}"
+                    self.counts[group, _frame_stack(frame)] += 1
+            if self.loop is not None:
+                self._sample_tasks()
+            self.samples += 1
+
+            next_tick += self.interval
+            time.sleep(max(next_tick - time.perf_counter(), 0))
+
+    def _sample_tasks(self) -> None:
+        try:
+            tasks = asyncio.all_tasks(self.loop)
+        except RuntimeError:
+            return  # Task set changed while copying it; skip this tick
+        for task in tasks:
+            stack = _await_stack(task.get_coro())
+            if stack:
+                self.counts["asyncio tasks", (f"task {task.get_name()}", *stack)] += 1
+
+    def collapsed(self) -> str:
+        """Collapsed stacks: 'group;outer;...;inner count' per line."""
+        return "".join(
+            f"{';'.join((group, *frames))} {count}\n"
+            for (group, frames), count in sorted(self.counts.items())
+        )
+
+    def speedscope(self, name: str) -> dict:
+        """Speedscope file with one sampled profile per thread, plus one for asyncio tasks."""
+        frames: dict[str, int] = {}
+        profiles: dict[str, dict] = {}
+        interval_ms = self.interval * 1000
+
+        for (group, stack), count in self.counts.items():
+            profile = profiles.setdefault(group, {
+                "type": "sampled",
+                "name": group,
+                "unit": "milliseconds",
+                "startValue": 0,
+                "endValue": 0,
+                "samples": [],
+                "weights": [],
+            })
+            profile["samples"].append([frames.setdefault(f, len(frames)) for f in stack])
+            profile["weights"].append(count * interval_ms)
+            profile["endValue"] += count * interval_ms
+
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": name,
+            "exporter": "egoudaxyz-profiler",
+            "shared": {"frames": [{"name": f} for f in frames]},
+            "profiles": sorted(profiles.values(), key=lambda p: p["name"]),
+        }
+
+
+def _frame_stack(frame) -> tuple[str, ...]:
+    stack = []
+    while frame is not None:
+        stack.append(_label(frame.f_code))
+        frame = frame.f_back
+    return tuple(reversed(stack))
+
+
+def _await_stack(coro) -> tuple[str, ...]:
+    """Follow a suspended coroutine's await chain, outermost first."""
+    stack = []
+    while coro is not None:
+        frame = getattr(coro, "cr_frame", None) or getattr(coro, "ag_frame", None)
+        if frame is None:
+            break
+        stack.append(_label(frame.f_code))
+        coro = getattr(coro, "cr_await", None) or getattr(coro, "ag_await", None)
+    return tuple(stack)
+
+
+@functools.lru_cache(maxsize=8192)
+def _label(code) -> str:
+    return f"{code.co_qualname} ({_short_path(code.co_filename)}:{code.co_firstlineno})"
+
+
+def _short_path(path: str) -> str:
+    for prefix in _PREFIXES:
+        if path.startswith(prefix):
+            return path[len(prefix):].lstrip(os.sep)
+    return path
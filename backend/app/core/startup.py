@@ -0,0 +1,46 @@
+"""
+Startup timing.
+
+Boot phases are marked as they finish and reported in one log line once the
+process is ready, e.g.
+
+    Ready in 1.21s (imports 0.84s, telemetry 0.01s, server 0.05s, database 0.02s, ...)
+
+The first phase starts at the first import of the app package. The total is
+also exported as the app_startup_seconds gauge.
+"""
+
+import logging
+import time
+
+from app import IMPORT_STARTED
+from app.core.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+_phases: dict[str, float] = {}
+_last_mark = IMPORT_STARTED
+_total = 0.0
+
+registry.gauge(
+    "app_startup_seconds",
+    "Seconds from the first app import until this process was ready",
+    lambda: _total,
+)
+
+
+def mark(phase: str) -> None:
+    """Record that `phase` finished now; it started when the previous phase finished."""
+    global _last_mark
+    now = time.perf_counter()
+    _phases[phase] = _phases.get(phase, 0.0) + now - _last_mark
+    _last_mark = now
+
+
+def ready() -> dict[str, float]:
+    """Log the startup breakdown and return it, in seconds."""
+    global _total
+    _total = time.perf_counter() - IMPORT_STARTED
+    breakdown = ", ".join(f"{phase} {seconds:.2f}s" for phase, seconds in _phases.items())
+    logger.info(f"Ready in {_total:.2f}s ({breakdown})")
+    return {"total": _total, **_phases}
@@ -0,0 +1,149 @@
+"""
+OpenTelemetry tracing through Logfire.
+
+pydantic-ai agents are always instrumented once tracing is on (as they are
+built, see app.agent.core). FastAPI, httpx (Tavily, Finnhub, HackerNews,
+Twitter), SQLAlchemy, asyncpg and scheduled jobs are opt-in via
+OTEL_INSTRUMENT, so their spans nest into one trace per request or job and a
+slow query or upstream call shows up inside it.
+
+Spans go to Logfire when LOGFIRE_TOKEN is set, to an OTLP/HTTP collector when
+OTEL_COLLECTOR_ENDPOINT is set, and/or to a JSON-lines file (OTEL_EXPORT_FILE).
+With none of these configured tracing stays off, and logfire and the
+OpenTelemetry SDK (slow to import) are never loaded at startup.
+"""
+
+import functools
+import logging
+import os
+from typing import TYPE_CHECKING
+
+from app.core.config import settings
+
+if TYPE_CHECKING:
+    import logfire
+
+logger = logging.getLogger(__name__)
+
+INSTRUMENTATIONS = ("fastapi", "httpx", "sqlalchemy", "asyncpg", "scheduler")
+
+_enabled = False
+
+
+def configure_telemetry(service_name: str) -> bool:
+    """
+    Configure tracing for this process and apply the opt-in instrumentations.
+
+    FastAPI is instrumented separately by instrument_app() once the app exists.
+
+    Returns:
+        Whether tracing is enabled
+    """
+    global _enabled
+
+    unknown = set(settings.OTEL_INSTRUMENT) - set(INSTRUMENTATIONS)
+    if unknown:
+        logger.warning(f"Ignoring unknown OTEL_INSTRUMENT entries: {', '.join(sorted(unknown))}")
+
+    processors = _span_processors()
+    if not settings.LOGFIRE_TOKEN and not processors:
+        return False
+
+    import logfire
+
+    logfire.configure(
+        token=settings.LOGFIRE_TOKEN or None,
+        send_to_logfire="if-token-present",
+        service_name=service_name,
+        sampling=_sampling(),
+        additional_span_processors=processors,
+    )
+    _enabled = True
+
+    if "httpx" in settings.OTEL_INSTRUMENT:
+        _instrument("httpx", logfire.instrument_httpx)
+    if "sqlalchemy" in settings.OTEL_INSTRUMENT:
+        # Import here to avoid circular imports
+        from app.core.database import engine
+
+        _instrument("sqlalchemy", logfire.instrument_sqlalchemy, engine=engine.sync_engine)
+    if "asyncpg" in settings.OTEL_INSTRUMENT:
+        _instrument("asyncpg", logfire.instrument_asyncpg)
+
+    logger.info(
+        f"Tracing enabled (sample rate {settings.OTEL_SAMPLE_RATE:g}, "
+        f"instrumented: {', '.join(settings.OTEL_INSTRUMENT) or 'pydantic-ai only'})"
+    )
+    return True
+
+
+def instrument_agent(agent) -> None:
+    """Trace an agent's runs, if tracing is on."""
+    if _enabled:
+        import logfire
+
+        logfire.instrument_pydantic_ai(agent)
+
+
+def instrument_app(app) -> None:
+    """Trace FastAPI requests, if tracing is on and 'fastapi' is opted in."""
+    if _enabled and "fastapi" in settings.OTEL_INSTRUMENT:
+        import logfire
+
+        _instrument("fastapi", logfire.instrument_fastapi, app, excluded_urls="/health,/metrics")
+
+
+def trace_job(func):
+    """Wrap a job coroutine in a root span, if tracing is on and 'scheduler' is opted in."""
+    if not _enabled or "scheduler" not in settings.OTEL_INSTRUMENT:
+        return func
+
+    @functools.wraps(func)
+    async def traced(*args, **kwargs):
+        import logfire
+
+        with logfire.span("job {job}", job=func.__name__):
+            return await func(*args, **kwargs)
+
+    return traced
+
+
+def _span_processors() -> list:
+    if not (settings.OTEL_COLLECTOR_ENDPOINT or settings.OTEL_EXPORT_FILE):
+        return []
+
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter
+
+    processors = []
+    if settings.OTEL_COLLECTOR_ENDPOINT:
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+
+        endpoint = f"{settings.OTEL_COLLECTOR_ENDPOINT.rstrip('/')}/v1/traces"
+        processors.append(BatchSpanProcessor(OTLPSpanExporter(endpoint=endpoint)))
+    if settings.OTEL_EXPORT_FILE:
+        exporter = ConsoleSpanExporter(
+            out=open(settings.OTEL_EXPORT_FILE, "a"),  # Kept open for the life of the process
+            formatter=lambda span: span.to_json(indent=None) + os.linesep,
+        )
+        processors.append(BatchSpanProcessor(exporter))
+    return processors
+
+
+def _sampling() -> "logfire.SamplingOptions":
+    """Head-sample OTEL_SAMPLE_RATE of traces, but keep every slow or failing one."""
+    import logfire
+
+    if settings.OTEL_SAMPLE_RATE >= 1 or not settings.OTEL_KEEP_SLOW_TRACES_SECONDS:
+        return logfire.SamplingOptions(head=settings.OTEL_SAMPLE_RATE)
+    return logfire.SamplingOptions.level_or_duration(
+        duration_threshold=settings.OTEL_KEEP_SLOW_TRACES_SECONDS,
+        background_rate=settings.OTEL_SAMPLE_RATE,
+    )
+
+
+def _instrument(name: str, instrument, *args, **kwargs) -> None:
+    try:
+        instrument(*args, **kwargs)
+    except RuntimeError as e:
+        # The matching opentelemetry-instrumentation package isn't installed
+        logger.warning(f"Could not instrument {name}: {e}")
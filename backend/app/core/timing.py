@@ -0,0 +1,102 @@
+"""
+Per-run timing spans for the monitoring pipeline.
+
+A RunTimer records a flat list of named spans (fetches, model calls, database
+writes, broadcasts) with their offset from the start of the run, duration and
+outcome. When tracing is on (see app.core.telemetry) each span is also emitted
+as a logfire span, so runs show up in the tracing backend; the compact
+breakdown from to_dict() is stored on the report itself so regressions are
+visible without one.
+"""
+
+import asyncio
+import time
+from collections.abc import Iterator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from contextvars import ContextVar
+from datetime import datetime
+
+from app.core import telemetry
+
+# Span being recorded in the current task, for annotate()
+_current_span: ContextVar[dict | None] = ContextVar("current_timing_span", default=None)
+
+
+class RunTimer:
+    """Collects timing spans for one attempt of a monitoring run."""
+
+    def __init__(self, attempt: int = 1):
+        self.attempt = attempt
+        self.started_at = datetime.utcnow()
+        self.spans: list[dict] = []
+        self._start = time.perf_counter()
+
+    @contextmanager
+    def span(self, name: str, **attrs) -> Iterator[dict]:
+        """
+        Time a block of work.
+
+        Works around awaits, and concurrent tasks each get their own span.
+        Extra attributes (counts, token usage) can be attached with annotate().
+        """
+        record = {"name": name, "attempt": self.attempt, **attrs}
+        token = _current_span.set(record)
+        start = time.perf_counter()
+        outcome = "ok"
+
+        otel: AbstractContextManager = nullcontext()
+        if telemetry._enabled:
+            # Import here so logfire only loads when tracing is on
+            import logfire
+
+            otel = logfire.span(f"monitor.{name}", **attrs)
+
+        with otel as otel_span:
+            record["_otel"] = otel_span
+            try:
+                yield record
+            except BaseException as e:
+                outcome = "cancelled" if isinstance(e, asyncio.CancelledError) else "error"
+                raise
+            finally:
+                _current_span.reset(token)
+                record.pop("_otel", None)
+                record["start_ms"] = round((start - self._start) * 1000, 1)
+                record["duration_ms"] = round((time.perf_counter() - start) * 1000, 1)
+                record["outcome"] = outcome
+                self.spans.append(record)
+
+    @property
+    def total_ms(self) -> float:
+        return round((time.perf_counter() - self._start) * 1000, 1)
+
+    def to_dict(self, previous: dict | None = None) -> dict:
+        """
+        Compact breakdown for MonitorReport.timings.
+
+        Spans from earlier attempts (a resumed run) are kept from `previous`.
+        """
+        earlier = [s for s in (previous or {}).get("spans", []) if s["attempt"] < self.attempt]
+        return {
+            "attempts": self.attempt,
+            "started_at": self.started_at.isoformat(),
+            "total_ms": self.total_ms,
+            "spans": earlier + sorted(self.spans, key=lambda s: s["start_ms"]),
+        }
+
+    def summary(self) -> str:
+        """One-line breakdown for the logs."""
+        return ", ".join(f"{s['name']} {s['duration_ms']:.0f}ms" for s in self.spans)
+
+
+def annotate(**attrs) -> None:
+    """Attach attributes to the span being recorded in this task, if any."""
+    record = _current_span.get()
+    if record is None:
+        return
+    record.update(attrs)
+    otel_span = record.get("_otel")
+    if otel_span is not None:
+        for key, value in attrs.items():
+            otel_span.set_attribute(key, value)
+
@@ -0,0 +1,97 @@
+"""
+Event-loop lag watchdog.
+
+A ticker task sleeps for a fixed interval and records how late it wakes up;
+that lag is how long everything else on the loop (handlers, the scheduler,
+WebSocket fan-out) had to wait. A separate thread watches the ticker's
+heartbeat: when the loop stops beating for longer than the threshold, it grabs
+the loop thread's stack right then, while the blocking code is still on it,
+and logs it.
+"""
+
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+
+from app.core.config import settings
+from app.core.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+loop_lag = registry.summary(
+    "event_loop_lag_seconds",
+    "How late the event loop ran a timer, over the most recent ticks",
+)
+loop_stalls = registry.counter(
+    "event_loop_stalls_total",
+    "Times the event loop was blocked for longer than LOOP_STALL_THRESHOLD_SECONDS",
+)
+
+
+class LoopWatchdog:
+    """Measures loop lag continuously and logs the stack of code that blocks the loop."""
+
+    def __init__(self, interval: float, threshold: float):
+        self.interval = interval
+        self.threshold = threshold
+        self._beat = time.monotonic()
+        self._ticker: asyncio.Task | None = None
+        self._thread: threading.Thread | None = None
+        self._stopped = threading.Event()
+
+    def start(self) -> None:
+        """Start watching the running loop (call from the loop's thread)."""
+        if self._ticker is not None:
+            return
+        self._loop_thread = threading.get_ident()
+        self._beat = time.monotonic()
+        self._stopped.clear()
+        self._ticker = asyncio.get_running_loop().create_task(self._tick())
+        self._thread = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._thread.start()
+
+    async def stop(self) -> None:
+        if self._ticker is None:
+            return
+        self._ticker.cancel()
+        self._ticker = None
+        self._stopped.set()
+        await asyncio.to_thread(self._thread.join, self.interval * 2)
+
+    async def _tick(self) -> None:
+        while True:
+            started = time.monotonic()
+            await asyncio.sleep(self.interval)
+            self._beat = time.monotonic()
+            lag = max(self._beat - started - self.interval, 0.0)
+            # Stalls are logged once, with their stack, by the watchdog thread
+            loop_lag.observe(lag)
+
+    def _watch(self) -> None:
+        """Watchdog thread: capture the loop's stack while it is blocked."""
+        reported = None
+        while not self._stopped.wait(self.interval):
+            beat = self._beat
+            stalled = time.monotonic() - beat - self.interval
+            if stalled <= self.threshold or beat == reported:
+                continue
+            reported = beat  # One report per stall
+
+            frame = sys._current_frames().get(self._loop_thread)
+            if frame is None:
+                continue
+            loop_stalls.inc()
+            stack = "".join(traceback.format_stack(frame))
+            logger.warning(
+                f"Event loop blocked for {stalled * 1000:.0f}ms so far, "
+                f"in:\n{stack}"
+            )
+
+
+watchdog = LoopWatchdog(
+    interval=settings.LOOP_LAG_INTERVAL_SECONDS,
+    threshold=settings.LOOP_STALL_THRESHOLD_SECONDS,
+)
@@ -5,22 +5,34 @@ FastAPI application for the World monitoring system.
 import logging
 from contextlib import asynccontextmanager
 
-import logfire
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.responses import Response
 
 from app.chat.routes import router as chat_router
+from app.core import startup
 from app.core.config import settings
 from app.core.database import init_db
+from app.core.jsoncodec import BACKEND as JSON_BACKEND
+from app.core.jsoncodec import FastJSONResponse
+from app.core.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE
+from app.core.metrics import MetricsMiddleware, registry
+from app.core.telemetry import configure_telemetry, instrument_app
+from app.core.watchdog import watchdog
+from app.realtime.hub import hub
+from app.realtime.pubsub import pubsub
+from app.routes.admin import router as admin_router
 from app.routes.arabifier import router as arabifier_router
+from app.routes.markets import router as markets_router
 from app.routes.reports import router as reports_router
 from app.routes.websocket import router as websocket_router
-from app.scheduler.tasks import setup_scheduler, shutdown_scheduler
-
-# Configure Logfire for observability (pydantic-ai only)
-if settings.LOGFIRE_TOKEN:
-    logfire.configure(token=settings.LOGFIRE_TOKEN, service_name="egoudaxyz-backend")
-    logfire.instrument_pydantic_ai()
+from app.scheduler.tasks import (
+    REPORT_EVENTS_CHANNEL,
+    relay_report_event,
+    require_inline_leader,
+    setup_scheduler,
+    shutdown_scheduler,
+)
 
 # Configure logging
 logging.basicConfig(
@@ -28,32 +40,54 @@ logging.basicConfig(
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
 )
 logger = logging.getLogger(__name__)
+startup.mark("imports")
+
+# Configure tracing (Logfire / OTLP collector / file)
+configure_telemetry(service_name="egoudaxyz-backend")
+startup.mark("telemetry")
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan - startup and shutdown events."""
     # Startup
-    logger.info("Starting up...")
+    startup.mark("server")
+    logger.info(f"Starting up (JSON backend: {JSON_BACKEND})...")
+    if settings.LOOP_WATCHDOG:
+        watchdog.start()
 
-    # Initialize database tables
+    # Bring the schema up to date (DDL only runs when it changed) and provision partitions
     await init_db()
     logger.info("Database initialized")
+    startup.mark("database")
+
+    # Relay report events published by any worker to this worker's sockets
+    pubsub.subscribe(REPORT_EVENTS_CHANNEL, relay_report_event)
+    await pubsub.start()
+    hub.start()
+    startup.mark("pubsub")
 
     # Start the scheduler
     setup_scheduler()
+    await require_inline_leader()
     logger.info("Scheduler started")
+    startup.mark("scheduler")
+    startup.ready()
 
     yield
 
     # Shutdown
     logger.info("Shutting down...")
-    shutdown_scheduler()
+    await shutdown_scheduler()
+    await pubsub.stop()
+    await hub.stop()
+    await watchdog.stop()
 
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
     lifespan=lifespan,
+    default_response_class=FastJSONResponse,
 )
 
 app.add_middleware(
@@ -64,11 +98,15 @@ app.add_middleware(
     allow_headers=["*"],
     expose_headers=["*"],
 )
+app.add_middleware(MetricsMiddleware)
+instrument_app(app)
 
 # Include routers
 app.include_router(chat_router, prefix=settings.API_V1_STR, tags=["chat"])
 app.include_router(reports_router, prefix=settings.API_V1_STR, tags=["reports"])
 app.include_router(arabifier_router, prefix=settings.API_V1_STR, tags=["arabifier"])
+app.include_router(markets_router, prefix=settings.API_V1_STR, tags=["markets"])
+app.include_router(admin_router, prefix=settings.API_V1_STR, tags=["admin"])
 # WebSocket at root level (no /api/v1 prefix) for easier Caddy proxying
 app.include_router(websocket_router, tags=["websocket"])
 
@@ -79,7 +117,16 @@ def health_check():
     return {"status": "ok", "project": settings.PROJECT_NAME}
 
 
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """Prometheus metrics for this worker."""
+    return Response(registry.render(), media_type=METRICS_CONTENT_TYPE)
+
+
 @app.get("/")
 def root():
     """Root endpoint."""
     return {"message": "World Monitoring System", "status": "running"}
+
+
+startup.mark("app")
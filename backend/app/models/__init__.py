@@ -1,5 +1,7 @@
 """Database models."""
 
+from app.models.jobs import MonitorJob
+from app.models.markets import QuoteBar, QuoteSample
 from app.models.reports import MonitorReport, ReportSection, MonitorItem
 
-__all__ = ["MonitorReport", "ReportSection", "MonitorItem"]
+__all__ = ["MonitorReport", "ReportSection", "MonitorItem", "QuoteSample", "QuoteBar", "MonitorJob"]
@@ -0,0 +1,73 @@
+"""
+ORM model for the durable monitoring job queue.
+"""
+
+import uuid
+from datetime import datetime
+
+from sqlalchemy import DateTime, Index, Integer, String, Text, func, text
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+
+
+class MonitorJob(Base):
+    """A queued monitoring run, claimed by workers with FOR UPDATE SKIP LOCKED."""
+
+    __tablename__ = "monitor_jobs"
+    __table_args__ = (
+        Index("ix_monitor_jobs_status_run_after", "status", "run_after"),
+        # At most one queued job per dedupe key; later triggers join it
+        Index(
+            "uq_monitor_jobs_queued_dedupe_key",
+            "dedupe_key",
+            unique=True,
+            postgresql_where=text("status = 'queued'"),
+        ),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+    )
+    source: Mapped[str] = mapped_column(
+        String(20), nullable=False, default="manual"
+    )  # 'manual' | 'scheduled'
+    status: Mapped[str] = mapped_column(
+        String(20), nullable=False, default="queued"
+    )  # 'queued' | 'running' | 'completed' | 'failed' | 'cancelled'
+    dedupe_key: Mapped[str | None] = mapped_column(String(100), nullable=True)
+    triggers: Mapped[int] = mapped_column(Integer, nullable=False, default=1)
+
+    # Retries and visibility timeout
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    max_attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=3)
+    run_after: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+    locked_by: Mapped[str | None] = mapped_column(String(100), nullable=True)
+    locked_until: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    # Report being resumed (retries) or produced (on completion)
+    report_id: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True), nullable=True)
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+    started_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    def to_dict(self) -> dict:
+        return {
+            "job_id": str(self.id),
+            "source": self.source,
+            "status": self.status,
+            "triggers": self.triggers,
+            "attempts": self.attempts,
+            "report_id": str(self.report_id) if self.report_id else None,
+            "error": self.error,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+        }
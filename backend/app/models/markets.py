@@ -0,0 +1,36 @@
+"""
+ORM models for market price history.
+"""
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, Float, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+
+
+class QuoteSample(Base):
+    """One price sample per symbol per market fetch."""
+
+    __tablename__ = "quote_samples"
+
+    symbol: Mapped[str] = mapped_column(String(16), primary_key=True)
+    ts: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True)
+    price: Mapped[float] = mapped_column(Float, nullable=False)
+    change_percent: Mapped[float | None] = mapped_column(Float, nullable=True)
+
+
+class QuoteBar(Base):
+    """Hourly OHLC bar, maintained incrementally as samples are written."""
+
+    __tablename__ = "quote_bars_hourly"
+
+    symbol: Mapped[str] = mapped_column(String(16), primary_key=True)
+    bucket: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True)
+    open: Mapped[float] = mapped_column(Float, nullable=False)
+    high: Mapped[float] = mapped_column(Float, nullable=False)
+    low: Mapped[float] = mapped_column(Float, nullable=False)
+    close: Mapped[float] = mapped_column(Float, nullable=False)
+    last_ts: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    samples: Mapped[int] = mapped_column(Integer, nullable=False, default=1)
@@ -1,27 +1,48 @@
 """
 ORM models for the monitoring system.
+
+All three tables are range-partitioned by month on created_at (see
+app.core.partitions), so primary keys include created_at and parent/child links
+are ORM-level joins rather than database foreign keys. Sections and items copy
+their report's created_at so related rows share a partition.
 """
 
 import uuid
 from datetime import datetime
 
-from sqlalchemy import DateTime, ForeignKey, Integer, Numeric, String, Text
+from sqlalchemy import (
+    Boolean,
+    DateTime,
+    Index,
+    Integer,
+    LargeBinary,
+    Numeric,
+    String,
+    Text,
+    false,
+)
 from sqlalchemy.dialects.postgresql import ARRAY, JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
+from app.core.compression import compress, decompress
 from app.core.database import Base
+from app.core.jsoncodec import dumps, loads
 
 
 class MonitorReport(Base):
     """Main monitoring report - created each time the monitor agent runs."""
 
     __tablename__ = "monitor_reports"
+    __table_args__ = (
+        Index("ix_monitor_reports_status_created_at", "status", "created_at"),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
     )
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), default=datetime.utcnow
+        DateTime(timezone=True), primary_key=True, default=datetime.utcnow, index=True
     )
     updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), default=datetime.utcnow, onupdate=datetime.utcnow
@@ -30,38 +51,81 @@ class MonitorReport(Base):
     # Report metadata
     report_type: Mapped[str] = mapped_column(
         String(50), nullable=False, default="scheduled"
-    )  # 'scheduled' | 'manual'
+    )  # 'scheduled' | 'manual' | 'digest'
     status: Mapped[str] = mapped_column(
         String(20), nullable=False, default="pending"
-    )  # 'pending' | 'running' | 'completed' | 'failed'
+    )  # 'pending' | 'fetching' | 'synthesizing' | 'completed' | 'failed'
 
     # Synthesized content
     summary: Mapped[str | None] = mapped_column(Text, nullable=True)
-    full_report: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
+
+    # Full MonitorOutput, compressed and only loaded when explicitly undeferred
+    full_report_data: Mapped[bytes | None] = mapped_column(
+        LargeBinary, nullable=True, deferred=True
+    )
+    full_report_encoding: Mapped[str | None] = mapped_column(
+        String(20), nullable=True
+    )  # 'gzip' | None
+
+    # Pre-rendered API payload, written once when the report completes
+    rendered_payload: Mapped[bytes | None] = mapped_column(
+        LargeBinary, nullable=True, deferred=True
+    )
+    rendered_encoding: Mapped[str | None] = mapped_column(
+        String(20), nullable=True
+    )  # 'gzip' | None
+
+    # Per-stage pipeline checkpoints: {stage: {"completed_at": ..., "data": ...}}.
+    # Stage data is dropped once the report completes.
+    checkpoints: Mapped[dict | None] = mapped_column(JSONB, nullable=True, deferred=True)
+
+    # Timing breakdown of the run: {"total_ms": ..., "spans": [{name, duration_ms, ...}]}
+    timings: Mapped[dict | None] = mapped_column(JSONB, nullable=True, deferred=True)
 
     # Error tracking
     error_message: Mapped[str | None] = mapped_column(Text, nullable=True)
 
     # Relationships
     sections: Mapped[list["ReportSection"]] = relationship(
-        "ReportSection", back_populates="report", cascade="all, delete-orphan"
+        "ReportSection",
+        primaryjoin="MonitorReport.id == foreign(ReportSection.report_id)",
+        back_populates="report",
+        cascade="all, delete-orphan",
     )
 
+    @property
+    def full_report(self) -> dict | None:
+        """
+        Decoded full report.
+
+        Requires full_report_data to be loaded, e.g. with
+        `.options(undefer(MonitorReport.full_report_data))`.
+        """
+        if self.full_report_data is None:
+            return None
+        return loads(decompress(self.full_report_data, self.full_report_encoding))
+
+    @full_report.setter
+    def full_report(self, value: dict | None) -> None:
+        if value is None:
+            self.full_report_data, self.full_report_encoding = None, None
+        else:
+            self.full_report_data, self.full_report_encoding = compress(dumps(value))
+
 
 class ReportSection(Base):
     """Topic section within a report (news, markets, social)."""
 
     __tablename__ = "report_sections"
+    __table_args__ = {"postgresql_partition_by": "RANGE (created_at)"}
 
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
     )
-    report_id: Mapped[uuid.UUID] = mapped_column(
-        UUID(as_uuid=True), ForeignKey("monitor_reports.id", ondelete="CASCADE")
-    )
+    report_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), index=True)
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), default=datetime.utcnow
-    )
+        DateTime(timezone=True), primary_key=True, default=datetime.utcnow
+    )  # Same as the parent report's created_at
 
     # Section identification
     topic: Mapped[str] = mapped_column(
@@ -75,14 +139,23 @@ class ReportSection(Base):
 
     # Metadata
     sources_count: Mapped[int] = mapped_column(Integer, default=0)
+    # Source missed its fetch budget or failed; the section may be incomplete
+    partial: Mapped[bool] = mapped_column(
+        Boolean, nullable=False, default=False, server_default=false()
+    )
     sentiment_score: Mapped[float | None] = mapped_column(Numeric(3, 2), nullable=True)
 
     # Relationships
     report: Mapped["MonitorReport"] = relationship(
-        "MonitorReport", back_populates="sections"
+        "MonitorReport",
+        primaryjoin="MonitorReport.id == foreign(ReportSection.report_id)",
+        back_populates="sections",
     )
     monitor_items: Mapped[list["MonitorItem"]] = relationship(
-        "MonitorItem", back_populates="section", cascade="all, delete-orphan"
+        "MonitorItem",
+        primaryjoin="ReportSection.id == foreign(MonitorItem.section_id)",
+        back_populates="section",
+        cascade="all, delete-orphan",
     )
 
 
@@ -90,16 +163,15 @@ class MonitorItem(Base):
     """Individual data item for granular querying."""
 
     __tablename__ = "monitor_items"
+    __table_args__ = {"postgresql_partition_by": "RANGE (created_at)"}
 
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
     )
-    section_id: Mapped[uuid.UUID] = mapped_column(
-        UUID(as_uuid=True), ForeignKey("report_sections.id", ondelete="CASCADE")
-    )
+    section_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), index=True)
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), default=datetime.utcnow
-    )
+        DateTime(timezone=True), primary_key=True, default=datetime.utcnow
+    )  # Same as the parent report's created_at
 
     # Item content
     source: Mapped[str] = mapped_column(String(100), nullable=False)
@@ -119,5 +191,7 @@ class MonitorItem(Base):
 
     # Relationships
     section: Mapped["ReportSection"] = relationship(
-        "ReportSection", back_populates="monitor_items"
+        "ReportSection",
+        primaryjoin="ReportSection.id == foreign(MonitorItem.section_id)",
+        back_populates="monitor_items",
     )
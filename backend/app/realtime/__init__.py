@@ -0,0 +1 @@
+"""Live event delivery: pub/sub and WebSocket fan-out."""
@@ -0,0 +1,185 @@
+"""
+WebSocket connection hub with per-client bounded send queues.
+
+Every connection gets its own outbound queue and writer task, so broadcasting
+is a synchronous O(clients) enqueue that never awaits network I/O and a slow
+client only ever delays itself. Messages may carry a coalescing key: a newer
+message with the same key replaces the queued one instead of growing the queue.
+When a queue is still full, the configured overflow policy either drops the
+oldest queued message or disconnects the client. A heartbeat pings every
+client and evicts the ones that sent nothing (not even a pong) for
+WS_IDLE_TIMEOUT_SECONDS. Successful sends don't count: a half-open socket keeps
+accepting writes until the kernel buffer fills.
+"""
+
+import asyncio
+import itertools
+import logging
+import time
+from collections import OrderedDict
+
+from fastapi import WebSocket
+
+from app.core.config import settings
+from app.core.jsoncodec import dumps_str
+from app.core.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+_unkeyed = itertools.count()
+
+
+class ClientConnection:
+    """One WebSocket with its bounded outbound queue and writer task."""
+
+    def __init__(self, websocket: WebSocket, max_queue: int, send_timeout: float):
+        self.websocket = websocket
+        self.max_queue = max_queue
+        self.send_timeout = send_timeout
+        self.last_activity = time.monotonic()  # Last frame received from the client
+        self.dropped = 0
+        self.closed = False
+        self.topics: set[str] | None = None  # None until the client subscribes
+        self._pending: OrderedDict[object, str] = OrderedDict()
+        self._ready = asyncio.Event()
+        self._writer: asyncio.Task | None = None
+
+    def start(self) -> None:
+        self._writer = asyncio.get_running_loop().create_task(self._write_loop())
+
+    def touch(self) -> None:
+        """Record activity from the client."""
+        self.last_activity = time.monotonic()
+
+    def has_pending(self, key: str) -> bool:
+        """Whether a message with this coalescing key is still waiting to be sent."""
+        return key in self._pending
+
+    def enqueue(self, message: str, key: str | None = None) -> bool:
+        """
+        Queue a message without awaiting I/O.
+
+        Returns:
+            False if the queue overflowed and the overflow policy had to act
+        """
+        if self.closed:
+            return False
+
+        if key is not None and key in self._pending:
+            self._pending[key] = message  # Coalesce with the queued message
+            return True
+
+        overflowed = len(self._pending) >= self.max_queue
+        if overflowed:
+            if settings.WS_OVERFLOW_POLICY == "disconnect":
+                self.close()
+                return False
+            self._pending.popitem(last=False)
+            self.dropped += 1
+
+        self._pending[key if key is not None else next(_unkeyed)] = message
+        self._ready.set()
+        return not overflowed
+
+    def close(self) -> None:
+        """Stop the writer and close the socket in the background."""
+        if self.closed:
+            return
+        self.closed = True
+        self._pending.clear()
+        if self._writer and self._writer is not asyncio.current_task():
+            self._writer.cancel()
+        asyncio.get_running_loop().create_task(self._close_socket())
+
+    async def _close_socket(self) -> None:
+        try:
+            await asyncio.wait_for(self.websocket.close(), self.send_timeout)
+        except Exception:
+            pass
+
+    async def _write_loop(self) -> None:
+        try:
+            while not self.closed:
+                await self._ready.wait()
+                self._ready.clear()
+                while self._pending and not self.closed:
+                    _, message = self._pending.popitem(last=False)
+                    await asyncio.wait_for(self.websocket.send_text(message), self.send_timeout)
+        except asyncio.CancelledError:
+            pass
+        except Exception:
+            self.close()
+
+
+class ConnectionHub:
+    """Tracks this worker's WebSocket clients and fans messages out to them."""
+
+    def __init__(self):
+        self.clients: set[ClientConnection] = set()
+        self._heartbeat: asyncio.Task | None = None
+
+    async def connect(self, websocket: WebSocket) -> ClientConnection:
+        """Accept a socket and start its writer."""
+        await websocket.accept()
+        client = ClientConnection(
+            websocket,
+            max_queue=settings.WS_SEND_QUEUE_SIZE,
+            send_timeout=settings.WS_SEND_TIMEOUT_SECONDS,
+        )
+        client.start()
+        self.clients.add(client)
+        return client
+
+    def disconnect(self, client: ClientConnection) -> None:
+        """Forget a client and stop its writer."""
+        self.clients.discard(client)
+        client.close()
+
+    def broadcast(self, message: str, key: str | None = None) -> int:
+        """
+        Enqueue a message for every client without awaiting network I/O.
+
+        Returns:
+            Number of clients whose queue overflowed
+        """
+        overflowed = 0
+        for client in list(self.clients):
+            if not client.enqueue(message, key):
+                overflowed += 1
+            if client.closed:
+                self.clients.discard(client)
+        return overflowed
+
+    def start(self) -> None:
+        if self._heartbeat is None:
+            self._heartbeat = asyncio.get_running_loop().create_task(self._heartbeat_loop())
+
+    async def stop(self) -> None:
+        if self._heartbeat:
+            self._heartbeat.cancel()
+            self._heartbeat = None
+        for client in list(self.clients):
+            self.disconnect(client)
+
+    async def _heartbeat_loop(self) -> None:
+        """Ping every client and evict the ones that stopped answering."""
+        while True:
+            await asyncio.sleep(settings.WS_HEARTBEAT_SECONDS)
+            now = time.monotonic()
+            stale = [
+                c for c in self.clients
+                if now - c.last_activity > settings.WS_IDLE_TIMEOUT_SECONDS
+            ]
+            for client in stale:
+                self.disconnect(client)
+            if stale:
+                logger.info(f"Evicted {len(stale)} unresponsive WebSocket client(s)")
+
+            self.broadcast(dumps_str({"type": "ping"}), key="ping")
+
+
+hub = ConnectionHub()
+
+registry.gauge(
+    "websocket_clients", "WebSocket clients connected to this worker", lambda: len(hub.clients)
+)
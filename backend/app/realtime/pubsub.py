@@ -0,0 +1,134 @@
+"""
+Cross-process pub/sub for live events.
+
+PostgresPubSub fans messages out to every worker with LISTEN/NOTIFY over one
+dedicated asyncpg connection per process; each worker then relays them to its
+own WebSocket clients. InProcessPubSub delivers within the current process only
+and is used when PUBSUB_BACKEND=memory or as a fallback while Postgres is
+unreachable.
+"""
+
+import asyncio
+import logging
+from collections import defaultdict
+from collections.abc import Awaitable, Callable
+
+import asyncpg
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+Subscriber = Callable[[str], Awaitable[None]]
+
+# Postgres rejects NOTIFY payloads of 8000 bytes or more
+MAX_NOTIFY_BYTES = 7999
+
+
+class InProcessPubSub:
+    """Delivers published messages to subscribers in this process."""
+
+    def __init__(self):
+        self._subscribers: dict[str, list[Subscriber]] = defaultdict(list)
+        self._tasks: set[asyncio.Task] = set()
+
+    async def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        for task in list(self._tasks):
+            task.cancel()
+
+    def subscribe(self, channel: str, callback: Subscriber) -> None:
+        """Register an async callback for messages on `channel`. Call before start()."""
+        self._subscribers[channel].append(callback)
+
+    async def publish(self, channel: str, message: str) -> None:
+        """Publish a message to every subscriber of `channel`."""
+        self._dispatch(channel, message)
+
+    def _dispatch(self, channel: str, message: str) -> None:
+        for callback in self._subscribers.get(channel, []):
+            # Keep a reference so the task isn't garbage-collected mid-delivery
+            task = asyncio.get_running_loop().create_task(self._deliver(callback, message))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _deliver(self, callback: Subscriber, message: str) -> None:
+        try:
+            await callback(message)
+        except Exception as e:
+            logger.error(f"Pub/sub subscriber failed: {e}", exc_info=True)
+
+
+class PostgresPubSub(InProcessPubSub):
+    """Fans messages out to every process via Postgres LISTEN/NOTIFY."""
+
+    def __init__(self, dsn: str, reconnect_seconds: float = 5.0):
+        super().__init__()
+        self.dsn = dsn
+        self.reconnect_seconds = reconnect_seconds
+        self._conn: asyncpg.Connection | None = None
+        self._supervisor: asyncio.Task | None = None
+        # asyncpg connections run one query at a time
+        self._publish_lock = asyncio.Lock()
+
+    async def start(self) -> None:
+        await self._connect()
+        self._supervisor = asyncio.get_running_loop().create_task(self._supervise())
+
+    async def stop(self) -> None:
+        if self._supervisor:
+            self._supervisor.cancel()
+            self._supervisor = None
+        if self._conn and not self._conn.is_closed():
+            await self._conn.close()
+        self._conn = None
+        await super().stop()
+
+    async def publish(self, channel: str, message: str) -> None:
+        if len(message.encode()) > MAX_NOTIFY_BYTES:
+            raise ValueError(f"Message for '{channel}' exceeds the NOTIFY payload limit")
+
+        if self._conn is not None and not self._conn.is_closed():
+            try:
+                # Our own LISTEN delivers it back to this process as well
+                async with self._publish_lock:
+                    await self._conn.execute("SELECT pg_notify($1, $2)", channel, message)
+                return
+            except Exception as e:
+                logger.warning(f"NOTIFY failed, delivering locally only: {e}")
+
+        self._dispatch(channel, message)
+
+    async def _connect(self) -> None:
+        try:
+            conn = await asyncpg.connect(self.dsn)
+            for channel in self._subscribers:
+                await conn.add_listener(channel, self._on_notify)
+        except Exception as e:
+            logger.warning(f"Pub/sub LISTEN connection unavailable, using in-process: {e}")
+            return
+        self._conn = conn
+        logger.info(f"Listening on {', '.join(self._subscribers) or 'no channels'}")
+
+    async def _supervise(self) -> None:
+        """Reconnect and re-LISTEN whenever the connection drops."""
+        while True:
+            await asyncio.sleep(self.reconnect_seconds)
+            if self._conn is None or self._conn.is_closed():
+                self._conn = None
+                await self._connect()
+
+    def _on_notify(self, conn, pid: int, channel: str, payload: str) -> None:
+        self._dispatch(channel, payload)
+
+
+def create_pubsub() -> InProcessPubSub:
+    """Build the configured pub/sub backend."""
+    if settings.PUBSUB_BACKEND == "postgres":
+        return PostgresPubSub(settings.DATABASE_URL)
+    return InProcessPubSub()
+
+
+pubsub = create_pubsub()
@@ -0,0 +1,296 @@
+"""
+Report delta streaming over /ws/reports.
+
+Clients may subscribe to topics (news, markets, social, quotes) by sending
+{"type": "subscribe", "topics": [...]}. Subscribers get a "report_snapshot" of
+their topics straight away and then, for each new report, a "report_delta"
+carrying only the topics that changed (quotes are diffed per symbol), so they
+never need to re-fetch /reports/latest. Clients that never subscribe keep
+receiving the plain "report_update" notification.
+
+While a report is still being built, each landed fetch stage produces a
+"report_stage" event. Subscribers of the stage's topics get a "report_partial"
+message carrying the raw section (and raw quotes) right away; everyone else
+gets the small stage notification.
+
+Each worker loads a new report's pre-rendered payload once, diffs it against
+the previous one it saw, and serializes one message per distinct topic set.
+Compression on the wire is left to the server's permessage-deflate support
+(negotiated by uvicorn's websockets implementation by default).
+"""
+
+import logging
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import select
+
+from app.core.compression import decompress
+from app.core.database import async_session_maker
+from app.core.jsoncodec import dumps_str, loads
+from app.core.metrics import cache_lookup
+from app.models.reports import MonitorReport, ReportSection
+from app.realtime.hub import ClientConnection, hub
+
+logger = logging.getLogger(__name__)
+
+TOPICS = ("news", "markets", "social", "quotes")
+
+# Coalescing key for report messages in a client's queue
+REPORT_KEY = "report"
+
+# Topics fed by each fetch stage of an in-progress report
+STAGE_TOPICS = {"news": ("news",), "markets": ("markets", "quotes"), "social": ("social",)}
+
+
+def topic_views(report: dict) -> dict[str, Any]:
+    """Split a rendered report into the per-topic data clients subscribe to."""
+    full = report.get("full_report") or {}
+    sections = report.get("sections") or {}
+    return {
+        "news": {
+            "section": sections.get("news"),
+            "analysis": full.get("news"),
+            "top_news": full.get("top_news", []),
+        },
+        "markets": {
+            "section": sections.get("markets"),
+            "analysis": full.get("markets"),
+            "market_sentiment": full.get("market_sentiment"),
+        },
+        "social": {
+            "section": sections.get("social"),
+            "analysis": full.get("social"),
+            "top_tech": full.get("top_tech", []),
+        },
+        "quotes": {q.get("symbol"): q for q in full.get("market_quotes", [])},
+    }
+
+
+def compute_delta(previous: dict | None, current: dict) -> dict[str, Any]:
+    """
+    Diff two rendered reports by topic.
+
+    Changed topics carry {"replace": view}; quotes carry only the symbols that
+    changed or disappeared. Unchanged topics are omitted.
+    """
+    new_views = topic_views(current)
+    if previous is None:
+        return {topic: {"replace": view} for topic, view in new_views.items()}
+
+    old_views = topic_views(previous)
+    delta: dict[str, Any] = {}
+
+    for topic in ("news", "markets", "social"):
+        if new_views[topic] != old_views[topic]:
+            delta[topic] = {"replace": new_views[topic]}
+
+    old_quotes, new_quotes = old_views["quotes"], new_views["quotes"]
+    changed = {s: q for s, q in new_quotes.items() if old_quotes.get(s) != q}
+    removed = [s for s in old_quotes if s not in new_quotes]
+    if changed or removed:
+        delta["quotes"] = {"changed": changed, "removed": removed}
+
+    return delta
+
+
+def _header(report: dict) -> dict:
+    return {
+        "report_id": report.get("id"),
+        "created_at": report.get("created_at"),
+        "summary": report.get("summary"),
+    }
+
+
+class ReportStream:
+    """Per-worker state for turning report events into topic deltas."""
+
+    def __init__(self):
+        self.latest: dict | None = None
+        # Clients that got partial sections of the report being built; their
+        # state no longer matches the previous report, so they get a snapshot
+        self._partial_report_id: str | None = None
+        self._partial_clients: set[ClientConnection] = set()
+
+    async def on_event(self, message: str) -> None:
+        """Handle a published report event on this worker."""
+        event = loads(message)
+        if event.get("type") == "report_stage":
+            await self.on_stage_update(event, message)
+        else:
+            await self.on_report_update(event, message)
+
+    async def on_stage_update(self, event: dict, message: str) -> None:
+        """Push a landed fetch stage of an in-progress report."""
+        stage = event["stage"]
+        stage_topics = STAGE_TOPICS.get(stage, ())
+        key = f"stage:{event['report_id']}:{stage}"
+
+        wanted = [c for c in hub.clients if c.topics and c.topics.intersection(stage_topics)]
+        section = (
+            await _load_section(event["report_id"], stage, event.get("report_created_at"))
+            if wanted
+            else None
+        )
+        if event["report_id"] != self._partial_report_id:
+            self._partial_report_id = event["report_id"]
+            self._partial_clients = set()
+
+        rendered: dict[frozenset, str] = {}
+        for client in list(hub.clients):
+            if section is None or client not in wanted:
+                client.enqueue(message, key=key)
+                continue
+
+            topics = frozenset(client.topics.intersection(stage_topics))
+            if topics not in rendered:
+                partial = {}
+                for topic in topics:
+                    if topic == "quotes":
+                        partial[topic] = {"partial": {q.get("symbol"): q for q in section["items"]}}
+                    else:
+                        partial[topic] = {"partial": {"section": section}}
+                rendered[topics] = dumps_str({
+                    "type": "report_partial",
+                    "report_id": event["report_id"],
+                    "stage": stage,
+                    "status": event["status"],
+                    "topics": partial,
+                })
+            client.enqueue(rendered[topics], key=key)
+            self._partial_clients.add(client)
+
+    async def on_report_update(self, event: dict, message: str) -> None:
+        """Handle a published report_update event on this worker."""
+        report = await _load_rendered_report(event["report_id"])
+        if report is None:
+            hub.broadcast(message, key=REPORT_KEY)
+            return
+
+        previous = self.latest
+        if previous is not None and previous.get("id") == report.get("id"):
+            return
+        if previous is None:
+            previous = await _load_rendered_report(None, before=report)
+        self.latest = report
+
+        delta = compute_delta(previous, report)
+        partial_clients = set()
+        if self._partial_report_id == report.get("id"):
+            partial_clients = self._partial_clients
+            self._partial_report_id, self._partial_clients = None, set()
+        header = {
+            "type": "report_delta",
+            "base_report_id": previous.get("id") if previous else None,
+            **_header(report),
+        }
+
+        # Serialize once per distinct topic subscription
+        rendered: dict[frozenset, str] = {}
+        snapshots: dict[frozenset, str] = {}
+        for client in list(hub.clients):
+            if client.topics is None:
+                client.enqueue(message, key=REPORT_KEY)
+                continue
+
+            topics = frozenset(client.topics)
+            if client.has_pending(REPORT_KEY) or client in partial_clients:
+                # A delta would be lost by coalescing, or wouldn't apply on top of
+                # partial sections; send full state instead
+                if topics not in snapshots:
+                    snapshots[topics] = self._snapshot(client.topics)
+                client.enqueue(snapshots[topics], key=REPORT_KEY)
+                continue
+
+            if topics not in rendered:
+                changed = {t: d for t, d in delta.items() if t in topics}
+                rendered[topics] = dumps_str({**header, "topics": changed}) if changed else ""
+            if rendered[topics]:
+                client.enqueue(rendered[topics], key=REPORT_KEY)
+
+    async def subscribe(self, client: ClientConnection, topics: list[str]) -> None:
+        """Subscribe a client to topics and send it a snapshot of them."""
+        client.topics = {t for t in topics if t in TOPICS}
+        cache_lookup("report_stream", self.latest is not None)
+        if self.latest is None:
+            self.latest = await _load_rendered_report(None)
+        if self.latest is not None:
+            client.enqueue(self._snapshot(client.topics), key=REPORT_KEY)
+
+    def unsubscribe(self, client: ClientConnection) -> None:
+        """Return a client to plain report_update notifications."""
+        client.topics = None
+
+    def _snapshot(self, topics: set[str]) -> str:
+        views = topic_views(self.latest)
+        return dumps_str({
+            "type": "report_snapshot",
+            **_header(self.latest),
+            "topics": {t: {"replace": views[t]} for t in topics},
+        })
+
+
+async def _load_section(
+    report_id: str, topic: str, report_created_at: str | None
+) -> dict | None:
+    """Load one section of an in-progress report."""
+    query = select(ReportSection).where(
+        ReportSection.report_id == report_id, ReportSection.topic == topic
+    )
+    # Events from publishers predating report_created_at fall back to scanning every partition
+    if report_created_at is not None:
+        query = query.where(
+            ReportSection.created_at == datetime.fromisoformat(report_created_at)
+        )
+    try:
+        async with async_session_maker() as db:
+            section = await db.scalar(query)
+    except Exception as e:
+        logger.error(f"Error loading section for WebSocket push: {e}")
+        return None
+
+    if section is None:
+        return None
+    return {
+        "title": section.title,
+        "summary": section.summary,
+        "items": section.items,
+        "sources_count": section.sources_count,
+        "partial": section.partial,
+    }
+
+
+async def _load_rendered_report(report_id: str | None, before: dict | None = None) -> dict | None:
+    """
+    Load a completed report's pre-rendered payload.
+
+    With no report_id, loads the latest completed report (created before
+    `before`, if given).
+    """
+    query = select(MonitorReport.rendered_payload, MonitorReport.rendered_encoding).where(
+        MonitorReport.status == "completed",
+        MonitorReport.rendered_payload.is_not(None),
+    )
+    if report_id is not None:
+        query = query.where(MonitorReport.id == report_id)
+    else:
+        if before is not None:
+            query = query.where(
+                MonitorReport.created_at < datetime.fromisoformat(before["created_at"]),
+                MonitorReport.id != before["id"],
+            )
+        query = query.order_by(MonitorReport.created_at.desc()).limit(1)
+
+    try:
+        async with async_session_maker() as db:
+            row = (await db.execute(query)).one_or_none()
+    except Exception as e:
+        logger.error(f"Error loading report for WebSocket delta: {e}")
+        return None
+
+    if row is None:
+        return None
+    return loads(decompress(row.rendered_payload, row.rendered_encoding))
+
+
+report_stream = ReportStream()
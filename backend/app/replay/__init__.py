@@ -0,0 +1,86 @@
+"""
+Offline record/replay of upstream APIs and the model.
+
+    with recording("cassettes/monitor.json"):
+        await run_monitoring_task("manual")     # real network and model
+
+    with replaying("cassettes/monitor.json", FaultInjection(latency=None)):
+        await run_monitoring_task("manual")     # no network, no credentials
+
+While recording, every upstream httpx call (Tavily, Finnhub, HackerNews,
+Twitter) and every model response of the monitor and arabifier agents is
+stored in the cassette. Replaying serves them back deterministically, with
+optional latency and failure injection. See `python -m app.replay --help`.
+"""
+
+import os
+from collections.abc import Iterator
+from contextlib import ExitStack, contextmanager
+from pathlib import Path
+
+from app.core.config import settings
+from app.core.http import set_upstream_transport
+from app.replay.cassette import (
+    Cassette,
+    CassetteMissError,
+    FaultInjection,
+    RecordingTransport,
+    ReplayTransport,
+)
+from app.replay.model import RecordingModel, replay_model
+
+__all__ = [
+    "Cassette",
+    "CassetteMissError",
+    "FaultInjection",
+    "recording",
+    "replaying",
+]
+
+# Settings that gate upstream calls; replay fills them with placeholders
+CREDENTIAL_SETTINGS = ("TAVILY_API_KEY", "FINNHUB_API_KEY", "TWITTER_BEARER_TOKEN")
+
+
+def _agents() -> dict:
+    # Import here so replay can provide a placeholder model key first
+    from app.agent.core import get_agent
+
+    return {name: get_agent(name) for name in ("monitor", "arabifier")}
+
+
+@contextmanager
+def recording(path: str | Path) -> Iterator[Cassette]:
+    """Record upstream HTTP traffic and agent model responses into a cassette file."""
+    cassette = Cassette(path)
+    transport = RecordingTransport(cassette)
+    with ExitStack() as stack:
+        for name, agent in _agents().items():
+            stack.enter_context(agent.override(model=RecordingModel(agent.model, cassette, name)))
+        set_upstream_transport(transport)
+        try:
+            yield cassette
+        finally:
+            set_upstream_transport(None)
+            cassette.save()
+
+
+@contextmanager
+def replaying(path: str | Path, faults: FaultInjection | None = None) -> Iterator[Cassette]:
+    """Serve upstream HTTP traffic and agent model responses from a cassette file."""
+    cassette = Cassette.load(path)
+    os.environ.setdefault("PYDANTIC_AI_GATEWAY_API_KEY", "replay")
+    saved = {name: getattr(settings, name) for name in CREDENTIAL_SETTINGS}
+
+    with ExitStack() as stack:
+        for name, agent in _agents().items():
+            if name in cassette.models:
+                stack.enter_context(agent.override(model=replay_model(cassette, name, faults)))
+        for name in CREDENTIAL_SETTINGS:
+            setattr(settings, name, saved[name] or "replay")
+        set_upstream_transport(ReplayTransport(cassette, faults))
+        try:
+            yield cassette
+        finally:
+            set_upstream_transport(None)
+            for name, value in saved.items():
+                setattr(settings, name, value)
@@ -0,0 +1,98 @@
+"""
+Record or replay a monitoring run or an arabify call: `python -m app.replay`.
+
+    python -m app.replay record monitor --cassette cassettes/monitor.json
+    python -m app.replay replay monitor --cassette cassettes/monitor.json \\
+        --latency recorded --failure-rate 0.2 --failure-mode timeout
+    python -m app.replay record arabify --cassette cassettes/tweet.json --url https://x.com/...
+
+Recording needs the real credentials; replaying needs only a database.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+
+from app.replay import FaultInjection, recording, replaying
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m app.replay", description=__doc__.split("\n")[1]
+    )
+    parser.add_argument("mode", choices=["record", "replay"])
+    parser.add_argument("flow", choices=["monitor", "arabify"])
+    parser.add_argument("--cassette", required=True, help="Cassette JSON file")
+    parser.add_argument("--url", help="Tweet URL for the arabify flow")
+    parser.add_argument("--text", help="Text for the arabify flow (instead of --url)")
+
+    faults = parser.add_argument_group("replay fault injection")
+    faults.add_argument(
+        "--latency",
+        default="0",
+        help="Seconds added per call, or 'recorded' to reuse recorded latencies (default: 0)",
+    )
+    faults.add_argument("--latency-scale", type=float, default=1.0)
+    faults.add_argument("--failure-rate", type=float, default=0.0)
+    faults.add_argument("--failure-mode", choices=["error", "timeout"], default="error")
+    faults.add_argument("--seed", type=int, default=0)
+
+    args = parser.parse_args()
+    if args.flow == "arabify" and not (args.url or args.text):
+        parser.error("arabify needs --url or --text")
+    return args
+
+
+async def run_flow(args: argparse.Namespace) -> None:
+    # Import here so replay can provide placeholder credentials first
+    from sqlalchemy import select
+
+    import app.models  # noqa: F401
+    from app.agent.arabifier_agent import arabify_text, arabify_tweet
+    from app.core.database import async_session_maker, init_db
+    from app.models.reports import MonitorReport
+    from app.scheduler.tasks import run_monitoring_task
+
+    if args.flow == "arabify":
+        output = await (arabify_text(args.text) if args.text else arabify_tweet(args.url))
+        print(output.model_dump_json(indent=2))
+        return
+
+    await init_db()
+    report_id = await run_monitoring_task("manual")
+    print(f"Report {report_id}")
+
+    async with async_session_maker() as db:
+        timings = await db.scalar(
+            select(MonitorReport.timings).where(MonitorReport.id == report_id)
+        )
+    print(json.dumps(timings, indent=2))
+
+
+def main() -> None:
+    args = parse_args()
+    if args.mode == "record":
+        session = recording(args.cassette)
+    else:
+        session = replaying(
+            args.cassette,
+            FaultInjection(
+                latency=None if args.latency == "recorded" else float(args.latency),
+                latency_scale=args.latency_scale,
+                failure_rate=args.failure_rate,
+                failure_mode=args.failure_mode,
+                seed=args.seed,
+            ),
+        )
+    with session:
+        asyncio.run(run_flow(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+"""
+Cassette store and httpx transports for recording and replaying upstream traffic.
+
+A cassette is one JSON file holding the HTTP interactions of a run plus the
+model responses of each agent (see app.replay.model). Requests are matched on
+method, URL and a hash of the body, with credentials stripped first, so
+cassettes can be committed and replayed without any keys. Repeated identical
+requests replay their recorded responses in order.
+"""
+
+import asyncio
+import hashlib
+import json
+import random
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import httpx
+
+from app.core.jsoncodec import loads
+
+CASSETTE_VERSION = 1
+
+# Query parameters and JSON body fields that carry credentials
+SECRET_FIELDS = {"api_key", "apikey", "token", "access_token", "key"}
+
+
+class CassetteMissError(httpx.TransportError):
+    """A replayed request has no recorded interaction."""
+
+
+class Cassette:
+    """Recorded HTTP interactions and model responses, keyed for replay."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.http: dict[str, list[dict]] = {}
+        # agent -> runs -> [{"elapsed": ..., "response": ...}]
+        self.models: dict[str, list[list[dict]]] = {}
+        self._cursors: dict[str, int] = {}
+
+    @classmethod
+    def load(cls, path: str | Path) -> "Cassette":
+        cassette = cls(path)
+        data = loads(Path(path).read_bytes())
+        if data.get("version") != CASSETTE_VERSION:
+            raise ValueError(f"Unsupported cassette version: {data.get('version')}")
+        for interaction in data["http"]:
+            cassette.http.setdefault(interaction["key"], []).append(interaction)
+        cassette.models = data.get("models", {})
+        return cassette
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = {
+            "version": CASSETTE_VERSION,
+            "recorded_at": datetime.utcnow().isoformat(),
+            "http": [i for interactions in self.http.values() for i in interactions],
+            "models": self.models,
+        }
+        # Indented so cassettes diff cleanly when re-recorded
+        self.path.write_text(json.dumps(data, ensure_ascii=False, indent=1))
+
+    def add(self, request: httpx.Request, response: httpx.Response, elapsed: float) -> None:
+        key = request_key(request)
+        self.http.setdefault(key, []).append({
+            "key": key,
+            "method": request.method,
+            "url": _redact_url(request.url),
+            "status": response.status_code,
+            "content_type": response.headers.get("content-type", ""),
+            "body": response.text,
+            "elapsed": round(elapsed, 4),
+        })
+
+    def next(self, request: httpx.Request) -> dict:
+        """The next recorded interaction for a request, cycling through repeats."""
+        key = request_key(request)
+        interactions = self.http.get(key)
+        if not interactions:
+            raise CassetteMissError(f"No recorded response for {key}", request=request)
+        cursor = self._cursors.get(key, 0)
+        self._cursors[key] = cursor + 1
+        return interactions[cursor % len(interactions)]
+
+
+@dataclass
+class FaultInjection:
+    """
+    Latency and failures applied to replayed calls.
+
+    latency: Fixed seconds per call, or None to reuse each call's recorded latency
+    latency_scale: Multiplier applied to the latency
+    failure_rate: Probability that a call fails
+    failure_mode: 'error' (HTTP 503 / model error) | 'timeout' (raises a timeout)
+    """
+
+    latency: float | None = 0.0
+    latency_scale: float = 1.0
+    failure_rate: float = 0.0
+    failure_mode: str = "error"
+    seed: int | None = 0
+
+    def __post_init__(self):
+        if self.failure_mode not in ("error", "timeout"):
+            raise ValueError("failure_mode must be 'error' or 'timeout'")
+        self._random = random.Random(self.seed)
+
+    def delay(self, recorded: float) -> float:
+        base = recorded if self.latency is None else self.latency
+        return base * self.latency_scale
+
+    def should_fail(self) -> bool:
+        return self.failure_rate > 0 and self._random.random() < self.failure_rate
+
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+    """
+    Forwards requests to the network and records every response.
+
+    Shared by every upstream client, so the connection pool is left open when
+    one of them closes it.
+    """
+
+    def __init__(self, cassette: Cassette):
+        self.cassette = cassette
+        self._inner = httpx.AsyncHTTPTransport()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        # Uncompressed bodies can be stored as text
+        request.headers["accept-encoding"] = "identity"
+        started = time.perf_counter()
+        response = await self._inner.handle_async_request(request)
+        content = await response.aread()
+        elapsed = time.perf_counter() - started
+
+        recorded = httpx.Response(
+            response.status_code, headers=response.headers, content=content, request=request
+        )
+        self.cassette.add(request, recorded, elapsed)
+        return recorded
+
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    """Serves recorded responses without touching the network."""
+
+    def __init__(self, cassette: Cassette, faults: FaultInjection | None = None):
+        self.cassette = cassette
+        self.faults = faults or FaultInjection()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        interaction = self.cassette.next(request)
+        delay = self.faults.delay(interaction["elapsed"])
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        if self.faults.should_fail():
+            if self.faults.failure_mode == "timeout":
+                raise httpx.ReadTimeout("Injected timeout", request=request)
+            return httpx.Response(503, text="Injected failure", request=request)
+
+        return httpx.Response(
+            interaction["status"],
+            headers={"content-type": interaction["content_type"]},
+            content=interaction["body"].encode(),
+            request=request,
+        )
+
+
+def request_key(request: httpx.Request) -> str:
+    """Match key for a request: method, URL and body hash, without credentials."""
+    key = f"{request.method} {_redact_url(request.url)}"
+    body = request.content
+    if body:
+        try:
+            data = loads(body)
+        except ValueError:
+            digest_source = body
+        else:
+            if isinstance(data, dict):
+                data = {k: v for k, v in data.items() if k not in SECRET_FIELDS}
+            digest_source = json.dumps(data, sort_keys=True).encode()
+        key += f" {hashlib.sha256(digest_source).hexdigest()[:16]}"
+    return key
+
+
+def _redact_url(url: httpx.URL) -> str:
+    parts = urlsplit(str(url))
+    query = sorted((k, v) for k, v in parse_qsl(parts.query) if k.lower() not in SECRET_FIELDS)
+    return urlunsplit(parts._replace(query=urlencode(query)))
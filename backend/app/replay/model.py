@@ -0,0 +1,81 @@
+"""
+Model stand-ins for recording and replaying agent runs.
+
+Recording wraps an agent's real model and stores every response it returns
+(tool calls and final output alike) in the cassette, grouped per run. Replay
+is a pydantic-ai FunctionModel that answers the n-th request of a run with the
+n-th recorded response, so tools still execute and the agent sees the same
+conversation it had when recording.
+"""
+
+import asyncio
+import time
+
+from pydantic_ai.exceptions import ModelHTTPError
+from pydantic_ai.messages import ModelMessage, ModelMessagesTypeAdapter, ModelResponse
+from pydantic_ai.models.function import AgentInfo, FunctionModel
+from pydantic_ai.models.wrapper import WrapperModel
+
+from app.replay.cassette import Cassette, FaultInjection
+
+
+class RecordingModel(WrapperModel):
+    """Delegates to the real model and records its responses under an agent name."""
+
+    def __init__(self, wrapped, cassette: Cassette, agent: str):
+        super().__init__(wrapped)
+        self.cassette = cassette
+        self.agent = agent
+
+    async def request(self, messages: list[ModelMessage], *args, **kwargs) -> ModelResponse:
+        started = time.perf_counter()
+        response = await super().request(messages, *args, **kwargs)
+        runs = self.cassette.models.setdefault(self.agent, [])
+        if _turn(messages) == 0:
+            runs.append([])  # First request of a new run
+        runs[-1].append({
+            "elapsed": round(time.perf_counter() - started, 4),
+            "response": ModelMessagesTypeAdapter.dump_python([response], mode="json")[0],
+        })
+        return response
+
+
+def replay_model(cassette: Cassette, agent: str, faults: FaultInjection | None = None):
+    """
+    FunctionModel replaying an agent's recorded runs.
+
+    Successive runs replay the recorded runs in order, cycling when there are
+    more runs than recordings.
+    """
+    runs = cassette.models.get(agent)
+    if not runs:
+        raise ValueError(f"Cassette has no model responses recorded for '{agent}'")
+    faults = faults or FaultInjection()
+    run_index = -1
+
+    async def respond(messages: list[ModelMessage], info: AgentInfo) -> ModelResponse:
+        nonlocal run_index
+        turn = _turn(messages)
+        if turn == 0:
+            run_index += 1
+        responses = runs[run_index % len(runs)]
+        if turn >= len(responses):
+            raise ValueError(f"Run {run_index} of '{agent}' has no recorded response {turn}")
+
+        recorded = responses[turn]
+        delay = faults.delay(recorded["elapsed"])
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if faults.should_fail():
+            if faults.failure_mode == "timeout":
+                raise TimeoutError("Injected model timeout")
+            raise ModelHTTPError(503, f"replay:{agent}", "Injected failure")
+
+        return ModelMessagesTypeAdapter.validate_python([recorded["response"]])[0]
+
+    return FunctionModel(respond, model_name=f"replay:{agent}")
+
+
+def _turn(messages: list[ModelMessage]) -> int:
+    """How many model responses this run already has."""
+    return sum(isinstance(m, ModelResponse) for m in messages)
@@ -0,0 +1,68 @@
+"""
+Admin-only operational endpoints.
+
+Every route requires the ADMIN_TOKEN bearer token and is disabled (404) when
+no token is configured.
+"""
+
+import asyncio
+import secrets
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, Header, HTTPException
+from starlette.responses import PlainTextResponse
+
+from app.core.config import settings
+from app.core.profiler import StackSampler
+
+
+def require_admin(authorization: str = Header("")):
+    if not settings.ADMIN_TOKEN:
+        raise HTTPException(404, "Not found")
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() != "bearer" or not secrets.compare_digest(token, settings.ADMIN_TOKEN):
+        raise HTTPException(401, "Admin token required")
+
+
+router = APIRouter(dependencies=[Depends(require_admin)])
+
+# One profile at a time; concurrent samplers would only skew each other
+_profile_lock = asyncio.Lock()
+
+
+@router.post("/admin/profile")
+async def profile(
+    seconds: float = 10.0,
+    interval_ms: float = 10.0,
+    format: str = "speedscope",
+    tasks: bool = True,
+):
+    """
+    Sample every thread's stack (and every pending asyncio task's await chain)
+    for a number of seconds and return the aggregated profile.
+
+    Args:
+        seconds: Sampling duration, up to PROFILER_MAX_SECONDS
+        interval_ms: Sampling interval (1-1000 ms)
+        format: 'speedscope' (JSON for speedscope.app) | 'collapsed' (flamegraph.pl)
+        tasks: Include asyncio task await chains
+    """
+    if format not in ("speedscope", "collapsed"):
+        raise HTTPException(400, "Invalid format, expected one of: speedscope, collapsed")
+    if not 0 < seconds <= settings.PROFILER_MAX_SECONDS:
+        raise HTTPException(400, f"seconds must be in (0, {settings.PROFILER_MAX_SECONDS:g}]")
+    if _profile_lock.locked():
+        raise HTTPException(409, "A profile is already running")
+
+    async with _profile_lock:
+        sampler = StackSampler(
+            interval=min(max(interval_ms, 1.0), 1000.0) / 1000,
+            loop=asyncio.get_running_loop() if tasks else None,
+        )
+        # The sampler thread observes the event loop, which keeps serving meanwhile
+        await asyncio.to_thread(sampler.run, seconds)
+
+    name = f"{settings.PROJECT_NAME} {datetime.utcnow().isoformat(timespec='seconds')}"
+    if format == "collapsed":
+        return PlainTextResponse(sampler.collapsed())
+    return sampler.speedscope(name)
@@ -7,7 +7,6 @@ import logging
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 
-from app.agent.arabifier_agent import arabify_text, arabify_tweet
 from app.agent.tools.twitter import extract_tweet_id, fetch_tweet
 
 logger = logging.getLogger(__name__)
@@ -48,6 +47,9 @@ async def arabify_tweet_endpoint(request: ArabifyTweetRequest):
     if not tweet_id:
         raise HTTPException(400, "Invalid Twitter/X URL format")
 
+    # Import here to defer pydantic-ai until the first arabify request
+    from app.agent.arabifier_agent import arabify_tweet
+
     try:
         result = await arabify_tweet(request.url)
         return ArabifyResponse(
@@ -72,6 +74,9 @@ async def arabify_text_endpoint(request: ArabifyTextRequest):
     if not request.text.strip():
         raise HTTPException(400, "Text cannot be empty")
 
+    # Import here to defer pydantic-ai until the first arabify request
+    from app.agent.arabifier_agent import arabify_text
+
     try:
         result = await arabify_text(request.text)
         return ArabifyResponse(
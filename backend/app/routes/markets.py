@@ -0,0 +1,34 @@
+"""
+REST API routes for market price history.
+"""
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.analytics.history import RANGES, get_ohlc
+from app.core.database import get_db
+
+router = APIRouter()
+
+
+@router.get("/markets/{symbol}/history")
+async def get_symbol_history(
+    symbol: str,
+    range: str = "day",
+    points: int = 300,
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Get downsampled OHLC buckets for a symbol.
+
+    Args:
+        range: 'day' | 'week' | 'month' | 'year'
+        points: Target number of buckets (10-1000)
+    """
+    if range not in RANGES:
+        raise HTTPException(400, f"Invalid range, expected one of: {', '.join(RANGES)}")
+
+    points = min(max(points, 10), 1000)
+    history = await get_ohlc(db, symbol.upper(), RANGES[range], points)
+
+    return {"range": range, **history}
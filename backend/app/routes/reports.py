@@ -2,13 +2,15 @@
 REST API routes for monitoring reports.
 """
 
-import asyncio
-
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import undefer
 
+from app.core.config import settings
 from app.core.database import get_db
+from app.core.metrics import cache_lookup
+from app.core.payloads import payload_response, render_report
 from app.models.reports import MonitorReport, ReportSection
 
 router = APIRouter()
@@ -41,46 +43,48 @@ async def list_reports(
     ]
 
 
+# Report statuses while the pipeline is still publishing sections
+IN_PROGRESS_STATUSES = ("fetching", "synthesizing")
+
+
 @router.get("/reports/latest")
-async def get_latest_report(db: AsyncSession = Depends(get_db)):
-    """Get the most recent completed report with all sections."""
+async def get_latest_report(
+    request: Request,
+    include_in_progress: bool = False,
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Get the most recent completed report with all sections.
+
+    With include_in_progress, a newer report that is still being built is
+    returned instead, with whichever raw sections have landed so far.
+    """
+    statuses = ("completed", *IN_PROGRESS_STATUSES) if include_in_progress else ("completed",)
     result = await db.execute(
-        select(MonitorReport)
-        .where(MonitorReport.status == "completed")
+        select(
+            MonitorReport.id,
+            MonitorReport.rendered_payload,
+            MonitorReport.rendered_encoding,
+        )
+        .where(MonitorReport.status.in_(statuses))
         .order_by(MonitorReport.created_at.desc())
         .limit(1)
     )
-    report = result.scalar_one_or_none()
+    row = result.one_or_none()
 
-    if not report:
+    if not row:
         raise HTTPException(404, "No completed reports found")
 
-    # Fetch sections
-    sections_result = await db.execute(
-        select(ReportSection).where(ReportSection.report_id == report.id)
-    )
-    sections = sections_result.scalars().all()
+    cache_lookup("report_payload", row.rendered_payload is not None)
+    if row.rendered_payload is not None:
+        return payload_response(request, row.rendered_payload, row.rendered_encoding)
 
-    return {
-        "id": str(report.id),
-        "created_at": report.created_at.isoformat(),
-        "updated_at": report.updated_at.isoformat(),
-        "summary": report.summary,
-        "full_report": report.full_report,
-        "sections": {
-            s.topic: {
-                "title": s.title,
-                "summary": s.summary,
-                "items": s.items,
-                "sources_count": s.sources_count,
-            }
-            for s in sections
-        },
-    }
+    # In-progress reports, and reports completed before payloads were pre-rendered
+    return await _render_report_by_id(db, row.id)
 
 
 @router.get("/reports/{report_id}")
-async def get_report(report_id: str, db: AsyncSession = Depends(get_db)):
+async def get_report(report_id: str, request: Request, db: AsyncSession = Depends(get_db)):
     """Get a specific report by ID."""
     from uuid import UUID
 
@@ -90,45 +94,183 @@ async def get_report(report_id: str, db: AsyncSession = Depends(get_db)):
         raise HTTPException(400, "Invalid report ID format")
 
     result = await db.execute(
-        select(MonitorReport).where(MonitorReport.id == report_uuid)
+        select(MonitorReport.rendered_payload, MonitorReport.rendered_encoding).where(
+            MonitorReport.id == report_uuid
+        )
+    )
+    row = result.one_or_none()
+
+    if not row:
+        raise HTTPException(404, "Report not found")
+
+    cache_lookup("report_payload", row.rendered_payload is not None)
+    if row.rendered_payload is not None:
+        return payload_response(request, row.rendered_payload, row.rendered_encoding)
+
+    # Pending, running and failed reports are rendered on demand
+    return await _render_report_by_id(db, report_uuid)
+
+
+@router.get("/reports/{report_id}/timings")
+async def get_report_timings(report_id: str, db: AsyncSession = Depends(get_db)):
+    """
+    Get the timing breakdown of a report's run.
+
+    Spans cover each fetch, the model call (with token usage), database writes
+    and broadcasts; a resumed report includes the spans of earlier attempts.
+    """
+    from uuid import UUID
+
+    try:
+        report_uuid = UUID(report_id)
+    except ValueError:
+        raise HTTPException(400, "Invalid report ID format")
+
+    result = await db.execute(
+        select(MonitorReport.status, MonitorReport.timings).where(
+            MonitorReport.id == report_uuid
+        )
+    )
+    row = result.one_or_none()
+
+    if not row:
+        raise HTTPException(404, "Report not found")
+    if row.timings is None:
+        raise HTTPException(404, "No timings recorded for this report")
+
+    return {"report_id": report_id, "status": row.status, **row.timings}
+
+
+async def _render_report_by_id(db: AsyncSession, report_id) -> dict:
+    """Load a report with its sections and render it from the ORM objects."""
+    result = await db.execute(
+        select(MonitorReport)
+        .options(undefer(MonitorReport.full_report_data))
+        .where(MonitorReport.id == report_id)
     )
     report = result.scalar_one_or_none()
 
     if not report:
         raise HTTPException(404, "Report not found")
 
-    # Fetch sections
     sections_result = await db.execute(
-        select(ReportSection).where(ReportSection.report_id == report.id)
+        select(ReportSection).where(
+            ReportSection.report_id == report.id,
+            ReportSection.created_at == report.created_at,
+        )
     )
     sections = sections_result.scalars().all()
 
-    return {
-        "id": str(report.id),
-        "created_at": report.created_at.isoformat(),
-        "updated_at": report.updated_at.isoformat(),
-        "status": report.status,
-        "summary": report.summary,
-        "full_report": report.full_report,
-        "error_message": report.error_message,
-        "sections": {
-            s.topic: {
-                "title": s.title,
-                "summary": s.summary,
-                "items": s.items,
-                "sources_count": s.sources_count,
-            }
-            for s in sections
-        },
-    }
+    return render_report(report, sections)
 
 
 @router.post("/reports/trigger")
 async def trigger_report():
-    """Manually trigger a new monitoring report."""
-    from app.scheduler.tasks import run_monitoring_task
+    """
+    Manually trigger a new monitoring report.
+
+    Triggers are coalesced: while a run is in flight (inline) or queued (queue
+    backend) this returns that job instead of starting another.
+    """
+    if settings.JOB_BACKEND == "queue":
+        # Import here to avoid circular imports
+        from app.worker.queue import enqueue_job
+
+        job = (await enqueue_job("manual")).to_dict()
+    else:
+        # Import here to avoid circular imports
+        from app.scheduler.tasks import job_tracker
+
+        job = job_tracker.submit("manual").to_dict()
+
+    messages = {
+        "running": "Monitoring task running",
+        "queued": "Monitoring task queued",
+    }
+
+    return {
+        **job,
+        "coalesced": job["triggers"] > 1,
+        "message": messages.get(job["status"], f"Monitoring task {job['status']}"),
+    }
+
+
+@router.post("/reports/{report_id}/retry")
+async def retry_report(report_id: str, db: AsyncSession = Depends(get_db)):
+    """
+    Retry a failed report from its checkpoints.
+
+    Stages that already completed (fetches, synthesis) are not run again.
+    """
+    from uuid import UUID
+
+    try:
+        report_uuid = UUID(report_id)
+    except ValueError:
+        raise HTTPException(400, "Invalid report ID format")
+
+    status = await db.scalar(select(MonitorReport.status).where(MonitorReport.id == report_uuid))
+    if status is None:
+        raise HTTPException(404, "Report not found")
+    if status != "failed":
+        raise HTTPException(409, f"Only failed reports can be retried (report is {status})")
+
+    if settings.JOB_BACKEND == "queue":
+        # Import here to avoid circular imports
+        from app.worker.queue import enqueue_job
+
+        job = await enqueue_job("manual", report_uuid, dedupe_key=f"retry:{report_uuid}")
+    else:
+        # Import here to avoid circular imports
+        from app.scheduler.tasks import job_tracker
+
+        job = job_tracker.submit("manual", str(report_uuid))
+
+    return job.to_dict()
+
+
+@router.get("/reports/jobs/{job_id}")
+async def get_job(job_id: str):
+    """Get the status of a monitoring job."""
+    if settings.JOB_BACKEND == "queue":
+        # Import here to avoid circular imports
+        from app.worker.queue import get_job as get_queued_job
+
+        job = await get_queued_job(_parse_job_id(job_id))
+    else:
+        # Import here to avoid circular imports
+        from app.scheduler.tasks import job_tracker
+
+        job = job_tracker.get(job_id)
+
+    if not job:
+        raise HTTPException(404, "Job not found")
+    return job.to_dict()
 
-    # Run the monitoring task in the background
-    asyncio.create_task(run_monitoring_task())
 
-    return {"status": "triggered", "message": "Monitoring task started"}
+@router.post("/reports/jobs/{job_id}/cancel")
+async def cancel_job(job_id: str):
+    """Cancel a queued or running monitoring job."""
+    if settings.JOB_BACKEND == "queue":
+        # Import here to avoid circular imports
+        from app.worker.queue import cancel_job as cancel_queued_job
+
+        job = await cancel_queued_job(_parse_job_id(job_id))
+    else:
+        # Import here to avoid circular imports
+        from app.scheduler.tasks import job_tracker
+
+        job = job_tracker.cancel(job_id)
+
+    if not job:
+        raise HTTPException(404, "Job not found")
+    return job.to_dict()
+
+
+def _parse_job_id(job_id: str):
+    from uuid import UUID
+
+    try:
+        return UUID(job_id)
+    except ValueError:
+        raise HTTPException(400, "Invalid job ID format")
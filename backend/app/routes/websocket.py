@@ -4,7 +4,9 @@ WebSocket route for live report updates.
 
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 
-from app.scheduler.tasks import connected_clients
+from app.core.jsoncodec import loads
+from app.realtime.hub import hub
+from app.realtime.reports import report_stream
 
 router = APIRouter()
 
@@ -15,18 +17,35 @@ async def reports_websocket(websocket: WebSocket):
     WebSocket endpoint for live report updates.
 
     Clients connect here to receive notifications when new reports are available.
+    Sending {"type": "subscribe", "topics": ["news", "markets", "social", "quotes"]}
+    switches the client to per-topic snapshots and deltas instead; sending
+    {"type": "unsubscribe"} switches it back.
+    Outbound messages go through the client's bounded queue in the connection hub.
     """
-    await websocket.accept()
-    connected_clients.add(websocket)
+    client = await hub.connect(websocket)
 
     try:
         while True:
-            # Keep connection alive, handle pings
             data = await websocket.receive_text()
-            # Could handle commands like "ping" or subscriptions
+            client.touch()
             if data == "ping":
-                await websocket.send_text("pong")
-    except WebSocketDisconnect:
-        connected_clients.discard(websocket)
-    except Exception:
-        connected_clients.discard(websocket)
+                client.enqueue("pong")
+                continue
+            if data == "pong":
+                continue
+
+            try:
+                command = loads(data)
+            except ValueError:
+                continue
+            if not isinstance(command, dict):
+                continue
+
+            if command.get("type") == "subscribe":
+                await report_stream.subscribe(client, command.get("topics") or [])
+            elif command.get("type") == "unsubscribe":
+                report_stream.unsubscribe(client)
+    except (WebSocketDisconnect, Exception):
+        pass
+    finally:
+        hub.disconnect(client)
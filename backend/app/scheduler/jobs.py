@@ -0,0 +1,182 @@
+"""
+Single-flight tracking for monitoring runs.
+
+At most one monitoring run executes per process. A trigger that arrives while
+a run is in flight joins it if the run started recently enough to still be
+fresh (TRIGGER_COALESCE_SECONDS), otherwise it queues one follow-up run that all
+later triggers share. Retries of a failed report queue behind it too, one job
+per report. Every run gets a job id whose status can be polled and
+which can be cancelled, and every task is tracked so shutdown can cancel and
+await them instead of abandoning them mid-write.
+"""
+
+import asyncio
+import logging
+import uuid
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Coroutine
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+Runner = Callable[[str, str | None], Awaitable[str | None]]
+
+
+@dataclass
+class Job:
+    """One monitoring run and the triggers that share it."""
+
+    source: str  # 'manual' | 'scheduled'
+    report_id: str | None = None  # Set up front when resuming a failed report
+    id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    status: str = "queued"  # queued | running | completed | failed | cancelled
+    triggers: int = 1
+    error: str | None = None
+    created_at: datetime = field(default_factory=datetime.utcnow)
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+    task: asyncio.Task | None = field(default=None, repr=False)
+    done: asyncio.Event = field(default_factory=asyncio.Event, repr=False)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("completed", "failed", "cancelled")
+
+    def to_dict(self) -> dict:
+        return {
+            "job_id": self.id,
+            "source": self.source,
+            "status": self.status,
+            "triggers": self.triggers,
+            "report_id": self.report_id,
+            "error": self.error,
+            "created_at": self.created_at.isoformat(),
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+        }
+
+
+class JobTracker:
+    """Coalesces monitoring triggers and tracks background tasks."""
+
+    def __init__(self, runner: Runner, coalesce_seconds: float, history: int = 100):
+        self.runner = runner
+        self.coalesce_seconds = coalesce_seconds
+        self.history = history
+        self.jobs: OrderedDict[str, Job] = OrderedDict()
+        self.current: Job | None = None
+        self.pending: list[Job] = []
+        self._tasks: set[asyncio.Task] = set()
+        self._stopping = False
+
+    def submit(self, source: str, report_id: str | None = None) -> Job:
+        """
+        Request a monitoring run, or the resumption of a failed report.
+
+        Returns:
+            The job serving this trigger: the in-flight run, a queued run, or
+            a newly started one
+        """
+        current = self.current
+        if report_id is not None:
+            shared = [j for j in (current, *self.pending) if j and j.report_id == report_id]
+        else:
+            shared = [j for j in self.pending if j.report_id is None]
+            if current is not None and current.report_id is None:
+                age = (datetime.utcnow() - current.started_at).total_seconds()
+                if age <= self.coalesce_seconds:
+                    shared.insert(0, current)
+
+        if shared:
+            shared[0].triggers += 1
+            return shared[0]
+
+        job = Job(source=source, report_id=report_id)
+        self._remember(job)
+        if self._stopping:
+            job.status = "cancelled"
+            job.done.set()
+        elif current is None:
+            self._start(job)
+        else:
+            self.pending.append(job)
+        return job
+
+    def get(self, job_id: str) -> Job | None:
+        return self.jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> Job | None:
+        """Cancel a queued or running job. Returns None if the job is unknown."""
+        job = self.jobs.get(job_id)
+        if job is None or job.finished:
+            return job
+
+        if job in self.pending:
+            self.pending.remove(job)
+            self._finish(job, "cancelled")
+        elif job.task is not None:
+            job.task.cancel()
+        return job
+
+    def spawn(self, coro: Coroutine[Any, Any, Any]) -> asyncio.Task:
+        """Run a coroutine in the background, keeping a reference until it finishes."""
+        task = asyncio.get_running_loop().create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def shutdown(self, timeout: float) -> None:
+        """Cancel queued and running work and wait for it to unwind."""
+        self._stopping = True
+        while self.pending:
+            self._finish(self.pending.pop(0), "cancelled")
+
+        tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            _, pending = await asyncio.wait(tasks, timeout=timeout)
+            if pending:
+                logger.warning(f"{len(pending)} background task(s) did not stop in time")
+
+    def _start(self, job: Job) -> None:
+        self.current = job
+        job.status = "running"
+        job.started_at = datetime.utcnow()
+        job.task = self.spawn(self._run(job))
+        # A done callback also fires for tasks cancelled before they ever ran
+        job.task.add_done_callback(lambda task: self._on_done(job, task))
+
+    async def _run(self, job: Job) -> None:
+        job.report_id = await self.runner(job.source, job.report_id)
+
+    def _on_done(self, job: Job, task: asyncio.Task) -> None:
+        if task.cancelled():
+            self._finish(job, "cancelled")
+        elif task.exception() is not None:
+            job.error = str(task.exception())
+            # Failed runs name their report so it can be retried from checkpoints
+            job.report_id = getattr(task.exception(), "report_id", job.report_id)
+            self._finish(job, "failed")
+        else:
+            self._finish(job, "completed")
+
+        self.current = None
+        if self.pending and not self._stopping:
+            self._start(self.pending.pop(0))
+
+    def _finish(self, job: Job, status: str) -> None:
+        job.status = status
+        job.finished_at = datetime.utcnow()
+        job.done.set()
+        logger.info(f"Monitoring job {job.id} {status} ({job.triggers} trigger(s))")
+
+    def _remember(self, job: Job) -> None:
+        self.jobs[job.id] = job
+        while len(self.jobs) > self.history:
+            oldest = next(iter(self.jobs.values()))
+            if not oldest.finished:
+                break
+            self.jobs.popitem(last=False)
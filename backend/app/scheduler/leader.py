@@ -0,0 +1,115 @@
+"""
+Cluster-wide leader election using a Postgres session advisory lock.
+
+Every API worker/replica runs an elector. The one that obtains
+pg_try_advisory_lock(SCHEDULER_LEADER_LOCK_ID) on its dedicated connection
+becomes leader and runs the scheduled jobs; the others keep retrying. The lock
+belongs to the database session, so if the leader process dies or loses its
+connection Postgres releases it and the next follower to poll takes over.
+"""
+
+import asyncio
+import logging
+from collections.abc import Callable
+
+import asyncpg
+
+logger = logging.getLogger(__name__)
+
+
+class LeaderElector:
+    """Polls for a Postgres advisory lock and reports leadership changes."""
+
+    def __init__(
+        self,
+        dsn: str,
+        lock_id: int,
+        interval: float,
+        on_elected: Callable[[], None],
+        on_demoted: Callable[[], None],
+    ):
+        self.dsn = dsn
+        self.lock_id = lock_id
+        self.interval = interval
+        self.on_elected = on_elected
+        self.on_demoted = on_demoted
+        self.is_leader = False
+        self._elected = asyncio.Event()
+        self._conn: asyncpg.Connection | None = None
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        """Start campaigning in the background on the running event loop."""
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def wait_until_leader(self, timeout: float) -> bool:
+        """Wait up to `timeout` seconds for this process to be elected."""
+        try:
+            await asyncio.wait_for(self._elected.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+    async def stop(self) -> None:
+        """Stop campaigning and release leadership if held."""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        if self._conn and not self._conn.is_closed():
+            try:
+                if self.is_leader:
+                    await self._conn.execute("SELECT pg_advisory_unlock($1)", self.lock_id)
+            finally:
+                await self._conn.close()
+        self._set_leader(False)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self._check()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Leader election check failed: {e}")
+                self._set_leader(False)
+                await self._reset_connection()
+            await asyncio.sleep(self.interval)
+
+    async def _check(self) -> None:
+        if self._conn is None or self._conn.is_closed():
+            self._set_leader(False)
+            self._conn = await asyncpg.connect(self.dsn)
+
+        if self.is_leader:
+            # The lock lives as long as the session; just confirm it's still up
+            await self._conn.fetchval("SELECT 1")
+        else:
+            acquired = await self._conn.fetchval("SELECT pg_try_advisory_lock($1)", self.lock_id)
+            self._set_leader(bool(acquired))
+
+    async def _reset_connection(self) -> None:
+        if self._conn is not None:
+            try:
+                await self._conn.close(timeout=5)
+            except Exception:
+                self._conn.terminate()
+            self._conn = None
+
+    def _set_leader(self, is_leader: bool) -> None:
+        if is_leader == self.is_leader:
+            return
+        self.is_leader = is_leader
+        if is_leader:
+            self._elected.set()
+            logger.info("Elected scheduler leader")
+            self.on_elected()
+        else:
+            self._elected.clear()
+            logger.info("Lost scheduler leadership")
+            self.on_demoted()
@@ -0,0 +1,198 @@
+"""
+Daily maintenance for report storage.
+
+Keeps monthly partitions provisioned ahead of time, compacts reports older than
+REPORT_ROLLUP_AFTER_DAYS into a single digest report per day, and drops whole
+partitions once they fall outside REPORT_RETENTION_MONTHS. Raw quote samples older
+than QUOTE_SAMPLE_RETENTION_DAYS are pruned; their hourly bars are kept.
+"""
+
+import logging
+import uuid
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.orm import undefer
+
+from app.core import partitions
+from app.core.config import settings
+from app.core.database import async_session_maker, engine
+from app.core.payloads import encode_payload, render_report
+from app.models.markets import QuoteSample
+from app.models.reports import MonitorItem, MonitorReport, ReportSection
+
+logger = logging.getLogger(__name__)
+
+TOPICS = ("news", "markets", "social")
+
+
+async def run_maintenance_task():
+    """Provision partitions, roll up old reports and apply the retention policies."""
+    logger.info("Starting report maintenance...")
+
+    async with engine.begin() as conn:
+        await partitions.ensure_partitions(conn, settings.PARTITION_MONTHS_AHEAD)
+
+    if settings.REPORT_ROLLUP_AFTER_DAYS > 0:
+        digests = await rollup_old_reports(settings.REPORT_ROLLUP_AFTER_DAYS)
+        logger.info(f"Rolled up {digests} day(s) of reports into digests")
+
+    if settings.REPORT_RETENTION_MONTHS > 0:
+        async with engine.begin() as conn:
+            dropped = await partitions.drop_expired_partitions(
+                conn, settings.REPORT_RETENTION_MONTHS
+            )
+        if dropped:
+            logger.info(f"Dropped expired partitions: {', '.join(dropped)}")
+
+    if settings.QUOTE_SAMPLE_RETENTION_DAYS > 0:
+        cutoff = datetime.utcnow() - timedelta(days=settings.QUOTE_SAMPLE_RETENTION_DAYS)
+        async with async_session_maker() as db:
+            result = await db.execute(delete(QuoteSample).where(QuoteSample.ts < cutoff))
+            await db.commit()
+        logger.info(f"Pruned {result.rowcount} raw quote sample(s)")
+
+
+async def rollup_old_reports(older_than_days: int) -> int:
+    """
+    Compact every day older than `older_than_days` into one digest report.
+
+    Returns:
+        Number of days rolled up
+    """
+    cutoff_date = datetime.utcnow().date() - timedelta(days=older_than_days)
+    cutoff = datetime.combine(cutoff_date, time.min)
+    day = func.date_trunc("day", MonitorReport.created_at)
+
+    async with async_session_maker() as db:
+        result = await db.execute(
+            select(day)
+            .where(
+                MonitorReport.created_at < cutoff,
+                MonitorReport.report_type != "digest",
+            )
+            .group_by(day)
+            .order_by(day)
+        )
+        days = result.scalars().all()
+
+    for day_start in days:
+        await _rollup_day(day_start)
+
+    return len(days)
+
+
+async def _rollup_day(day_start: datetime):
+    """Replace one day's reports with a single digest report, in one transaction."""
+    day_end = day_start + timedelta(days=1)
+
+    async with async_session_maker() as db:
+        result = await db.execute(
+            select(MonitorReport)
+            .options(undefer(MonitorReport.full_report_data))
+            .where(
+                MonitorReport.created_at >= day_start,
+                MonitorReport.created_at < day_end,
+                MonitorReport.report_type != "digest",
+            )
+            .order_by(MonitorReport.created_at)
+        )
+        reports = result.scalars().all()
+        report_ids = [r.id for r in reports]
+        completed = [r for r in reports if r.status == "completed"]
+
+        if completed:
+            sections_result = await db.execute(
+                select(ReportSection).where(
+                    ReportSection.report_id.in_(report_ids),
+                    ReportSection.created_at >= day_start,
+                    ReportSection.created_at < day_end,
+                )
+            )
+            sections_by_topic = defaultdict(list)
+            for section in sections_result.scalars().all():
+                sections_by_topic[section.topic].append(section)
+
+            _add_digest(db, day_start, completed, sections_by_topic)
+
+        # Children first; there are no database-level cascades on partitioned tables
+        section_ids = select(ReportSection.id).where(
+            ReportSection.report_id.in_(report_ids),
+            ReportSection.created_at >= day_start,
+            ReportSection.created_at < day_end,
+        )
+        for statement in (
+            delete(MonitorItem).where(
+                MonitorItem.section_id.in_(section_ids),
+                MonitorItem.created_at >= day_start,
+                MonitorItem.created_at < day_end,
+            ),
+            delete(ReportSection).where(ReportSection.id.in_(section_ids)),
+            delete(MonitorReport).where(
+                MonitorReport.id.in_(report_ids),
+                MonitorReport.created_at >= day_start,
+                MonitorReport.created_at < day_end,
+            ),
+        ):
+            await db.execute(statement.execution_options(synchronize_session=False))
+
+        await db.commit()
+        logger.info(f"Rolled up {len(reports)} report(s) for {day_start.date()}")
+
+
+def _add_digest(db, day_start: datetime, reports: list, sections_by_topic: dict):
+    """Build the digest report and its sections for one day and add them to the session."""
+    latest = reports[-1]
+    latest_full = latest.full_report or {}
+
+    digest = MonitorReport(
+        id=uuid.uuid4(),
+        created_at=day_start,
+        updated_at=datetime.utcnow(),
+        report_type="digest",
+        status="completed",
+        summary=f"Daily digest of {len(reports)} reports. Latest: {latest.summary or ''}".strip(),
+    )
+    digest.full_report = {
+        "executive_summary": digest.summary,
+        "digest_date": day_start.date().isoformat(),
+        "report_count": len(reports),
+        "reports": [
+            {
+                "id": str(r.id),
+                "created_at": r.created_at.isoformat(),
+                "summary": r.summary,
+                "market_sentiment": (r.full_report or {}).get("market_sentiment"),
+            }
+            for r in reports
+        ],
+        # Closing snapshot of the day's market data
+        "market_quotes": latest_full.get("market_quotes", []),
+        "market_sentiment": latest_full.get("market_sentiment", "neutral"),
+    }
+    db.add(digest)
+
+    sections = []
+    for topic in TOPICS:
+        topic_sections = sorted(sections_by_topic.get(topic, []), key=lambda s: s.created_at)
+        if not topic_sections:
+            continue
+        section = ReportSection(
+            report_id=digest.id,
+            created_at=day_start,
+            topic=topic,
+            title=f"{topic.title()} digest",
+            summary=topic_sections[-1].summary,
+            items=[
+                {"report_id": str(s.report_id), "title": s.title, "summary": s.summary}
+                for s in topic_sections
+            ],
+            sources_count=sum(s.sources_count or 0 for s in topic_sections),
+        )
+        db.add(section)
+        sections.append(section)
+
+    digest.rendered_payload, digest.rendered_encoding = encode_payload(
+        render_report(digest, sections)
+    )
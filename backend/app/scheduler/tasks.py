@@ -1,119 +1,453 @@
 """
 APScheduler background tasks for the monitoring system.
 
-Runs the monitor agent on a configurable interval.
+Runs the monitor agent on a configurable interval. Scheduled and manual runs
+both go through the single-flight job tracker.
 """
 
+import asyncio
 import logging
+import time
+import uuid
 from datetime import datetime
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from apscheduler.triggers.cron import CronTrigger
 from apscheduler.triggers.interval import IntervalTrigger
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import undefer
 
 from app.core.config import settings
 from app.core.database import async_session_maker
+from app.core.jsoncodec import dumps_str
+from app.core.metrics import source_fetch_duration, source_fetch_errors
+from app.core.payloads import encode_payload, render_report
+from app.core.telemetry import trace_job
+from app.core.timing import RunTimer, annotate
 from app.models.reports import MonitorItem, MonitorReport, ReportSection
+from app.realtime.pubsub import pubsub
+from app.realtime.reports import report_stream
+from app.scheduler.jobs import JobTracker
+from app.scheduler.leader import LeaderElector
+from app.scheduler.maintenance import run_maintenance_task
 
 logger = logging.getLogger(__name__)
 
 # Global scheduler instance
 scheduler = AsyncIOScheduler()
 
-# Connected WebSocket clients for live updates
-connected_clients: set = set()
+# Leader election across workers/replicas; the leader resumes the scheduler
+leader_elector = LeaderElector(
+    dsn=settings.DATABASE_URL,
+    lock_id=settings.SCHEDULER_LEADER_LOCK_ID,
+    interval=settings.SCHEDULER_LEADER_CHECK_SECONDS,
+    on_elected=scheduler.resume,
+    on_demoted=scheduler.pause,
+)
 
+# Pub/sub channel that carries report events between workers
+REPORT_EVENTS_CHANNEL = "report_events"
 
-async def run_monitoring_task():
-    """Execute the monitoring agent and save results to database."""
-    logger.info("Starting scheduled monitoring task...")
+
+class MonitoringRunError(Exception):
+    """A monitoring run failed; its report keeps the checkpoints of completed stages."""
+
+    def __init__(self, message: str, report_id: str):
+        super().__init__(message)
+        self.report_id = report_id
+
+
+async def run_monitoring_task(report_type: str = "scheduled", report_id: str | None = None) -> str:
+    """
+    Execute the monitoring pipeline and save results to database.
+
+    Each stage (one fetch per source, synthesis, persistence) checkpoints its
+    output on the report as it completes. Passing the id of a failed report
+    resumes it: completed stages are skipped, so a retry after a model timeout
+    costs one model call and no refetching.
+
+    The whole run is bounded by MONITOR_DEADLINE_SECONDS: fetches get
+    MONITOR_FETCH_BUDGET_SECONDS, synthesis gets what is left minus a reserve for
+    the final writes, and a source or synthesis that overruns is cut off rather
+    than holding up the report.
+
+    The report is published progressively: each source's raw section is saved
+    and announced to WebSocket clients as soon as its fetch lands, and the
+    narrative fields follow when synthesis completes. The report status moves
+    through 'fetching' and 'synthesizing' to 'completed'.
+
+    Every fetch, model call, database write and broadcast is timed; the
+    breakdown is stored on the report (see RunTimer).
+
+    Returns:
+        The report id
+
+    Raises:
+        MonitoringRunError: after the report is marked failed
+    """
+    # Import here to avoid circular imports
+    from app.agent.monitor_agent import (
+        FETCH_STAGES,
+        MonitorOutput,
+        fallback_output,
+        run_fetch_stage,
+        synthesize,
+    )
 
     async with async_session_maker() as db:
-        # Create pending report
-        report = MonitorReport(report_type="scheduled", status="running")
-        db.add(report)
-        await db.commit()
-        await db.refresh(report)
+        if report_id is None:
+            logger.info(f"Starting {report_type} monitoring task...")
+            checkpoints: dict = {}
+            report = MonitorReport(report_type=report_type, status="fetching", checkpoints={})
+            db.add(report)
+            sections: dict[str, ReportSection] = {}
+            timer, previous_timings = RunTimer(), None
+        else:
+            result = await db.execute(
+                select(MonitorReport)
+                .where(MonitorReport.id == uuid.UUID(report_id))
+                .options(undefer(MonitorReport.checkpoints), undefer(MonitorReport.timings))
+            )
+            report = result.scalar_one()
+            if report.status == "completed":
+                return report_id
+            # Only checkpoints that still carry their output can be skipped; a
+            # stage whose data was dropped (e.g. at persistence) is run again
+            checkpoints = {
+                stage: entry
+                for stage, entry in (report.checkpoints or {}).items()
+                if "data" in entry
+            }
+            previous_timings = report.timings
+            timer = RunTimer(attempt=(previous_timings or {}).get("attempts", 0) + 1)
+            logger.info(
+                f"Resuming report {report_id}, skipping stages: {', '.join(checkpoints) or 'none'}"
+            )
+            report.status = "fetching"
+            report.error_message = None
+            result = await db.execute(
+                select(ReportSection).where(
+                    ReportSection.report_id == report.id,
+                    ReportSection.created_at == report.created_at,
+                )
+            )
+            sections = {s.topic: s for s in result.scalars()}
+        with timer.span("db.start"):
+            await db.commit()
+            await db.refresh(report)
+        run_id = str(report.id)
+
+        def record(stage: str, data=None):
+            checkpoints[stage] = {"completed_at": datetime.utcnow().isoformat(), "data": data}
+            # Reassign so SQLAlchemy sees the JSONB change
+            report.checkpoints = dict(checkpoints)
+
+        async def fetch(stage: str) -> dict:
+            started = time.perf_counter()
+            try:
+                with timer.span(f"fetch.{stage}"):
+                    data = await run_fetch_stage(stage)
+                    annotate(items=len(data.get(RAW_SECTION_ITEMS[stage], [])))
+                    return data
+            except asyncio.CancelledError:
+                source_fetch_errors.inc(stage, "timeout")
+                raise
+            except Exception:
+                source_fetch_errors.inc(stage, "error")
+                raise
+            finally:
+                source_fetch_duration.observe(time.perf_counter() - started, stage)
+
+        async def commit(name: str, **attrs):
+            with timer.span(f"db.{name}", **attrs):
+                await db.commit()
+
+        async def broadcast_stage(stage: str, status: str):
+            with timer.span("broadcast.stage", stage=stage, status=status):
+                await broadcast_stage_update(run_id, stage, status, report.created_at)
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + settings.MONITOR_DEADLINE_SECONDS
+        reserve = settings.MONITOR_PERSIST_RESERVE_SECONDS
+        fetch_deadline = min(
+            loop.time() + settings.MONITOR_FETCH_BUDGET_SECONDS, deadline - reserve
+        )
 
         try:
-            # Import here to avoid circular imports
-            from app.agent.monitor_agent import run_monitor
+            # Fetch stages run concurrently; each one is saved and published as it
+            # lands. Sources that fail or miss the fetch budget are cut off and
+            # their sections marked partial, so the run still finishes on time.
+            running = {
+                asyncio.create_task(fetch(stage)): stage
+                for stage in FETCH_STAGES
+                if stage not in checkpoints
+            }
+            partial: dict[str, str] = {}
+            try:
+                while running:
+                    timeout = fetch_deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    done, _ = await asyncio.wait(
+                        running, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    for task in done:
+                        stage = running.pop(task)
+                        if task.exception() is not None:
+                            partial[stage] = f"Fetch failed: {task.exception()}"
+                            continue
+                        record(stage, task.result())
+                        _save_raw_section(db, report, sections, stage, task.result())
+                        await commit("save_section", stage=stage)
+                        await broadcast_stage(stage, "fetching")
+            finally:
+                for task in running:
+                    task.cancel()
+            for stage in running.values():
+                partial[stage] = f"Timed out after {settings.MONITOR_FETCH_BUDGET_SECONDS:g}s"
+
+            fetched = {}
+            for stage in FETCH_STAGES:
+                if stage in partial:
+                    logger.warning(f"Report {run_id}: {stage} is partial ({partial[stage]})")
+                    fetched[stage] = {"source": stage, "items": [], "error": partial[stage]}
+                    _section(db, report, sections, stage).partial = True
+                else:
+                    fetched[stage] = checkpoints[stage]["data"]
+            if partial:
+                await commit("mark_partial")
+                for stage in partial:
+                    await broadcast_stage(stage, "partial")
 
-            # Run the monitor agent
-            result = await run_monitor()
+            # Synthesis: the single model call, with whatever budget is left
+            if "synthesis" in checkpoints:
+                result = MonitorOutput.model_validate(checkpoints["synthesis"]["data"])
+            else:
+                report.status = "synthesizing"
+                await commit("set_status", status="synthesizing")
+                await broadcast_stage("synthesis", "synthesizing")
+                try:
+                    with timer.span("model.synthesis"):
+                        result = await asyncio.wait_for(
+                            synthesize(fetched), timeout=max(deadline - loop.time() - reserve, 0)
+                        )
+                    record("synthesis", result.model_dump())
+                except TimeoutError:
+                    logger.warning(f"Report {run_id}: synthesis missed the deadline")
+                    result = fallback_output(fetched, "Synthesis timed out")
+                    report.error_message = "Synthesis timed out; sections show raw source data"
+                await commit("save_synthesis")
 
-            # Update report with results
+            # Persistence
             report.status = "completed"
             report.summary = result.executive_summary
             report.full_report = result.model_dump()
             report.updated_at = datetime.utcnow()
 
-            # Create sections
+            # Replace the raw sections with the synthesized narrative
             for topic, section_data in [
                 ("news", result.news),
                 ("markets", result.markets),
                 ("social", result.social),
             ]:
-                section = ReportSection(
-                    report_id=report.id,
-                    topic=topic,
-                    title=section_data.title,
-                    summary=section_data.summary,
-                    items=[{"key_points": section_data.key_points}],
-                    sources_count=len(section_data.key_points),
+                section = _section(db, report, sections, topic)
+                section.title = section_data.title
+                section.summary = section_data.summary
+                section.items = [{"key_points": section_data.key_points}]
+                section.sources_count = len(section_data.key_points)
+
+            # Render the final API payload once; reads stream these bytes as-is
+            with timer.span("render"):
+                report.rendered_payload, report.rendered_encoding = encode_payload(
+                    render_report(report, list(sections.values()))
                 )
-                db.add(section)
 
-            await db.commit()
-            logger.info(f"Monitoring task completed: report {report.id}")
+            # The report now holds everything; keep only when each stage finished
+            record("persistence")
+            report.checkpoints = {
+                stage: {"completed_at": entry["completed_at"]}
+                for stage, entry in checkpoints.items()
+            }
 
-            # Broadcast update to connected WebSocket clients
-            await broadcast_report_update(str(report.id))
+            await commit("persist")
+            logger.info(f"Monitoring task completed: report {run_id}")
+
+        except asyncio.CancelledError:
+            logger.info(f"Monitoring task cancelled: report {run_id}")
+            await _mark_failed(db, report, "Cancelled", timer.to_dict(previous_timings))
+            raise
 
         except Exception as e:
             logger.error(f"Monitoring task failed: {e}", exc_info=True)
-            report.status = "failed"
-            report.error_message = str(e)
-            report.updated_at = datetime.utcnow()
+            await _mark_failed(db, report, str(e), timer.to_dict(previous_timings))
+            raise MonitoringRunError(str(e), run_id) from e
+
+        # The report is completed and its checkpoint data dropped, so nothing
+        # from here on may mark it failed; errors are only logged.
+        try:
+            # Broadcast update to connected WebSocket clients
+            with timer.span("broadcast.report"):
+                await broadcast_report_update(run_id)
+        except Exception as e:
+            logger.error(f"Report {run_id}: failed to broadcast completion: {e}")
+
+        try:
+            report.timings = timer.to_dict(previous_timings)
             await db.commit()
+        except Exception as e:
+            logger.error(f"Report {run_id}: failed to save timings: {e}")
+            await db.rollback()
+        logger.info(f"Report {run_id} timings ({timer.total_ms:.0f}ms): {timer.summary()}")
+        return run_id
 
 
-async def broadcast_report_update(report_id: str):
-    """Broadcast new report notification to all connected WebSocket clients."""
-    import json
+# Where each fetch stage keeps the items shown in its raw section
+RAW_SECTION_ITEMS = {"news": "items", "markets": "quotes", "social": "items"}
+
+
+def _section(
+    db: AsyncSession, report: MonitorReport, sections: dict[str, ReportSection], topic: str
+) -> ReportSection:
+    """Get the report's section for a topic, creating it if needed."""
+    if topic not in sections:
+        sections[topic] = ReportSection(
+            report_id=report.id, created_at=report.created_at, topic=topic, title=topic.title()
+        )
+        db.add(sections[topic])
+    return sections[topic]
+
+
+def _save_raw_section(
+    db: AsyncSession,
+    report: MonitorReport,
+    sections: dict[str, ReportSection],
+    stage: str,
+    data: dict,
+):
+    """Publish a source's fetched items as its section until synthesis fills in the narrative."""
+    items = data.get(RAW_SECTION_ITEMS[stage], [])
+    section = _section(db, report, sections, stage)
+    section.items = items
+    section.sources_count = len(items)
+    section.partial = False
+
+
+async def _mark_failed(db: AsyncSession, report: MonitorReport, message: str, timings: dict):
+    await db.rollback()
+    report.status = "failed"
+    report.error_message = message
+    report.timings = timings
+    report.updated_at = datetime.utcnow()
+    await db.commit()
+
+
+# Single-flight tracker for monitoring runs in this process
+job_tracker = JobTracker(
+    runner=run_monitoring_task,
+    coalesce_seconds=settings.TRIGGER_COALESCE_SECONDS,
+)
+
+
+async def run_scheduled_report():
+    """Scheduled entry point: enqueue for the workers, or share/start a run and wait."""
+    if settings.JOB_BACKEND == "queue":
+        # Import here to avoid circular imports
+        from app.worker.queue import enqueue_job
+
+        await enqueue_job("scheduled")
+        return
+
+    job = job_tracker.submit("scheduled")
+    await job.done.wait()
+
 
-    message = json.dumps({
+async def broadcast_report_update(report_id: str):
+    """Publish a new report notification to the WebSocket clients of every worker."""
+    message = dumps_str({
         "type": "report_update",
         "report_id": report_id,
         "timestamp": datetime.utcnow().isoformat(),
     })
+    await pubsub.publish(REPORT_EVENTS_CHANNEL, message)
 
-    disconnected = set()
-    for websocket in connected_clients:
-        try:
-            await websocket.send_text(message)
-        except Exception:
-            disconnected.add(websocket)
 
-    connected_clients.difference_update(disconnected)
+async def broadcast_stage_update(
+    report_id: str, stage: str, status: str, report_created_at: datetime
+):
+    """Announce that a pipeline stage of an in-progress report has landed."""
+    message = dumps_str({
+        "type": "report_stage",
+        "report_id": report_id,
+        # Lets subscribers prune section partitions when loading the stage
+        "report_created_at": report_created_at.isoformat(),
+        "stage": stage,
+        "status": status,
+        "timestamp": datetime.utcnow().isoformat(),
+    })
+    await pubsub.publish(REPORT_EVENTS_CHANNEL, message)
+
+
+async def relay_report_event(message: str):
+    """Deliver a published report event to the WebSocket clients of this worker."""
+    await report_stream.on_event(message)
 
 
 def setup_scheduler():
     """Initialize and start the scheduler."""
     scheduler.add_job(
-        run_monitoring_task,
+        trace_job(run_scheduled_report),
         trigger=IntervalTrigger(minutes=settings.MONITOR_INTERVAL_MINUTES),
         id="monitoring_task",
         replace_existing=True,
         max_instances=1,  # Prevent overlapping runs
     )
-    scheduler.start()
+    scheduler.add_job(
+        trace_job(run_maintenance_task),
+        trigger=CronTrigger(hour=settings.MAINTENANCE_HOUR_UTC, minute=0, timezone="UTC"),
+        id="maintenance_task",
+        replace_existing=True,
+        max_instances=1,
+    )
+
+    if settings.SCHEDULER_LEADER_ELECTION:
+        # Jobs only run in the process holding the cluster-wide advisory lock
+        scheduler.start(paused=True)
+        leader_elector.start()
+    else:
+        scheduler.start()
     logger.info(
         f"Scheduler started with {settings.MONITOR_INTERVAL_MINUTES} minute interval"
     )
 
 
-def shutdown_scheduler():
-    """Shutdown the scheduler gracefully."""
+async def require_inline_leader():
+    """
+    With JOB_BACKEND=inline, refuse to start unless this process is the scheduler leader.
+
+    Inline jobs live in one process's JobTracker, so a job id from one worker
+    is unknown to the others and triggers would run outside the leader. Inline
+    mode is therefore single-process; several workers or replicas need the
+    queue backend. A restarting predecessor may hold the lock while it drains,
+    so election is given the shutdown grace period plus one check interval.
+    """
+    if settings.JOB_BACKEND != "inline" or not settings.SCHEDULER_LEADER_ELECTION:
+        return
+
+    timeout = settings.SHUTDOWN_GRACE_SECONDS + settings.SCHEDULER_LEADER_CHECK_SECONDS
+    if not await leader_elector.wait_until_leader(timeout):
+        raise RuntimeError(
+            "JOB_BACKEND=inline runs monitoring jobs in a single API process, but another "
+            "process holds the scheduler lock. Use JOB_BACKEND=queue (python -m app.worker) "
+            "to run several API workers or replicas."
+        )
+
+
+async def shutdown_scheduler():
+    """Shutdown the scheduler gracefully, give up leadership and stop running jobs."""
+    if settings.SCHEDULER_LEADER_ELECTION:
+        await leader_elector.stop()
     if scheduler.running:
         scheduler.shutdown(wait=False)
         logger.info("Scheduler shutdown")
+    await job_tracker.shutdown(settings.SHUTDOWN_GRACE_SECONDS)
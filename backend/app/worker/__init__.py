@@ -0,0 +1 @@
+"""Standalone worker that executes queued monitoring jobs."""
@@ -0,0 +1,58 @@
+"""
+Run the monitoring job worker: `python -m app.worker`.
+
+Set JOB_BACKEND=queue on the API so it only enqueues, and scale workers
+independently. WORKER_CONCURRENCY controls how many jobs each worker runs.
+"""
+
+import asyncio
+import logging
+import signal
+
+# Registers every model before init_db() creates tables
+import app.models  # noqa: F401
+from app.core import startup
+from app.core.config import settings
+from app.core.database import init_db
+from app.core.telemetry import configure_telemetry
+from app.core.watchdog import watchdog
+from app.realtime.pubsub import pubsub
+from app.worker.queue import JOB_EVENTS_CHANNEL
+from app.worker.runner import create_worker
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger(__name__)
+startup.mark("imports")
+
+
+async def main():
+    configure_telemetry(service_name="egoudaxyz-worker")
+    startup.mark("telemetry")
+    if settings.LOOP_WATCHDOG:
+        watchdog.start()
+
+    await init_db()
+    startup.mark("database")
+
+    worker = create_worker()
+    pubsub.subscribe(JOB_EVENTS_CHANNEL, worker.on_job_event)
+    await pubsub.start()
+
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, worker.request_stop)
+    startup.mark("pubsub")
+    startup.ready()
+
+    try:
+        await worker.run(grace_seconds=settings.SHUTDOWN_GRACE_SECONDS)
+    finally:
+        await pubsub.stop()
+        await watchdog.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
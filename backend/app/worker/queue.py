@@ -0,0 +1,268 @@
+"""
+Durable monitoring job queue on Postgres.
+
+The API enqueues rows in monitor_jobs; workers claim them with
+FOR UPDATE SKIP LOCKED so concurrent workers never pick the same job. A claim
+is a lease (locked_until) that the worker renews while the job runs; if the
+worker dies the lease expires and another worker reclaims the job. Failed jobs
+are retried with exponential backoff up to max_attempts. Enqueues are deduped:
+while a job with the same dedupe key is still queued, new triggers join it.
+"""
+
+import logging
+import uuid
+from datetime import timedelta
+
+from sqlalchemy import and_, exists, func, or_, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import aliased
+
+from app.core.config import settings
+from app.core.database import async_session_maker
+from app.models.jobs import MonitorJob
+from app.realtime.pubsub import pubsub
+
+logger = logging.getLogger(__name__)
+
+# Pub/sub channel that wakes idle workers when a job is enqueued
+JOB_EVENTS_CHANNEL = "monitor_jobs"
+
+MONITOR_DEDUPE_KEY = "monitor"
+
+
+async def enqueue_job(
+    source: str,
+    report_id: uuid.UUID | None = None,
+    dedupe_key: str | None = MONITOR_DEDUPE_KEY,
+) -> MonitorJob:
+    """
+    Queue a monitoring run, or join the one already queued with the same key.
+
+    Args:
+        source: 'manual' | 'scheduled'
+        report_id: Failed report to resume from its checkpoints, if any
+
+    Returns:
+        The queued job
+    """
+    stmt = insert(MonitorJob).values(
+        id=uuid.uuid4(),
+        source=source,
+        report_id=report_id,
+        dedupe_key=dedupe_key,
+        max_attempts=settings.JOB_MAX_ATTEMPTS,
+    )
+    if dedupe_key is not None:
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[MonitorJob.dedupe_key],
+            index_where=MonitorJob.status == "queued",
+            set_={"triggers": MonitorJob.triggers + 1},
+        )
+
+    async with async_session_maker() as db:
+        job = (await db.execute(stmt.returning(MonitorJob))).scalar_one()
+        await db.commit()
+
+    try:
+        await pubsub.publish(JOB_EVENTS_CHANNEL, str(job.id))
+    except Exception as e:
+        # Workers still find the job on their next poll
+        logger.warning(f"Could not notify workers of job {job.id}: {e}")
+    return job
+
+
+async def get_job(job_id: uuid.UUID) -> MonitorJob | None:
+    async with async_session_maker() as db:
+        return await db.get(MonitorJob, job_id)
+
+
+async def cancel_job(job_id: uuid.UUID) -> MonitorJob | None:
+    """
+    Cancel a queued or running job.
+
+    A running job's worker notices on its next lease renewal and stops it.
+    """
+    async with async_session_maker() as db:
+        await db.execute(
+            update(MonitorJob)
+            .where(MonitorJob.id == job_id, MonitorJob.status.in_(("queued", "running")))
+            .values(status="cancelled", finished_at=func.now(), locked_until=None)
+        )
+        await db.commit()
+        return await db.get(MonitorJob, job_id, populate_existing=True)
+
+
+async def claim_job(worker_id: str, visibility_timeout: float) -> MonitorJob | None:
+    """
+    Lease the next runnable job: queued and due, or running with an expired lease.
+
+    Returns:
+        The claimed job, or None if nothing is runnable
+    """
+    now = func.now()
+    candidate = (
+        select(MonitorJob.id)
+        .where(
+            or_(
+                and_(MonitorJob.status == "queued", MonitorJob.run_after <= now),
+                and_(MonitorJob.status == "running", MonitorJob.locked_until < now),
+            )
+        )
+        .order_by(MonitorJob.run_after)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+        .scalar_subquery()
+    )
+
+    async with async_session_maker() as db:
+        job = (
+            await db.execute(
+                update(MonitorJob)
+                .where(MonitorJob.id == candidate)
+                .values(
+                    status="running",
+                    locked_by=worker_id,
+                    locked_until=now + timedelta(seconds=visibility_timeout),
+                    attempts=MonitorJob.attempts + 1,
+                    started_at=func.coalesce(MonitorJob.started_at, now),
+                )
+                .returning(MonitorJob)
+            )
+        ).scalar_one_or_none()
+
+        if job is not None and job.attempts > job.max_attempts:
+            # Reclaimed after its last attempt's worker died
+            job.status = "failed"
+            job.error = job.error or "Lease expired on final attempt"
+            job.finished_at = func.now()
+            job.locked_until = None
+            await db.commit()
+            logger.warning(f"Job {job.id} exhausted its attempts")
+            return await claim_job(worker_id, visibility_timeout)
+
+        await db.commit()
+        return job
+
+
+async def renew_lease(job_id: uuid.UUID, worker_id: str, visibility_timeout: float) -> bool:
+    """
+    Extend a running job's lease.
+
+    Returns:
+        False if the job was cancelled or claimed by another worker
+    """
+    async with async_session_maker() as db:
+        result = await db.execute(
+            update(MonitorJob)
+            .where(
+                MonitorJob.id == job_id,
+                MonitorJob.status == "running",
+                MonitorJob.locked_by == worker_id,
+            )
+            .values(locked_until=func.now() + timedelta(seconds=visibility_timeout))
+        )
+        await db.commit()
+        return result.rowcount > 0
+
+
+async def complete_job(job_id: uuid.UUID, worker_id: str, report_id: str | None) -> None:
+    async with async_session_maker() as db:
+        await db.execute(
+            update(MonitorJob)
+            .where(MonitorJob.id == job_id, MonitorJob.locked_by == worker_id)
+            .values(
+                status="completed",
+                report_id=uuid.UUID(report_id) if report_id else None,
+                error=None,
+                finished_at=func.now(),
+                locked_until=None,
+            )
+        )
+        await db.commit()
+
+
+async def fail_job(
+    job_id: uuid.UUID, worker_id: str, error: str, report_id: str | None = None
+) -> None:
+    """
+    Requeue a failed job with backoff, or mark it failed after its last attempt.
+
+    A retry resumes `report_id` (the failed run's report) from its checkpoints.
+    If a newer job with the same dedupe key is already queued, that job covers
+    the retry and this one is marked failed instead.
+    """
+    values = {"error": error, "locked_until": None}
+    if report_id is not None:
+        values["report_id"] = uuid.UUID(report_id)
+    mine = and_(
+        MonitorJob.id == job_id,
+        MonitorJob.status == "running",
+        MonitorJob.locked_by == worker_id,
+    )
+
+    async with async_session_maker() as db:
+        row = (
+            await db.execute(select(MonitorJob.attempts, MonitorJob.max_attempts).where(mine))
+        ).first()
+        if row is None:
+            return
+
+        attempts, max_attempts = row
+        if attempts < max_attempts:
+            backoff = settings.JOB_RETRY_BACKOFF_SECONDS * 2 ** (attempts - 1)
+            twin = aliased(MonitorJob)
+            requeue = (
+                update(MonitorJob)
+                .where(
+                    mine,
+                    ~exists().where(
+                        twin.dedupe_key == MonitorJob.dedupe_key, twin.status == "queued"
+                    ),
+                )
+                .values(
+                    status="queued",
+                    run_after=func.now() + timedelta(seconds=backoff),
+                    **values,
+                )
+                .execution_options(synchronize_session=False)
+            )
+            try:
+                requeued = (await db.execute(requeue)).rowcount
+                await db.commit()
+            except IntegrityError:
+                # A twin was queued after this statement's snapshot was taken
+                await db.rollback()
+                requeued = 0
+            if requeued:
+                logger.info(f"Job {job_id} failed, retrying in {backoff:.0f}s: {error}")
+                return
+
+        # Out of attempts, or a newer queued run already covers this one
+        result = await db.execute(
+            update(MonitorJob)
+            .where(mine)
+            .values(status="failed", finished_at=func.now(), **values)
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+        if result.rowcount:
+            logger.warning(f"Job {job_id} failed after {attempts} attempt(s): {error}")
+
+
+async def release_job(job_id: uuid.UUID, worker_id: str) -> None:
+    """Hand an interrupted job back to the queue without spending an attempt."""
+    async with async_session_maker() as db:
+        await db.execute(
+            update(MonitorJob)
+            .where(
+                MonitorJob.id == job_id,
+                MonitorJob.status == "running",
+                MonitorJob.locked_by == worker_id,
+            )
+            .values(
+                attempts=MonitorJob.attempts - 1,
+                locked_until=func.now(),  # Immediately reclaimable
+            )
+        )
+        await db.commit()
@@ -0,0 +1,138 @@
+"""
+Worker loop for the durable job queue.
+
+Claims up to WORKER_CONCURRENCY jobs at a time, renews each job's lease while it
+runs and records the outcome. Idle workers wake on the job pub/sub channel or
+every WORKER_POLL_SECONDS. On shutdown running jobs get a grace period to
+finish; anything still running is handed back to the queue.
+"""
+
+import asyncio
+import logging
+import os
+import socket
+import uuid
+
+from app.core.config import settings
+from app.core.telemetry import trace_job
+from app.models.jobs import MonitorJob
+from app.worker.queue import (
+    claim_job,
+    complete_job,
+    fail_job,
+    release_job,
+    renew_lease,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class Worker:
+    """Executes monitoring jobs claimed from the queue."""
+
+    def __init__(self, concurrency: int, poll_seconds: float, visibility_timeout: float):
+        self.id = f"{socket.gethostname()}:{os.getpid()}"
+        self.concurrency = concurrency
+        self.poll_seconds = poll_seconds
+        self.visibility_timeout = visibility_timeout
+        self.stopping = False
+        self._running: dict[uuid.UUID, asyncio.Task] = {}
+        self._wakeup = asyncio.Event()
+
+    async def on_job_event(self, message: str) -> None:
+        """Pub/sub callback: a job was enqueued somewhere."""
+        self._wakeup.set()
+
+    def request_stop(self) -> None:
+        self.stopping = True
+        self._wakeup.set()
+
+    async def run(self, grace_seconds: float) -> None:
+        """Claim and run jobs until asked to stop, then drain."""
+        logger.info(f"Worker {self.id} started (concurrency {self.concurrency})")
+
+        while not self.stopping:
+            while len(self._running) < self.concurrency and not self.stopping:
+                try:
+                    job = await claim_job(self.id, self.visibility_timeout)
+                except Exception as e:
+                    logger.error(f"Failed to claim job: {e}")
+                    break
+                if job is None:
+                    break
+                self._start(job)
+
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.poll_seconds)
+            except TimeoutError:
+                pass
+
+        await self._drain(grace_seconds)
+        logger.info(f"Worker {self.id} stopped")
+
+    def _start(self, job: MonitorJob) -> None:
+        logger.info(f"Running job {job.id} (attempt {job.attempts}/{job.max_attempts})")
+        task = asyncio.get_running_loop().create_task(self._execute(job))
+        self._running[job.id] = task
+
+        def finished(_: asyncio.Task) -> None:
+            self._running.pop(job.id, None)
+            self._wakeup.set()  # A slot is free
+
+        task.add_done_callback(finished)
+
+    async def _execute(self, job: MonitorJob) -> None:
+        # Import here to avoid circular imports
+        from app.scheduler.tasks import run_monitoring_task
+
+        lease = asyncio.get_running_loop().create_task(
+            self._keep_lease(job.id, asyncio.current_task())
+        )
+        try:
+            resume_id = str(job.report_id) if job.report_id else None
+            report_id = await trace_job(run_monitoring_task)(job.source, resume_id)
+            await complete_job(job.id, self.id, report_id)
+        except asyncio.CancelledError:
+            if self.stopping:
+                await release_job(job.id, self.id)
+                logger.info(f"Released job {job.id} back to the queue")
+            raise
+        except Exception as e:
+            # Retries resume the failed run's report from its checkpoints
+            await fail_job(job.id, self.id, str(e), getattr(e, "report_id", None))
+        finally:
+            lease.cancel()
+
+    async def _keep_lease(self, job_id: uuid.UUID, task: asyncio.Task) -> None:
+        """Renew the lease periodically; stop the job if it was cancelled or lost."""
+        while True:
+            await asyncio.sleep(self.visibility_timeout / 3)
+            try:
+                renewed = await renew_lease(job_id, self.id, self.visibility_timeout)
+            except Exception as e:
+                logger.warning(f"Failed to renew lease for job {job_id}: {e}")
+                continue
+            if not renewed:
+                logger.info(f"Job {job_id} was cancelled or reclaimed, stopping it")
+                task.cancel()
+                return
+
+    async def _drain(self, grace_seconds: float) -> None:
+        tasks = list(self._running.values())
+        if not tasks:
+            return
+        logger.info(f"Waiting up to {grace_seconds:.0f}s for {len(tasks)} running job(s)")
+        _, pending = await asyncio.wait(tasks, timeout=grace_seconds)
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.wait(pending)
+
+
+def create_worker() -> Worker:
+    return Worker(
+        concurrency=settings.WORKER_CONCURRENCY,
+        poll_seconds=settings.WORKER_POLL_SECONDS,
+        visibility_timeout=settings.JOB_VISIBILITY_TIMEOUT_SECONDS,
+    )
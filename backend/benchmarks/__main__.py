@@ -0,0 +1,141 @@
+"""
+Run the benchmark suite and save the results as JSON.
+
+    python -m benchmarks                          # every suite
+    python -m benchmarks fetchers pipeline        # selected suites
+    python -m benchmarks --compare benchmarks/results/abc1234.json
+
+Results go to benchmarks/results/<commit>.json by default. With --compare,
+latencies (*_ms) and throughput (rps) are diffed against an earlier results
+file, and the exit status is 1 if any moved the wrong way by more than
+--threshold percent. Everything runs offline; the database suites need
+DATABASE_URL pointing at a local Postgres.
+"""
+
+import argparse
+import asyncio
+import importlib
+import inspect
+import json
+import platform
+import subprocess
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+SUITES = {
+    "fetchers": "benchmarks.bench_fetchers",
+    "pipeline": "benchmarks.bench_pipeline",
+    "endpoints": "benchmarks.bench_endpoints",
+    "broadcast": "benchmarks.bench_broadcast",
+    "json": "benchmarks.bench_json",
+    "anomalies": "benchmarks.bench_anomalies",
+}
+RESULTS_DIR = Path(__file__).parent / "results"
+
+
+def _git(*args: str) -> str:
+    try:
+        return subprocess.run(
+            ["git", *args], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def _commit() -> str:
+    commit = _git("rev-parse", "--short", "HEAD") or "unknown"
+    return f"{commit}-dirty" if _git("status", "--porcelain", "--untracked-files=no") else commit
+
+
+async def run_suites(names: list[str]) -> dict:
+    results = {}
+    for name in names:
+        print(f"Running {name}...", file=sys.stderr)
+        result = importlib.import_module(SUITES[name]).run()
+        results[name] = await result if inspect.isawaitable(result) else result
+    return results
+
+
+def flatten(value, prefix: str = "") -> dict[str, float]:
+    """Numeric leaves keyed by path; list rows are labelled by their first field."""
+    if isinstance(value, dict):
+        items = value.items()
+    elif isinstance(value, list):
+        items = [
+            (f"{next(iter(row))}={next(iter(row.values()))}" if isinstance(row, dict) else i, row)
+            for i, row in enumerate(value)
+        ]
+    elif isinstance(value, (int, float)) and not isinstance(value, bool):
+        return {prefix: value}
+    else:
+        return {}
+
+    flat = {}
+    for key, child in items:
+        flat.update(flatten(child, f"{prefix}.{key}" if prefix else str(key)))
+    return flat
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> int:
+    """Print metric changes against a baseline; returns the number of regressions."""
+    before = flatten(baseline["results"])
+    after = flatten(current["results"])
+    print(f"\nCompared with {baseline['commit']} (threshold {threshold:g}%)")
+
+    regressions = 0
+    for key in sorted(before.keys() & after.keys()):
+        leaf = key.rsplit(".", 1)[-1]
+        # min/max are too noisy to gate on
+        if not (leaf.endswith("_ms") or leaf == "rps") or leaf in ("min_ms", "max_ms"):
+            continue
+        if not before[key]:
+            continue
+        change = (after[key] - before[key]) / before[key] * 100
+        worse = -change if leaf == "rps" else change
+        flag = ""
+        if worse > threshold:
+            flag = "  REGRESSION"
+            regressions += 1
+        elif worse < -threshold:
+            flag = "  improved"
+        print(f"  {key:<58} {before[key]:>11g} -> {after[key]:>11g}  {change:+7.1f}%{flag}")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks", description=__doc__.split("\n")[1]
+    )
+    parser.add_argument("suites", nargs="*", help=f"Suites to run: {', '.join(SUITES)}")
+    parser.add_argument("--output", type=Path, help="Results file (default: results/<commit>.json)")
+    parser.add_argument("--compare", type=Path, help="Earlier results file to diff against")
+    parser.add_argument("--threshold", type=float, default=10.0, help="Regression threshold (%%)")
+    args = parser.parse_args()
+
+    unknown = set(args.suites) - SUITES.keys()
+    if unknown:
+        parser.error(f"unknown suites: {', '.join(sorted(unknown))}")
+    names = args.suites or list(SUITES)
+    commit = _commit()
+    results = {
+        "commit": commit,
+        "recorded_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "machine": f"{platform.system()} {platform.machine()}",
+        "results": asyncio.run(run_suites(names)),
+    }
+
+    output = args.output or RESULTS_DIR / f"{commit}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2))
+    print(f"Saved {output}")
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text())
+        return 1 if compare(baseline, results, args.threshold) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
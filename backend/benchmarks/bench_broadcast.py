@@ -0,0 +1,99 @@
+"""
+WebSocket broadcast benchmark - fan one report event out to 10,000 clients.
+
+Compares the old sequential `await send_text` loop against the connection hub's
+per-client queues, with a small fraction of stalled clients mixed in.
+
+Usage:
+    cd backend
+    uv run python -m benchmarks.bench_broadcast
+"""
+
+import asyncio
+import time
+
+from app.realtime.hub import ConnectionHub
+
+CLIENTS = 10_000
+SLOW_EVERY = 1_000  # One stalled client per this many
+SEND_LATENCY = 0.0002  # Per-send latency of a healthy client (seconds)
+STALL = 0.5  # Per-send latency of a stalled client (seconds)
+
+
+class FakeWebSocket:
+    """Just enough of starlette's WebSocket for the hub."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.messages = 0
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, message: str):
+        await asyncio.sleep(self.latency)
+        self.messages += 1
+
+    async def close(self):
+        pass
+
+
+def _sockets(clients: int) -> list[FakeWebSocket]:
+    return [
+        FakeWebSocket(STALL if i % SLOW_EVERY == 0 else SEND_LATENCY)
+        for i in range(clients)
+    ]
+
+
+async def bench_sequential(clients: int) -> dict:
+    sockets = _sockets(clients)
+    start = time.perf_counter()
+    for ws in sockets:
+        await ws.send_text("report_update")
+    elapsed = time.perf_counter() - start
+    return {"broadcast_ms": round(elapsed * 1000, 3), "delivered_ms": round(elapsed * 1000, 3)}
+
+
+async def bench_hub(clients: int) -> dict:
+    hub = ConnectionHub()
+    sockets = _sockets(clients)
+    for ws in sockets:
+        await hub.connect(ws)
+
+    start = time.perf_counter()
+    hub.broadcast("report_update", key="report_update")
+    broadcast = time.perf_counter() - start
+
+    # Time until every healthy client has its message
+    healthy = [ws for ws in sockets if ws.latency == SEND_LATENCY]
+    while any(ws.messages == 0 for ws in healthy):
+        await asyncio.sleep(0.001)
+    delivered = time.perf_counter() - start
+
+    await hub.stop()
+    return {
+        "broadcast_ms": round(broadcast * 1000, 3),
+        "delivered_ms": round(delivered * 1000, 3),
+    }
+
+
+async def run(clients: int = CLIENTS) -> dict:
+    return {
+        "clients": clients,
+        "sequential": await bench_sequential(clients),
+        "hub": await bench_hub(clients),
+    }
+
+
+def main():
+    r = asyncio.run(run())
+    print(f"{r['clients']} clients (1 stalled per {SLOW_EVERY})")
+    for name in ("sequential", "hub"):
+        print(
+            f"  {name:<11} enqueue/broadcast {r[name]['broadcast_ms']:>10} ms"
+            f"   all healthy delivered {r[name]['delivered_ms']:>10} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
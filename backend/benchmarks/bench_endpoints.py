@@ -0,0 +1,95 @@
+"""
+Endpoint benchmark - /reports/latest and /reports throughput.
+
+Drives the FastAPI app in-process through httpx's ASGI transport with a fixed
+number of concurrent clients, so the numbers cover routing, the database and
+serialization but not socket handling. Seeds a report through the stubbed
+pipeline if the database has none. Needs DATABASE_URL pointing at a local
+Postgres.
+
+Usage:
+    cd backend
+    uv run python -m benchmarks.bench_endpoints
+"""
+
+import asyncio
+import time
+
+import httpx
+from sqlalchemy import func, select
+
+from app.core.config import settings
+from app.core.database import async_session_maker, init_db
+from app.main import app
+from app.models.reports import MonitorReport
+from benchmarks import bench_pipeline
+from benchmarks.stats import summarize
+
+REQUESTS = 2_000
+CONCURRENCY = 50
+ENDPOINTS = ("/reports/latest", "/reports?limit=10")
+
+
+async def _ensure_report() -> None:
+    async with async_session_maker() as db:
+        completed = await db.scalar(
+            select(func.count()).where(MonitorReport.status == "completed")
+        )
+    if not completed:
+        await bench_pipeline.run(runs=1, model_latency=0)
+
+
+async def bench_endpoint(
+    client: httpx.AsyncClient, path: str, requests: int, concurrency: int
+) -> dict:
+    remaining = requests
+    samples, errors = [], 0
+
+    async def worker():
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            start = time.perf_counter()
+            response = await client.get(path)
+            samples.append((time.perf_counter() - start) * 1000)
+            errors += response.status_code != 200
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    return {
+        "requests": requests,
+        "concurrency": concurrency,
+        "errors": errors,
+        "rps": round(requests / elapsed, 1),
+        **summarize(samples),
+    }
+
+
+async def run(requests: int = REQUESTS, concurrency: int = CONCURRENCY) -> dict:
+    await init_db()
+    await _ensure_report()
+
+    transport = httpx.ASGITransport(app=app)
+    base_url = f"http://bench{settings.API_V1_STR}"
+    async with httpx.AsyncClient(transport=transport, base_url=base_url) as client:
+        # Warm the pool and any lazy imports before measuring
+        for path in ENDPOINTS:
+            await client.get(path)
+        return {
+            path: await bench_endpoint(client, path, requests, concurrency)
+            for path in ENDPOINTS
+        }
+
+
+def main():
+    results = asyncio.run(run())
+    for path, r in results.items():
+        print(
+            f"{path:<20} {r['rps']:>9} req/s   p50 {r['p50_ms']:>8} ms"
+            f"   p99 {r['p99_ms']:>8} ms   errors {r['errors']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
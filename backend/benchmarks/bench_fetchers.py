@@ -0,0 +1,90 @@
+"""
+Fetcher benchmark - fetch_* latency against local stub upstreams.
+
+Measures fetch_markets against watchlist size, fetch_news against results per
+search, fetch_social against top-story count, and fetch_tweet, with a fixed
+upstream latency so the numbers reflect request fan-out and processing.
+fetch_markets writes price history, so DATABASE_URL must point at a local
+Postgres.
+
+Usage:
+    cd backend
+    uv run python -m benchmarks.bench_fetchers
+"""
+
+import asyncio
+import itertools
+
+# Registers every model before init_db() creates tables
+import app.models  # noqa: F401
+from app.agent.tools import markets
+from app.agent.tools.news import fetch_news
+from app.agent.tools.social import fetch_social
+from app.agent.tools.twitter import fetch_tweet
+from app.core.database import init_db
+from benchmarks.stats import time_async
+from benchmarks.stubs import StubConfig, StubUpstreams
+
+ITERATIONS = 5
+LATENCY = 0.02  # Upstream latency per request (seconds)
+WATCHLIST_SIZES = (5, 14, 50, 200)
+NEWS_RESULTS = (5, 20, 50)
+STORIES = (10, 30)
+
+
+def _watchlist(size: int) -> dict:
+    return {f"S{i:03d}": {"name": f"Stub {i}", "category": "holding"} for i in range(size)}
+
+
+async def run(iterations: int = ITERATIONS, latency: float = LATENCY) -> dict:
+    await init_db()
+    config = StubConfig(latency=latency)
+    results = {"latency_ms": latency * 1000, "markets": [], "news": [], "social": []}
+
+    async with StubUpstreams(config):
+        symbols = markets.SYMBOLS
+        try:
+            for size in WATCHLIST_SIZES:
+                markets.SYMBOLS = _watchlist(size)
+                stats = await time_async(markets.fetch_markets, iterations)
+                results["markets"].append({"symbols": size, **stats})
+        finally:
+            markets.SYMBOLS = symbols
+
+        for count in NEWS_RESULTS:
+            config.news_results = count
+            stats = await time_async(fetch_news, iterations)
+            results["news"].append({"results_per_search": count, **stats})
+
+        for count in STORIES:
+            config.stories = count
+            stats = await time_async(fetch_social, iterations)
+            results["social"].append({"stories": count, **stats})
+
+        # Distinct ids so the tweet cache never answers
+        ids = itertools.count(1)
+        results["tweet"] = await time_async(
+            lambda: fetch_tweet(f"https://x.com/stub/status/{next(ids)}"), iterations
+        )
+
+    return results
+
+
+def main():
+    r = asyncio.run(run())
+    print(f"Upstream latency {r['latency_ms']:g} ms")
+    for name, size_key in (
+        ("markets", "symbols"),
+        ("news", "results_per_search"),
+        ("social", "stories"),
+    ):
+        for row in r[name]:
+            print(
+                f"  {name:<8} {size_key}={row[size_key]:<5}"
+                f" mean {row['mean_ms']:>9} ms   p50 {row['p50_ms']:>9} ms"
+            )
+    print(f"  tweet    mean {r['tweet']['mean_ms']:>9} ms   p50 {r['tweet']['p50_ms']:>9} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+JSON backend benchmark - encode/decode a representative ~1 MB report.
+
+Usage:
+    cd backend
+    uv run python -m benchmarks.bench_json
+"""
+
+import random
+import string
+import time
+
+from app.core.jsoncodec import _load_backend
+
+ITERATIONS = 50
+
+
+def _text(rng: random.Random, length: int) -> str:
+    return "".join(rng.choices(string.ascii_letters + " ", k=length))
+
+
+def build_report(target_bytes: int = 1_000_000, seed: int = 0) -> dict:
+    """Build a report shaped like the /reports/{id} payload, padded to ~target_bytes."""
+    rng = random.Random(seed)
+
+    def section() -> dict:
+        return {
+            "title": _text(rng, 40),
+            "summary": _text(rng, 400),
+            "key_points": [_text(rng, 120) for _ in range(8)],
+            "sentiment": rng.choice(["positive", "negative", "neutral", "mixed"]),
+        }
+
+    report = {
+        "id": "00000000-0000-0000-0000-000000000000",
+        "created_at": "2025-01-01T00:00:00+00:00",
+        "updated_at": "2025-01-01T00:00:00+00:00",
+        "status": "completed",
+        "summary": _text(rng, 300),
+        "error_message": None,
+        "full_report": {
+            "executive_summary": _text(rng, 300),
+            "news": section(),
+            "markets": section(),
+            "social": section(),
+            "top_news": [],
+            "market_quotes": [],
+            "top_tech": [],
+            "market_sentiment": "neutral",
+        },
+        "sections": {},
+    }
+
+    full = report["full_report"]
+    while len(str(report)) < target_bytes:
+        full["top_news"].append({
+            "title": _text(rng, 80),
+            "url": f"https://example.com/{_text(rng, 20).replace(' ', '-')}",
+            "source": "tavily",
+            "summary": _text(rng, 500),
+        })
+        full["market_quotes"].append({
+            "symbol": _text(rng, 4).upper(),
+            "name": _text(rng, 12),
+            "category": "holding",
+            "price": round(rng.uniform(1, 1000), 2),
+            "change": round(rng.uniform(-20, 20), 2),
+            "change_percent": round(rng.uniform(-5, 5), 2),
+            "sentiment": "neutral",
+        })
+        full["top_tech"].append({
+            "title": _text(rng, 80),
+            "url": "https://news.ycombinator.com/",
+            "score": rng.randint(0, 1000),
+            "comments": rng.randint(0, 500),
+            "is_hot": rng.random() > 0.8,
+        })
+
+    for topic in ("news", "markets", "social"):
+        report["sections"][topic] = {
+            "title": full[topic]["title"],
+            "summary": full[topic]["summary"],
+            "items": [{"key_points": full[topic]["key_points"]}],
+            "sources_count": len(full[topic]["key_points"]),
+        }
+
+    return report
+
+
+def _time(fn, iterations: int) -> float:
+    """Return mean milliseconds per call."""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations * 1000
+
+
+def run(iterations: int = ITERATIONS) -> dict:
+    """Benchmark every available backend and return results keyed by backend name."""
+    report = build_report()
+    results = {}
+
+    for name in ("stdlib", "orjson"):
+        try:
+            backend, dumps, loads = _load_backend(name)
+        except ImportError:
+            continue
+
+        encoded = dumps(report)
+        results[backend] = {
+            "payload_bytes": len(encoded),
+            "encode_ms": round(_time(lambda: dumps(report), iterations), 3),
+            "decode_ms": round(_time(lambda: loads(encoded), iterations), 3),
+        }
+
+    return results
+
+
+def main():
+    results = run()
+    print(f"{'backend':<10}{'bytes':>12}{'encode ms':>12}{'decode ms':>12}")
+    for backend, r in results.items():
+        print(
+            f"{backend:<10}{r['payload_bytes']:>12}{r['encode_ms']:>12}{r['decode_ms']:>12}"
+        )
+
+
+if __name__ == "__main__":
+    main()
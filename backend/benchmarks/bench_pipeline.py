@@ -0,0 +1,77 @@
+"""
+Pipeline benchmark - end-to-end run_monitoring_task against stubs.
+
+Runs the full monitoring pipeline (fetch, synthesis, render, persist,
+broadcast) with local stub upstreams and a stub model that answers after a
+fixed delay, then breaks the time down by the spans recorded on each report.
+Needs DATABASE_URL pointing at a local Postgres.
+
+Usage:
+    cd backend
+    uv run python -m benchmarks.bench_pipeline
+"""
+
+import asyncio
+import time
+from collections import defaultdict
+
+from sqlalchemy import select
+
+# Registers every model before init_db() creates tables
+import app.models  # noqa: F401
+from app.agent.core import get_agent
+from app.core.database import async_session_maker, init_db
+from app.models.reports import MonitorReport
+from app.scheduler.tasks import run_monitoring_task
+from benchmarks.stats import summarize
+from benchmarks.stubs import StubConfig, StubUpstreams, stub_model, stub_monitor_output
+
+RUNS = 5
+LATENCY = 0.02  # Upstream latency per request (seconds)
+MODEL_LATENCY = 0.5  # Synthesis latency (seconds)
+
+
+async def run(runs: int = RUNS, latency: float = LATENCY, model_latency: float = MODEL_LATENCY):
+    await init_db()
+
+    async with StubUpstreams(StubConfig(latency=latency)):
+        output = await stub_monitor_output()
+
+        report_ids, totals = [], []
+        with get_agent("monitor").override(model=stub_model(output, model_latency)):
+            for _ in range(runs):
+                start = time.perf_counter()
+                report_ids.append(await run_monitoring_task("manual"))
+                totals.append((time.perf_counter() - start) * 1000)
+
+    async with async_session_maker() as db:
+        rows = await db.scalars(
+            select(MonitorReport.timings).where(MonitorReport.id.in_(report_ids))
+        )
+        spans = defaultdict(list)
+        for timings in rows:
+            for span in timings["spans"]:
+                spans[span["name"]].append(span["duration_ms"])
+
+    return {
+        "runs": runs,
+        "latency_ms": latency * 1000,
+        "model_latency_ms": model_latency * 1000,
+        "total": summarize(totals),
+        "spans": {name: summarize(durations) for name, durations in sorted(spans.items())},
+    }
+
+
+def main():
+    r = asyncio.run(run())
+    print(
+        f"{r['runs']} runs, upstream latency {r['latency_ms']:g} ms, "
+        f"model latency {r['model_latency_ms']:g} ms"
+    )
+    print(f"  {'total':<18} mean {r['total']['mean_ms']:>9} ms   p50 {r['total']['p50_ms']:>9} ms")
+    for name, s in r["spans"].items():
+        print(f"  {name:<18} mean {s['mean_ms']:>9} ms   p50 {s['p50_ms']:>9} ms")
+
+
+if __name__ == "__main__":
+    main()
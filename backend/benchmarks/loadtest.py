@@ -0,0 +1,429 @@
+"""
+Load test - HTTP traffic mixes and WebSocket fan-out against a local app.
+
+Starts the app under uvicorn in a subprocess with stub upstreams and stub
+models (see benchmarks.stubs), opens N WebSocket subscribers on /ws/reports,
+then drives a weighted mix of GET, chat and arabify requests from concurrent
+virtual users while triggering report broadcasts. Reports throughput, p50/p99
+latency per operation and broadcast delivery lag (receive time minus the
+event's timestamp). Needs DATABASE_URL pointing at a local Postgres.
+
+Usage:
+    cd backend
+    uv run python -m benchmarks.loadtest --websockets 2000 --duration 30
+    uv run python -m benchmarks.loadtest --mix latest=80,chat=10,arabify=10
+    uv run python -m benchmarks.loadtest serve --port 8001     # stubbed app only
+    uv run python -m benchmarks.loadtest --url http://127.0.0.1:8001
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import random
+import signal
+import socket
+import sys
+import time
+import uuid
+from collections import Counter, defaultdict
+from collections.abc import AsyncIterator
+from contextlib import ExitStack, asynccontextmanager
+from datetime import datetime
+from pathlib import Path
+
+import httpx
+from websockets.asyncio.client import connect
+
+from benchmarks.stats import summarize
+
+DEFAULT_MIX = "latest=70,reports=15,chat=10,arabify=5"
+DURATION = 30.0  # Seconds of HTTP load
+CONCURRENCY = 50  # HTTP virtual users
+WEBSOCKETS = 1_000
+BROADCASTS = 3  # Reports triggered during the run
+CONNECT_CONCURRENCY = 200  # WebSocket handshakes in flight at once
+LATENCY = 0.05  # Stub upstream latency (seconds)
+MODEL_LATENCY = 0.5  # Stub model latency (seconds)
+PING_INTERVAL = 30.0  # Keeps subscribers inside WS_IDLE_TIMEOUT_SECONDS
+
+API = "/api/v1"
+CHAT_ANSWER = "Markets were mostly flat today while tech news focused on new model releases."
+
+
+# HTTP operations: each returns the response status code
+
+
+async def op_latest(client: httpx.AsyncClient, rng: random.Random) -> int:
+    return (await client.get(f"{API}/reports/latest")).status_code
+
+
+async def op_reports(client: httpx.AsyncClient, rng: random.Random) -> int:
+    return (await client.get(f"{API}/reports", params={"limit": 10})).status_code
+
+
+async def op_chat(client: httpx.AsyncClient, rng: random.Random) -> int:
+    body = {
+        "threadId": str(uuid.uuid4()),
+        "runId": str(uuid.uuid4()),
+        "state": {},
+        "messages": [{"id": "1", "role": "user", "content": "What happened in markets today?"}],
+        "tools": [],
+        "context": [],
+        "forwardedProps": {},
+    }
+    # Measured to the end of the event stream
+    async with client.stream("POST", f"{API}/chat", json=body) as response:
+        async for _ in response.aiter_bytes():
+            pass
+    return response.status_code
+
+
+async def op_arabify(client: httpx.AsyncClient, rng: random.Random) -> int:
+    # Random ids so the tweet cache rarely answers
+    url = f"https://x.com/stub/status/{rng.randrange(10**12)}"
+    return (await client.post(f"{API}/arabify/tweet", json={"url": url})).status_code
+
+
+OPERATIONS = {
+    "latest": op_latest,
+    "reports": op_reports,
+    "chat": op_chat,
+    "arabify": op_arabify,
+}
+
+
+def parse_mix(mix: str) -> dict[str, float]:
+    weights = {}
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        if name.strip() not in OPERATIONS:
+            raise ValueError(f"Unknown operation '{name}', expected one of {', '.join(OPERATIONS)}")
+        weights[name.strip()] = float(weight or 1)
+    return weights
+
+
+async def virtual_user(
+    client: httpx.AsyncClient,
+    weights: dict[str, float],
+    deadline: float,
+    rng: random.Random,
+    latencies: dict[str, list[float]],
+    errors: Counter,
+) -> None:
+    names, values = list(weights), list(weights.values())
+    while time.monotonic() < deadline:
+        name = rng.choices(names, values)[0]
+        start = time.perf_counter()
+        try:
+            ok = await OPERATIONS[name](client, rng) < 400
+        except httpx.HTTPError:
+            ok = False
+        latencies[name].append((time.perf_counter() - start) * 1000)
+        if not ok:
+            errors[name] += 1
+
+
+class Subscribers:
+    """WebSocket clients on /ws/reports recording how late each report event arrives."""
+
+    def __init__(self, ws_url: str, count: int):
+        self.ws_url = ws_url
+        self.count = count
+        self.connect_ms: list[float] = []
+        self.connect_errors = 0
+        self.lag_ms: dict[str, list[float]] = defaultdict(list)
+        self.deliveries: Counter = Counter()  # report_id -> clients that got its update
+        self._tasks: list[asyncio.Task] = []
+
+    async def start(self) -> None:
+        """Open every connection; returns once all handshakes have finished."""
+        gate = asyncio.Semaphore(CONNECT_CONCURRENCY)
+        ready = [asyncio.get_running_loop().create_future() for _ in range(self.count)]
+        self._tasks = [asyncio.create_task(self._client(gate, f)) for f in ready]
+        await asyncio.gather(*ready)
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def _client(self, gate: asyncio.Semaphore, ready: asyncio.Future) -> None:
+        try:
+            async with gate:
+                start = time.perf_counter()
+                ws = await connect(self.ws_url, ping_interval=None, open_timeout=30)
+                self.connect_ms.append((time.perf_counter() - start) * 1000)
+        except Exception:
+            self.connect_errors += 1
+            ready.set_result(None)
+            return
+
+        ready.set_result(None)
+        async with ws:
+            while True:
+                try:
+                    message = await asyncio.wait_for(ws.recv(), PING_INTERVAL)
+                except TimeoutError:
+                    await ws.send("ping")
+                    continue
+                received = datetime.utcnow()
+                if message == "pong":
+                    continue
+                event = json.loads(message)
+                if event.get("type") == "ping":
+                    await ws.send("pong")
+                    continue
+                if "timestamp" in event:
+                    sent = datetime.fromisoformat(event["timestamp"])
+                    self.lag_ms[event["type"]].append((received - sent).total_seconds() * 1000)
+                if event.get("type") == "report_update":
+                    self.deliveries[event["report_id"]] += 1
+
+    def results(self) -> dict:
+        connected = len(self.connect_ms)
+        return {
+            "clients": self.count,
+            "connected": connected,
+            "connect_errors": self.connect_errors,
+            "connect": summarize(self.connect_ms) if self.connect_ms else None,
+            "broadcasts": len(self.deliveries),
+            "delivered_ratio": round(
+                sum(self.deliveries.values()) / (connected * len(self.deliveries)), 4
+            ) if connected and self.deliveries else None,
+            "lag": {kind: summarize(lags) for kind, lags in sorted(self.lag_ms.items())},
+        }
+
+
+async def _ensure_report(client: httpx.AsyncClient, timeout: float = 60.0) -> None:
+    """Make /reports/latest answer before measuring, triggering a report if needed."""
+    if (await client.get(f"{API}/reports/latest")).status_code == 200:
+        return
+    await client.post(f"{API}/reports/trigger")
+    deadline = time.monotonic() + timeout
+    while (await client.get(f"{API}/reports/latest")).status_code != 200:
+        if time.monotonic() > deadline:
+            raise RuntimeError("No completed report after triggering one")
+        await asyncio.sleep(0.5)
+
+
+async def _trigger_broadcasts(client: httpx.AsyncClient, count: int, duration: float) -> None:
+    """Trigger `count` reports spread evenly over the run; each broadcasts on completion."""
+    for _ in range(count):
+        await asyncio.sleep(duration / (count + 1))
+        await client.post(f"{API}/reports/trigger")
+
+
+async def run(
+    url: str,
+    mix: dict[str, float],
+    duration: float = DURATION,
+    concurrency: int = CONCURRENCY,
+    websockets: int = WEBSOCKETS,
+    broadcasts: int = BROADCASTS,
+    seed: int = 0,
+) -> dict:
+    # One connection per virtual user, plus one for broadcast triggers
+    limits = httpx.Limits(
+        max_connections=concurrency + 1, max_keepalive_connections=concurrency + 1
+    )
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=60.0) as client:
+        await _ensure_report(client)
+
+        subscribers = Subscribers(url.replace("http", "ws", 1) + "/ws/reports", websockets)
+        print(f"Connecting {websockets} WebSocket subscribers...", file=sys.stderr)
+        await subscribers.start()
+
+        print(f"Running {concurrency} virtual users for {duration:g}s...", file=sys.stderr)
+        latencies: dict[str, list[float]] = defaultdict(list)
+        errors: Counter = Counter()
+        deadline = time.monotonic() + duration
+        start = time.perf_counter()
+        await asyncio.gather(
+            _trigger_broadcasts(client, broadcasts, duration),
+            *(
+                virtual_user(client, mix, deadline, random.Random(seed + i), latencies, errors)
+                for i in range(concurrency)
+            ),
+        )
+        elapsed = time.perf_counter() - start
+
+        # Let the last broadcast reach every subscriber
+        await asyncio.sleep(min(duration / (broadcasts + 1), 10.0))
+        await subscribers.stop()
+
+    total = sum(len(samples) for samples in latencies.values())
+    return {
+        "duration_s": round(elapsed, 2),
+        "concurrency": concurrency,
+        "mix": mix,
+        "http": {
+            "requests": total,
+            "errors": sum(errors.values()),
+            "rps": round(total / elapsed, 1),
+            "operations": {
+                name: {
+                    "errors": errors[name],
+                    "rps": round(len(samples) / elapsed, 1),
+                    **summarize(samples),
+                }
+                for name, samples in sorted(latencies.items())
+            },
+        },
+        "websockets": subscribers.results(),
+    }
+
+
+async def serve(port: int, latency: float, model_latency: float) -> None:
+    """Run the app with stub upstreams and stub models until interrupted."""
+    import uvicorn
+
+    # Registers every model before init_db() creates tables
+    import app.models  # noqa: F401
+    from app.agent.arabifier_agent import ArabifiedOutput
+    from app.agent.core import get_agent
+    from app.core.database import init_db
+    from app.main import app
+    from benchmarks.stubs import StubConfig, StubUpstreams, stub_model, stub_monitor_output
+
+    await init_db()
+    async with StubUpstreams(StubConfig(latency=latency)):
+        arabified = ArabifiedOutput(
+            original_text="The new model is insane.",
+            arabified_text="الـmodel الجديد ده insane.",
+        )
+        with ExitStack() as stack:
+            for agent_id, output in (
+                ("monitor", await stub_monitor_output()),
+                ("arabifier", arabified),
+                ("query", CHAT_ANSWER),
+            ):
+                model = stub_model(output, model_latency)
+                stack.enter_context(get_agent(agent_id).override(model=model))
+
+            config = uvicorn.Config(
+                app, host="127.0.0.1", port=port, log_level="warning", backlog=4096
+            )
+            print(f"Serving stubbed app on http://127.0.0.1:{port}", file=sys.stderr)
+            await uvicorn.Server(config).serve()
+
+
+@asynccontextmanager
+async def local_app(latency: float, model_latency: float) -> AsyncIterator[str]:
+    """Start `serve` in a subprocess and yield its base URL once it answers /health."""
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+
+    process = await asyncio.create_subprocess_exec(
+        sys.executable, "-m", "benchmarks.loadtest", "serve", "--port", str(port),
+        "--latency", str(latency), "--model-latency", str(model_latency),
+    )
+    url = f"http://127.0.0.1:{port}"
+    try:
+        async with httpx.AsyncClient() as client:
+            for _ in range(600):
+                if process.returncode is not None:
+                    raise RuntimeError(f"App exited with status {process.returncode}")
+                try:
+                    if (await client.get(f"{url}/health")).status_code == 200:
+                        break
+                except httpx.TransportError:
+                    pass
+                await asyncio.sleep(0.1)
+            else:
+                raise RuntimeError("App did not become healthy within 60s")
+        yield url
+    finally:
+        if process.returncode is None:
+            process.send_signal(signal.SIGINT)
+            try:
+                await asyncio.wait_for(process.wait(), 30)
+            except TimeoutError:
+                process.kill()
+
+
+def _raise_fd_limit() -> None:
+    """Thousands of sockets need more than the usual 1024 file descriptors."""
+    try:
+        import resource
+    except ImportError:
+        return
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft < hard:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+
+
+def print_results(r: dict) -> None:
+    http = r["http"]
+    print(
+        f"HTTP: {http['requests']} requests in {r['duration_s']}s from {r['concurrency']} users,"
+        f" {http['rps']} req/s, {http['errors']} errors"
+    )
+    for name, op in http["operations"].items():
+        print(
+            f"  {name:<9} {op['rps']:>8} req/s   p50 {op['p50_ms']:>9} ms"
+            f"   p99 {op['p99_ms']:>9} ms   errors {op['errors']}"
+        )
+
+    ws = r["websockets"]
+    print(
+        f"WebSockets: {ws['connected']}/{ws['clients']} connected"
+        f" ({ws['connect_errors']} failed), {ws['broadcasts']} broadcasts,"
+        f" delivered ratio {ws['delivered_ratio']}"
+    )
+    for kind, lag in ws["lag"].items():
+        print(f"  {kind:<14} lag p50 {lag['p50_ms']:>9} ms   p99 {lag['p99_ms']:>9} ms")
+
+
+async def main_async(args: argparse.Namespace) -> dict:
+    mix = parse_mix(args.mix)
+    options = dict(
+        mix=mix,
+        duration=args.duration,
+        concurrency=args.concurrency,
+        websockets=args.websockets,
+        broadcasts=args.broadcasts,
+        seed=args.seed,
+    )
+    if args.url:
+        return await run(args.url.rstrip("/"), **options)
+    async with local_app(args.latency, args.model_latency) as url:
+        return await run(url, **options)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.loadtest", description=__doc__.split("\n")[1]
+    )
+    parser.add_argument("mode", nargs="?", choices=["run", "serve"], default="run")
+    parser.add_argument("--url", help="Target an already running app instead of starting one")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"Weighted operations ({DEFAULT_MIX})")
+    parser.add_argument("--duration", type=float, default=DURATION)
+    parser.add_argument("--concurrency", type=int, default=CONCURRENCY)
+    parser.add_argument("--websockets", type=int, default=WEBSOCKETS)
+    parser.add_argument("--broadcasts", type=int, default=BROADCASTS)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--latency", type=float, default=LATENCY, help="Stub upstream latency")
+    parser.add_argument("--model-latency", type=float, default=MODEL_LATENCY)
+    parser.add_argument("--port", type=int, default=8001, help="Port for serve")
+    parser.add_argument("--output", type=Path, help="Save the results as JSON")
+    args = parser.parse_args()
+
+    _raise_fd_limit()
+    if args.mode == "serve":
+        # uvicorn re-raises the interrupt after shutting down gracefully
+        with contextlib.suppress(KeyboardInterrupt):
+            asyncio.run(serve(args.port, args.latency, args.model_latency))
+        return
+
+    results = asyncio.run(main_async(args))
+    print_results(results)
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(results, indent=2))
+        print(f"Saved {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+"""Latency summaries shared by the benchmarks."""
+
+import statistics
+import time
+from collections.abc import Awaitable, Callable
+
+
+def summarize(samples_ms: list[float]) -> dict:
+    """Mean, percentiles and extremes of latency samples, in milliseconds."""
+    ordered = sorted(samples_ms)
+
+    def percentile(q: float) -> float:
+        return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+    return {
+        "n": len(ordered),
+        "mean_ms": round(statistics.fmean(ordered), 3),
+        "p50_ms": round(percentile(0.5), 3),
+        "p99_ms": round(percentile(0.99), 3),
+        "min_ms": round(ordered[0], 3),
+        "max_ms": round(ordered[-1], 3),
+    }
+
+
+async def time_async(fn: Callable[[], Awaitable], iterations: int) -> dict:
+    """Await `fn()` `iterations` times in sequence and summarize the latencies."""
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return summarize(samples)
@@ -0,0 +1,268 @@
+"""
+Local stand-ins for the upstream APIs and the model, for offline benchmarks.
+
+StubUpstreams serves Tavily, Finnhub, HackerNews and Twitter lookalike
+endpoints from a uvicorn server on 127.0.0.1 (in its own thread, so its work
+doesn't share the event loop being measured) with configurable latency and
+payload sizes. The tools' hard-coded upstream URLs are redirected to it
+through the upstream transport hook in app.core.http.
+
+stub_model() answers agent runs with a canned output after a fixed delay.
+"""
+
+import asyncio
+import random
+import threading
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+
+import httpx
+import uvicorn
+from pydantic import BaseModel
+from pydantic_ai.messages import ModelMessage, ModelResponse, TextPart, ToolCallPart
+from pydantic_ai.models.function import AgentInfo, DeltaToolCall, FunctionModel
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from app.core.config import settings
+from app.core.http import set_upstream_transport
+
+# Settings that gate upstream calls; the stubs accept any value
+CREDENTIAL_SETTINGS = ("TAVILY_API_KEY", "FINNHUB_API_KEY", "TWITTER_BEARER_TOKEN")
+
+
+@dataclass
+class StubConfig:
+    """
+    Upstream behaviour.
+
+    latency: Seconds before each response
+    jitter: Extra random latency, uniform in [0, jitter] seconds
+    news_results: Results per Tavily search
+    market_news: Items in the Finnhub news feed
+    stories: Story ids in the HackerNews top stories list
+    """
+
+    latency: float = 0.02
+    jitter: float = 0.0
+    news_results: int = 5
+    market_news: int = 20
+    stories: int = 30
+    seed: int = 0
+
+
+def stub_app(config: StubConfig) -> Starlette:
+    """ASGI app answering the upstream API routes the tools call."""
+    rng = random.Random(config.seed)
+
+    async def delay():
+        await asyncio.sleep(config.latency + rng.uniform(0, config.jitter))
+
+    async def tavily_search(request: Request):
+        body = await request.json()
+        await delay()
+        query = body.get("query", "")
+        return JSONResponse({
+            "query": query,
+            "results": [
+                {
+                    "title": f"{query} headline {i}",
+                    "url": f"https://news.example.com/{query.replace(' ', '-')}/{i}",
+                    "content": "Lorem ipsum dolor sit amet. " * 30,
+                    "score": round(rng.random(), 4),
+                    "published_date": "2025-01-01",
+                }
+                for i in range(config.news_results)
+            ],
+        })
+
+    async def finnhub_quote(request: Request):
+        await delay()
+        price = rng.uniform(10, 500)
+        change = rng.uniform(-5, 5)
+        return JSONResponse({
+            "c": price,
+            "d": change,
+            "dp": change / price * 100,
+            "h": price * 1.01,
+            "l": price * 0.99,
+            "o": price - change / 2,
+            "pc": price - change,
+        })
+
+    async def finnhub_news(request: Request):
+        await delay()
+        return JSONResponse([
+            {
+                "source": "Example Wire",
+                "headline": f"Market headline {i}",
+                "summary": "Stocks moved on the day. " * 20,
+                "url": f"https://markets.example.com/{i}",
+                "image": "",
+                "datetime": 1735689600 + i,
+                "related": "",
+            }
+            for i in range(config.market_news)
+        ])
+
+    async def finnhub_market_status(request: Request):
+        await delay()
+        return JSONResponse({"exchange": "US", "isOpen": True, "session": "regular"})
+
+    async def hn_top_stories(request: Request):
+        await delay()
+        return JSONResponse(list(range(1, config.stories + 1)))
+
+    async def hn_item(request: Request):
+        await delay()
+        story_id = int(request.path_params["item"].removesuffix(".json"))
+        return JSONResponse({
+            "id": story_id,
+            "type": "story",
+            "title": f"Show HN: Story {story_id}",
+            "url": f"https://tech.example.com/{story_id}",
+            "score": rng.randint(1, 600),
+            "by": "stub",
+            "descendants": rng.randint(0, 300),
+            "time": 1735689600,
+        })
+
+    async def tweet(request: Request):
+        await delay()
+        tweet_id = request.path_params["tweet_id"]
+        return JSONResponse({
+            "data": {
+                "id": tweet_id,
+                "text": "The new model is insane. I can't believe how good it is at coding.",
+                "author_id": "1",
+                "created_at": "2025-01-01T00:00:00.000Z",
+                "public_metrics": {"like_count": 10, "retweet_count": 2, "reply_count": 1},
+            },
+            "includes": {"users": [{"id": "1", "name": "Stub", "username": "stub"}]},
+        })
+
+    return Starlette(routes=[
+        Route("/search", tavily_search, methods=["POST"]),
+        Route("/api/v1/quote", finnhub_quote),
+        Route("/api/v1/news", finnhub_news),
+        Route("/api/v1/stock/market-status", finnhub_market_status),
+        Route("/v0/topstories.json", hn_top_stories),
+        Route("/v0/item/{item}", hn_item),
+        Route("/2/tweets/{tweet_id}", tweet),
+    ])
+
+
+class _RedirectTransport(httpx.AsyncBaseTransport):
+    """Sends every request to the stub server, keeping its path and query."""
+
+    def __init__(self, base_url: httpx.URL):
+        self.base_url = base_url
+        self._inner = httpx.AsyncHTTPTransport()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        request.url = request.url.copy_with(
+            scheme=self.base_url.scheme, host=self.base_url.host, port=self.base_url.port
+        )
+        request.headers["host"] = request.url.netloc.decode()
+        return await self._inner.handle_async_request(request)
+
+    async def close(self) -> None:
+        # Not aclose(): every upstream client calls that on the shared transport
+        await self._inner.aclose()
+
+
+class ServerThread:
+    """Runs an ASGI app under uvicorn on a free local port in a background thread."""
+
+    def __init__(self, app, **config):
+        config.setdefault("log_level", "warning")
+        self.server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=0, **config))
+        self.thread = threading.Thread(target=self.server.run, name="stub-server", daemon=True)
+
+    @property
+    def url(self) -> httpx.URL:
+        port = self.server.servers[0].sockets[0].getsockname()[1]
+        return httpx.URL(f"http://127.0.0.1:{port}")
+
+    async def start(self) -> None:
+        self.thread.start()
+        while not self.server.started:
+            if not self.thread.is_alive():
+                raise RuntimeError("Server failed to start")
+            await asyncio.sleep(0.01)
+
+    async def stop(self) -> None:
+        self.server.should_exit = True
+        await asyncio.to_thread(self.thread.join)
+
+
+class StubUpstreams:
+    """
+    Route every upstream API call to a local stub server.
+
+        async with StubUpstreams(StubConfig(latency=0.05)):
+            await fetch_markets()
+    """
+
+    def __init__(self, config: StubConfig | None = None):
+        self.config = config or StubConfig()
+        self.server = ServerThread(stub_app(self.config))
+        self._saved: dict[str, str] = {}
+
+    async def __aenter__(self) -> "StubUpstreams":
+        await self.server.start()
+        self._saved = {name: getattr(settings, name) for name in CREDENTIAL_SETTINGS}
+        for name in CREDENTIAL_SETTINGS:
+            setattr(settings, name, "stub")
+        self._transport = _RedirectTransport(self.server.url)
+        set_upstream_transport(self._transport)
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        set_upstream_transport(None)
+        await self._transport.close()
+        for name, value in self._saved.items():
+            setattr(settings, name, value)
+        await self.server.stop()
+
+
+def stub_model(output: BaseModel | str, latency: float = 0.0) -> FunctionModel:
+    """
+    Model that answers every run with `output` after `latency` seconds.
+
+    Streamed runs (the AG-UI chat endpoint) get the same answer in chunks.
+    """
+
+    async def respond(messages: list[ModelMessage], info: AgentInfo) -> ModelResponse:
+        await asyncio.sleep(latency)
+        if isinstance(output, str):
+            return ModelResponse(parts=[TextPart(output)])
+        return ModelResponse(
+            parts=[ToolCallPart(info.output_tools[0].name, output.model_dump(mode="json"))]
+        )
+
+    async def stream(messages: list[ModelMessage], info: AgentInfo) -> AsyncIterator:
+        await asyncio.sleep(latency)
+        if isinstance(output, str):
+            for i in range(0, len(output), 16):
+                yield output[i : i + 16]
+        else:
+            name = info.output_tools[0].name
+            yield {0: DeltaToolCall(name=name, json_args=output.model_dump_json())}
+
+    return FunctionModel(respond, stream_function=stream, model_name="stub")
+
+
+async def stub_monitor_output():
+    """
+    Canned synthesis shaped like a real report over the stub upstream data.
+
+    Call inside StubUpstreams.
+    """
+    # Import here so importing the stubs doesn't build the agents
+    from app.agent.monitor_agent import FETCH_STAGES, fallback_output
+
+    data = {stage: await fetch() for stage, fetch in FETCH_STAGES.items()}
+    return fallback_output(data, "Stub synthesis")